@@ -2,8 +2,7 @@ from typing import Tuple, List
 
 from io_utils import DEFAULT_CSV_PATH, read_matrices_from_csv, NullWriter
 from optimizer import SailfishOptimizer
-import sys
-import numpy as np
+from results_store import DEFAULT_RESULTS_DB
 
 
 def main() -> None:
@@ -40,14 +39,17 @@ def main() -> None:
     print("Select output mode:")
     print("1. Steps to file, summary to terminal (recommended)")
     print("2. Summary only")
+    print("3. Steps to file, per-iteration summaries to terminal")
     
     while True:
-        log_choice = input("Enter your choice (1/2): ").strip()
-        if log_choice in ['1', '2']:
-            full_log = log_choice == '1'
+        log_choice = input("Enter your choice (1/2/3): ").strip()
+        if log_choice in ['1', '2', '3']:
+            full_log = log_choice in ['1', '3']
+            # Option 1 redraws one throughput status line; option 3 prints a summary block per iteration
+            live_status = log_choice == '1'
             break
         else:
-            print("Please enter '1' or '2' for logging selection.")
+            print("Please enter '1', '2' or '3' for logging selection.")
 
     # Parameter customization selection with validation
     print("\n⚙️ PARAMETER CONFIGURATION")
@@ -125,19 +127,15 @@ def main() -> None:
         log_to_file=full_log,
         dual_output=full_log,  # Enable dual output when logging to file
         data_file=csv_path,
+        results_db=DEFAULT_RESULTS_DB,
+        live_status=live_status,  # Throughput status line instead of per-iteration summaries
+        verbose=full_log,  # Summary mode takes the headless path: nothing is formatted
+        output=None if full_log else NullWriter(),  # Summary mode: suppress all output except the final result
     )
 
-    if full_log:
-        # Dual output mode - terminal shows summary, file gets detailed output
-        optimizer.run_optimization()
-    else:
-        # Summary only mode - suppress all output except final result
-        original_stdout = sys.stdout
-        sys.stdout = NullWriter()
-        try:
-            optimizer.run_optimization()
-        finally:
-            sys.stdout = original_stdout
+    # Dual output mode - terminal shows summary, file gets detailed output
+    optimizer.run_optimization()
+    if not full_log:
         print(f"Best fitness: {optimizer.best_fitness}")
 
 
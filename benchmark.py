@@ -0,0 +1,275 @@
+import argparse
+import csv
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from io_utils import read_instance, read_qaplib_solution
+from qap_core import MATRIX_STORAGE, gilmore_lawler_bound, instance_hash
+from shared_matrices import SharedHandle, SharedMatrices, resolve_matrices, share_matrices
+from sweep import SWEEP_PARAMETERS, canonical_parameters, expand_grid, parse_seeds, parse_value
+
+
+DEFAULT_TARGET_GAP: float = 0.0
+BUNDLED_INSTANCES: Tuple[str, ...] = ("kecil.csv", "sedang.csv", "besar.csv")
+
+# Instances attached once per worker process by the pool initializer
+_worker_instances: Dict[str, Tuple[Sequence[Sequence[float]], Sequence[Sequence[float]]]] = {}
+
+
+def best_known_cost(path: str, freq_matrix, distance_matrix, db_path: Optional[str] = None) -> Optional[float]:
+    """
+    Best-known cost of an instance: from a QAPLIB .sln file next to a .dat
+    instance, else from the results store (best run recorded for the instance).
+    """
+    solution_path = os.path.splitext(path)[0] + ".sln"
+    if path.lower().endswith(".dat") and os.path.exists(solution_path):
+        return read_qaplib_solution(solution_path)[0]
+    if db_path and os.path.exists(db_path):
+        from results_store import RunStore
+        with RunStore(db_path) as store:
+            best = store.best_known(instance_hash(freq_matrix, distance_matrix))
+        if best:
+            return best["best_cost"]
+    return None
+
+
+def time_to_target(progress: Sequence[Tuple[float, int, float]], target_cost: float) -> Optional[Tuple[float, int]]:
+    """(elapsed seconds, fitness evaluations) at which a run's progress first reached the target, or None."""
+    for elapsed, evaluations, best in progress:
+        if best <= target_cost:
+            return elapsed, evaluations
+    return None
+
+
+def ecdf(values: Sequence[float], n_runs: int) -> List[Tuple[float, float]]:
+    """Empirical run-length distribution: (value, fraction of all runs that succeeded within it)."""
+    ordered = sorted(values)
+    return [(value, (i + 1) / n_runs) for i, value in enumerate(ordered)]
+
+
+def quantile(values: Sequence[float], q: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def _init_worker(instances: Dict[str, Tuple[Optional[SharedHandle], Optional[Tuple]]]) -> None:
+    for name, (handle, matrices) in instances.items():
+        _worker_instances[name] = resolve_matrices(handle, matrices)
+
+
+def run_to_target(
+    freq_matrix: Sequence[Sequence[float]],
+    distance_matrix: Sequence[Sequence[float]],
+    params: Dict[str, Any],
+    seed: int,
+    target_cost: float,
+    lower_bound: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Run one headless optimization that stops at the target and return its
+    time-to-target record. A precomputed lower_bound keeps the bound out of
+    the measured time.
+    """
+    from optimizer import SailfishOptimizer
+
+    optimizer = SailfishOptimizer(
+        freq_matrix=freq_matrix,
+        distance_matrix=distance_matrix,
+        log_to_file=False,
+        seed=seed,
+        verbose=False,
+        target_cost=target_cost,
+        lower_bound=lower_bound,
+        **params,
+    )
+    optimizer.run_optimization()
+    hit = time_to_target(optimizer.progress, target_cost)
+    return {
+        "params": canonical_parameters(params),
+        "seed": seed,
+        "best_cost": optimizer.best_fitness,
+        "success": hit is not None,
+        "time_to_target": hit[0] if hit else None,
+        "evaluations_to_target": hit[1] if hit else None,
+        "wall_time": optimizer.wall_time,
+        "evaluations": optimizer.fitness_evaluations,
+    }
+
+
+def _run_cell(
+    instance: str,
+    params: Dict[str, Any],
+    seed: int,
+    target_cost: float,
+    lower_bound: Optional[float],
+) -> Dict[str, Any]:
+    freq_matrix, distance_matrix = _worker_instances[instance]
+    record = run_to_target(freq_matrix, distance_matrix, params, seed, target_cost, lower_bound)
+    record["instance"] = instance
+    return record
+
+
+def run_benchmark(
+    instances: Dict[str, Tuple[Sequence[Sequence[float]], Sequence[Sequence[float]], float]],
+    configurations: Sequence[Dict[str, Any]],
+    seeds: Sequence[int],
+    target_gap: float = DEFAULT_TARGET_GAP,
+    max_workers: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run every (instance, configuration, seed) cell against the target
+    best_known * (1 + target_gap) on a process pool and return one record per run.
+    """
+    shared: Dict[str, Optional[SharedMatrices]] = {}
+    lower_bounds: Dict[str, float] = {}
+    try:
+        worker_instances = {}
+        for name, (freq_matrix, distance_matrix, _) in instances.items():
+            shared[name] = share_matrices(freq_matrix, distance_matrix)
+            worker_instances[name] = ((shared[name].handle, None) if shared[name]
+                                      else (None, (freq_matrix, distance_matrix)))
+            # The bound depends only on the instance: compute it once here rather than
+            # inside every timed run, where it would add to each time-to-target
+            lower_bounds[name] = gilmore_lawler_bound(freq_matrix, distance_matrix)
+        cells = [(name, params, seed, best * (1 + target_gap), lower_bounds[name])
+                 for name, (_, _, best) in instances.items() for params in configurations for seed in seeds]
+        records: List[Dict[str, Any]] = []
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(worker_instances,),
+        ) as executor:
+            futures = [executor.submit(_run_cell, *cell) for cell in cells]
+            for done, future in enumerate(as_completed(futures), 1):
+                record = future.result()
+                records.append(record)
+                outcome = f"{record['time_to_target']:.3f}s" if record["success"] else "not reached"
+                print(f"[{done}/{len(cells)}] {record['instance']} {record['params']} seed={record['seed']} {outcome}")
+        return records
+    finally:
+        for matrices in shared.values():
+            if matrices:
+                matrices.close()
+
+
+def summarize_time_to_target(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Success rate and time/evaluations-to-target distributions per (instance, configuration)."""
+    grouped: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+    for record in records:
+        grouped.setdefault((record["instance"], record["params"]), []).append(record)
+    summary: List[Dict[str, Any]] = []
+    for (instance, params), runs in sorted(grouped.items()):
+        times = [run["time_to_target"] for run in runs if run["success"]]
+        evaluations = [run["evaluations_to_target"] for run in runs if run["success"]]
+        summary.append({
+            "instance": instance,
+            "params": params,
+            "runs": len(runs),
+            "success_rate": len(times) / len(runs),
+            "median_time": quantile(times, 0.5),
+            "p90_time": quantile(times, 0.9),
+            "median_evaluations": quantile(evaluations, 0.5),
+            "time_ecdf": ecdf(times, len(runs)),
+            "evaluation_ecdf": ecdf(evaluations, len(runs)),
+        })
+    return summary
+
+
+def _format(value: Optional[float], spec: str) -> str:
+    return format(value, spec) if value is not None else "-"
+
+
+def print_time_to_target(summary: List[Dict[str, Any]]) -> None:
+    """Print success rates, time-to-target quantiles and the empirical distributions"""
+    print("\n" + "="*120)
+    print("⏱️ TIME-TO-TARGET PER INSTANCE AND CONFIGURATION")
+    print("="*120)
+    print(f"{'Instance':<14} {'Runs':>5} {'Success':>8} {'Median (s)':>11} {'P90 (s)':>9} {'Median Evals':>13}  Parameters")
+    print("-" * 120)
+    for entry in summary:
+        print(f"{entry['instance']:<14} {entry['runs']:>5} {entry['success_rate'] * 100:>7.1f}% "
+              f"{_format(entry['median_time'], '>11.3f')} {_format(entry['p90_time'], '>9.3f')} "
+              f"{_format(entry['median_evaluations'], '>13')}  {entry['params']}")
+    print("="*120)
+    for entry in summary:
+        print(f"\nECDF {entry['instance']} {entry['params']}")
+        print(f"{'Time (s)':>10} {'Evals':>10} {'P(solved)':>10}")
+        for (elapsed, probability), (evaluations, _) in zip(entry["time_ecdf"], sorted(entry["evaluation_ecdf"])):
+            print(f"{elapsed:>10.3f} {evaluations:>10} {probability:>10.2f}")
+
+
+def write_records_csv(records: List[Dict[str, Any]], path: str) -> None:
+    fields = ["instance", "params", "seed", "best_cost", "success", "time_to_target",
+              "evaluations_to_target", "wall_time", "evaluations"]
+    with open(path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=fields)
+        writer.writeheader()
+        for record in records:
+            writer.writerow({field: record[field] for field in fields})
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Time-to-target benchmark for the Sailfish Optimizer")
+    parser.add_argument("instances", nargs="*", default=list(BUNDLED_INSTANCES),
+                        help="Instance files: project CSVs or QAPLIB .dat (with .sln alongside). "
+                             "The default bundled CSVs have no .sln: pass --best or --db")
+    parser.add_argument("--best", action="append", default=[], metavar="FILE=COST",
+                        help="Best-known cost for an instance (overrides .sln and the results store)")
+    parser.add_argument("--db", default=None, help="Results store to take best-known costs from")
+    parser.add_argument("--gap", type=float, default=DEFAULT_TARGET_GAP,
+                        help="Target relative gap to the best-known cost (default: 0, i.e. reach it)")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2",
+                        help="Configuration grid values for a parameter (repeatable)")
+    parser.add_argument("--seeds", default="0-9", help="Run seeds, e.g. '0-29' or '1,2,7'")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--csv", default=None, help="Also write one row per run to this CSV file")
+    parser.add_argument("--matrix-storage", choices=MATRIX_STORAGE, default="float",
+                        help="Matrix storage: float, exact (ints for integral matrices) or compact (int32 arrays)")
+    args = parser.parse_args(argv)
+
+    best_costs = {path: float(cost) for path, cost in (item.rsplit("=", 1) for item in args.best)}
+    instances: Dict[str, Tuple[Sequence[Sequence[float]], Sequence[Sequence[float]], float]] = {}
+    for path in args.instances:
+        # Instances are keyed by path as given, so equal file names in different directories stay apart
+        if path in instances:
+            parser.error(f"Instance {path} is listed more than once")
+        freq_matrix, distance_matrix = read_instance(path, args.matrix_storage)
+        best = best_costs.get(path)
+        if best is None:
+            best = best_known_cost(path, freq_matrix, distance_matrix, args.db)
+        if best is None:
+            parser.error(f"No best-known cost for {path}: pass --best {path}=COST, a .sln file or --db "
+                         f"(a results store with runs of the instance)")
+        instances[path] = (freq_matrix, distance_matrix, best)
+        print(f"{path}: n={len(freq_matrix)}, best-known {best}, target {best * (1 + args.gap)}")
+
+    grid: Dict[str, List[Any]] = {}
+    for item in args.grid:
+        name, values = item.split("=", 1)
+        grid[name] = [parse_value(name, value) for value in values.split(",")]
+    configurations = expand_grid(grid) if grid else [dict(SWEEP_PARAMETERS)]
+
+    records = run_benchmark(instances, configurations, parse_seeds(args.seeds), args.gap, args.workers)
+    print_time_to_target(summarize_time_to_target(records))
+    if args.csv:
+        write_records_csv(records, args.csv)
+
+
+__all__ = [
+    "BUNDLED_INSTANCES",
+    "best_known_cost",
+    "time_to_target",
+    "ecdf",
+    "run_to_target",
+    "run_benchmark",
+    "summarize_time_to_target",
+    "print_time_to_target",
+    "write_records_csv",
+]
+
+
+if __name__ == "__main__":
+    main()
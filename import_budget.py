@@ -0,0 +1,105 @@
+import argparse
+import json
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+
+DEFAULT_BUDGET_MS: float = 150.0
+# Modules the headless path must never load: printers, optional features and heavy extras
+HEADLESS_FORBIDDEN_MODULES: Tuple[str, ...] = (
+    "numpy",
+    "sfo.reporting",
+    "sfo.memory",
+    "sfo.tabu",
+    "terminal_output",
+)
+
+_HEADLESS_RUN = """
+import json, sys
+from optimizer import SailfishOptimizer
+F = [[0, 3, 1], [3, 0, 2], [1, 2, 0]]
+D = [[0, 1, 4], [1, 0, 2], [4, 2, 0]]
+SailfishOptimizer(n_sailfish=2, n_sardines=4, freq_matrix=F, distance_matrix=D, max_iter=3,
+                  log_to_file=False, seed=0, verbose=False).run_optimization()
+print(json.dumps(sorted(name for name in {forbidden!r} if name in sys.modules)))
+"""
+
+
+def parse_importtime(stderr: str) -> Dict[str, Tuple[int, int]]:
+    """Parse `python -X importtime` output into {module: (self us, cumulative us)}."""
+    timings: Dict[str, Tuple[int, int]] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        timings[name.strip()] = (int(self_us), int(cumulative_us))
+    return timings
+
+
+def measure_import_time(module: str = "optimizer", repeats: int = 3) -> Tuple[float, Dict[str, Tuple[int, int]]]:
+    """
+    Import a module in fresh interpreters and return the best cumulative import
+    time in milliseconds with the per-module timings of that run.
+    """
+    best_ms = float("inf")
+    best_timings: Dict[str, Tuple[int, int]] = {}
+    for _ in range(repeats):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True, text=True, check=True,
+        )
+        timings = parse_importtime(completed.stderr)
+        elapsed_ms = timings[module][1] / 1000.0
+        if elapsed_ms < best_ms:
+            best_ms, best_timings = elapsed_ms, timings
+    return best_ms, best_timings
+
+
+def headless_loaded_modules(forbidden: Tuple[str, ...] = HEADLESS_FORBIDDEN_MODULES) -> List[str]:
+    """Run a tiny headless optimization in a fresh interpreter and return the forbidden modules it loaded."""
+    completed = subprocess.run(
+        [sys.executable, "-c", _HEADLESS_RUN.format(forbidden=tuple(forbidden))],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Check the optimizer's headless startup budget")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS,
+                        help="Maximum cumulative import time of the module in milliseconds")
+    parser.add_argument("--module", default="optimizer", help="Module to import (default: optimizer)")
+    parser.add_argument("--top", type=int, default=5, help="Number of slowest imports to list")
+    args = parser.parse_args(argv)
+
+    elapsed_ms, timings = measure_import_time(args.module)
+    print(f"Import time of {args.module}: {elapsed_ms:.1f} ms (budget {args.budget_ms:.1f} ms)")
+    slowest = sorted(timings.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"  {name:<30} self {self_us / 1000.0:>8.2f} ms  cumulative {cumulative_us / 1000.0:>8.2f} ms")
+    loaded = headless_loaded_modules()
+    print(f"Forbidden modules loaded by a headless run: {', '.join(loaded) if loaded else 'none'}")
+
+    failures: List[str] = []
+    if elapsed_ms > args.budget_ms:
+        failures.append(f"import time {elapsed_ms:.1f} ms exceeds budget {args.budget_ms:.1f} ms")
+    if loaded:
+        failures.append(f"headless run loaded {', '.join(loaded)}")
+    if failures:
+        print("STARTUP BUDGET EXCEEDED: " + "; ".join(failures))
+        sys.exit(1)
+    print("Startup budget OK")
+
+
+__all__ = [
+    "DEFAULT_BUDGET_MS",
+    "HEADLESS_FORBIDDEN_MODULES",
+    "parse_importtime",
+    "measure_import_time",
+    "headless_loaded_modules",
+]
+
+
+if __name__ == "__main__":
+    main()
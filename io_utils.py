@@ -2,7 +2,7 @@ import sys
 from datetime import datetime
 from typing import List, Tuple, Any
 
-from qap_core import get_default_matrices
+from qap_core import get_default_matrices, store_matrix
 
 
 DEFAULT_CSV_PATH: str = r"C:\Users\bengkel\Desktop\Project_SFO\QAP\qap_matrices2.csv"
@@ -98,13 +98,14 @@ class DualOutputLogger:
         self.close()
 
 
-def read_matrices_from_csv(filename: str) -> Tuple[List[List[float]], List[List[float]]]:
+def read_matrices_from_csv(filename: str, storage: str = "float") -> Tuple[List[List[float]], List[List[float]]]:
     """
     Read frequency and distance matrices from a CSV file.
     Expected format:
     - First n rows: frequency matrix
     - Empty row
     - Next n rows: distance matrix
+    The matrices are returned in the given storage mode (see store_matrix).
     """
     try:
         with open(filename, 'r') as file:
@@ -125,10 +126,52 @@ def read_matrices_from_csv(filename: str) -> Tuple[List[List[float]], List[List[
             if lines[i].strip():
                 row = [float(x) for x in lines[i].strip().split(',')]
                 dist_data.append(row)
-        return freq_data, dist_data
+        return store_matrix(freq_data, storage), store_matrix(dist_data, storage)
     except FileNotFoundError:
         print(f"File {filename} not found. Using default matrices.")
-        return get_default_matrices()
+        freq_data, dist_data = get_default_matrices()
+        return store_matrix(freq_data, storage), store_matrix(dist_data, storage)
+
+
+def read_qaplib_instance(filename: str, storage: str = "float") -> Tuple[List[List[float]], List[List[float]]]:
+    """
+    Read a QAPLIB .dat file: n, then matrix A, then matrix B (whitespace separated).
+    QAPLIB minimises sum a_ij * b_p(i)p(j) with p mapping A's indices to B's,
+    which is this project's cost with A as the distance and B as the flow matrix.
+    Returns (freq_matrix, distance_matrix) in the given storage mode.
+    """
+    with open(filename, 'r') as file:
+        values = file.read().split()
+    n = int(values[0])
+    numbers = [float(x) for x in values[1:1 + 2 * n * n]]
+    if len(numbers) != 2 * n * n:
+        raise ValueError(f"{filename}: expected {2 * n * n} matrix entries, found {len(numbers)}")
+    a = [numbers[i * n:(i + 1) * n] for i in range(n)]
+    b = [numbers[n * n + i * n:n * n + (i + 1) * n] for i in range(n)]
+    return store_matrix(b, storage), store_matrix(a, storage)
+
+
+def read_qaplib_solution(filename: str) -> Tuple[float, List[int]]:
+    """Read a QAPLIB .sln file: n and the best-known cost, then the 1-based permutation."""
+    with open(filename, 'r') as file:
+        values = file.read().replace(',', ' ').split()
+    n = int(values[0])
+    return float(values[1]), [int(x) for x in values[2:2 + n]]
+
+
+def read_permutations(filename: str) -> List[List[int]]:
+    """Read 1-based permutations, one per line (QAPLIB .sln files: the solution's permutation)."""
+    if filename.lower().endswith(".sln"):
+        return [read_qaplib_solution(filename)[1]]
+    with open(filename, 'r') as file:
+        return [[int(x) for x in line.replace(',', ' ').split()] for line in file if line.strip()]
+
+
+def read_instance(filename: str, storage: str = "float") -> Tuple[List[List[float]], List[List[float]]]:
+    """Read an instance by extension: QAPLIB .dat files, otherwise the project CSV format."""
+    if filename.lower().endswith(".dat"):
+        return read_qaplib_instance(filename, storage)
+    return read_matrices_from_csv(filename, storage)
 
 
 __all__ = [
@@ -137,6 +180,10 @@ __all__ = [
     "NullWriter",
     "DEFAULT_CSV_PATH",
     "read_matrices_from_csv",
+    "read_qaplib_instance",
+    "read_qaplib_solution",
+    "read_permutations",
+    "read_instance",
 ]
 
 
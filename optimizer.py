@@ -1,16 +1,24 @@
 import random
 import sys
+from array import array
+import time
 from datetime import datetime
-from typing import List, Tuple, Optional
+from typing import TYPE_CHECKING, Callable, Dict, List, Sequence, TextIO, Tuple, Optional
 
 from io_utils import OutputLogger, DualOutputLogger
-from terminal_output import print_terminal_data_info, print_terminal_parameters, print_terminal_iteration_summary, print_terminal_final_results, print_terminal_optimization_start
-from sfo.reporting import print_initial_parameters as _print_initial_parameters, print_comprehensive_results_table as _print_comprehensive_results_table, print_final_results as _print_final_results, report_sardine_population_extinction as _report_sardine_population_extinction
-from sfo.population import print_random_populations as _print_random_populations, save_original_positions as _save_original_positions, print_sorted_arrays_and_solutions as _print_sorted_arrays_and_solutions
+from qap_core import gilmore_lawler_bound, one_based, optimality_gap, permutation_typecode
+from sfo.population import print_random_populations as _print_random_populations, save_original_positions as _save_original_positions, print_sorted_arrays_and_solutions as _print_sorted_arrays_and_solutions, encode_solution_to_random_values as _encode_solution_to_random_values
 from sfo.fitness import calculate_detailed_fitness as _calculate_detailed_fitness, print_fitness_summary as _print_fitness_summary
+from sfo.initialization import INITIALIZERS
+from sfo.diversity import RESTART_POLICIES, detect_duplicate_permutations as _detect_duplicate_permutations, restart_sardine_population as _restart_sardine_population
 from sfo.replacement import perform_sailfish_sardine_replacement as _perform_sailfish_sardine_replacement
 from sfo.dynamics import calculate_pd_and_lambda_values as _calculate_pd_and_lambda_values, update_sailfish_positions as _update_sailfish_positions, calculate_ap_and_update_sardines as _calculate_ap_and_update_sardines
 
+if TYPE_CHECKING:
+    from terminal_output import LiveStatusLine
+
+# Printers (sfo.reporting, terminal_output) and optional features (sfo.memory,
+# sfo.tabu) are imported on first use so the headless path never loads them.
 
 class SailfishOptimizer:
     def __init__(
@@ -25,9 +33,44 @@ class SailfishOptimizer:
         log_to_file: bool = True,
         dual_output: bool = False,
         data_file: str = "Unknown",
+        seed: Optional[int] = None,
+        results_db: Optional[str] = None,
+        tabu_iterations: int = 0,
+        sa_sardines: int = 0,
+        sa_steps: int = 100,
+        live_status: bool = False,
+        memory_profile: bool = False,
+        verbose: bool = True,
+        reseed_duplicates: bool = False,
+        time_budget: Optional[float] = None,
+        eval_workers: int = 0,
+        eval_chunk_size: int = 16,
+        incremental_fitness: bool = True,
+        compute_lower_bound: bool = True,
+        target_gap: Optional[float] = None,
+        target_cost: Optional[float] = None,
+        trace_file: Optional[str] = None,
+        restart_policy: Optional[str] = None,
+        restart_radius: float = 0.1,
+        adaptive_sardines: bool = False,
+        target_iteration_time: Optional[float] = None,
+        max_sardines: Optional[int] = None,
+        output: Optional[TextIO] = None,
+        terminal: Optional[TextIO] = None,
+        warm_start: Optional[Sequence[Sequence[int]]] = None,
+        warm_start_share: float = 0.5,
+        warm_start_jitter: float = 0.05,
+        initializer: str = "uniform",
+        metrics_file: Optional[str] = None,
+        metrics_interval: float = 5.0,
+        lower_bound: Optional[float] = None,
     ) -> None:
         if n_sardines <= n_sailfish:
             raise ValueError("Number of sardines must be greater than number of sailfish")
+        if restart_policy is not None and restart_policy not in RESTART_POLICIES:
+            raise ValueError(f"restart_policy must be one of {', '.join(RESTART_POLICIES)} or None")
+        if initializer not in INITIALIZERS:
+            raise ValueError(f"initializer must be one of {', '.join(INITIALIZERS)}")
         self.original_n_sailfish: int = n_sailfish
         self.original_n_sardines: int = n_sardines
         self.n_sailfish: int = n_sailfish
@@ -38,17 +81,98 @@ class SailfishOptimizer:
         self.A: float = A
         self.epsilon: float = epsilon
         self.problem_size: int = len(freq_matrix)
+        # Permutations are stored as compact arrays of 0-based facilities; reports convert to 1-based
+        self.permutation_typecode: str = permutation_typecode(self.problem_size)
         self.log_to_file: bool = log_to_file
         self.dual_output: bool = dual_output
+        # verbose=False is the headless path: no derivations are formatted and no printers are imported
+        self.verbose: bool = verbose
         self.data_file: str = data_file
+        self.seed: Optional[int] = seed
+        # Per-instance random source so concurrent or repeated runs are reproducible
+        self.rng: random.Random = random.Random(seed)
+        # Binary trace of the draws and per-iteration numbers, rendered offline by trace_report.py
+        self.trace_file: Optional[str] = trace_file
+        self.trace = None
+        if trace_file:
+            from sfo.trace import TraceRecorder
+            self.trace = TraceRecorder(seed)
+            self.rng = self.trace.rng
+        self.results_db: Optional[str] = results_db
+        self.tabu_iterations: int = tabu_iterations
+        # Simulated-annealing refinement of the best sa_sardines sardines while AP < 0.5, i.e. from
+        # iteration 437 with the default A and epsilon (sfo.annealing.low_ap_start_iteration)
+        self.sa_sardines: int = sa_sardines
+        self.sa_steps: int = sa_steps
+        # Replace sardines that decode to an already-present permutation by fresh random keys
+        self.reseed_duplicates: bool = reseed_duplicates
+        # Wall-clock seconds after which no further iteration is started (None: run all max_iter)
+        self.time_budget: Optional[float] = time_budget
+        # Headless fitness evaluation sharded over eval_workers processes (0: serial)
+        self.eval_workers: int = eval_workers
+        self.eval_chunk_size: int = eval_chunk_size
+        self.evaluator = None
+        # Reuse or delta-update the previous iteration's costs of unchanged or slightly changed individuals
+        self.incremental_fitness: bool = incremental_fitness
+        # Gilmore-Lawler bound computed before iteration 0; the run stops once best_fitness
+        # reaches it or is within target_gap (relative) of it
+        self.compute_lower_bound: bool = compute_lower_bound
+        self.target_gap: Optional[float] = target_gap
+        self.lower_bound: Optional[float] = None
+        # The instance's bound when the caller already has it (races, service re-solves); skips its computation
+        self.precomputed_lower_bound: Optional[float] = lower_bound
+        # Absolute stopping target, e.g. a best-known cost plus tolerance
+        self.target_cost: Optional[float] = target_cost
+        # Re-seed the sardines when they go extinct ("random" or "elite") instead of stopping the run
+        self.restart_policy: Optional[str] = restart_policy
+        self.restart_radius: float = restart_radius
+        # Resize the sardine population between iterations to fit target_iteration_time (or the
+        # remaining time_budget per remaining iteration), growing it while the search stagnates
+        self.adaptive_sardines: bool = adaptive_sardines
+        self.target_iteration_time: Optional[float] = target_iteration_time
+        self.max_sardines: Optional[int] = max_sardines
+        self.seconds_per_individual: Optional[float] = None
+        self.sardine_target: Optional[int] = None
+        # (iteration, new sardine count) per resize; sardine_schedule replays recorded sizes
+        self.sardine_resizes: List[Tuple[int, int]] = []
+        self.sardine_schedule: Optional[Dict[int, int]] = None
+        # Known 1-based permutations (e.g. yesterday's best layout) whose random-key encodings replace
+        # the keys of warm_start_share of both populations; repeated copies are jittered by warm_start_jitter
+        self.warm_start: List[array] = []
+        for permutation in warm_start or ():
+            if sorted(permutation) != list(range(1, self.problem_size + 1)):
+                raise ValueError(f"Warm-start permutation {list(permutation)} is not a permutation of 1..{self.problem_size}")
+            self.warm_start.append(array(self.permutation_typecode, [facility - 1 for facility in permutation]))
+        self.warm_start_share: float = warm_start_share
+        self.warm_start_jitter: float = warm_start_jitter
+        # (sailfish, sardines) seeded from warm_start
+        self.warm_started: Optional[Tuple[int, int]] = None
+        # Sampler of the initial random keys: "uniform", "lhs" (Latin hypercube),
+        # "halton" (scrambled low-discrepancy) or "opposition" (better of x and 1 - x)
+        self.initializer: str = initializer
+        # OpenMetrics textfile shared by the process's runs, rewritten atomically every metrics_interval seconds
+        self.metrics_file: Optional[str] = metrics_file
+        self.metrics_interval: float = metrics_interval
+        self.metrics = None
+        # (instance hash prefix, data file) labelling this run's best cost in the metrics file
+        self.metrics_instance: Optional[Tuple[str, str]] = None
+        # Where this instance prints: the detailed report goes to out (the log file when logging,
+        # else output_stream), the terminal summaries to terminal; None means the current sys.stdout
+        self.output_stream: Optional[TextIO] = output
+        self.terminal_stream: Optional[TextIO] = terminal
         self.logger: Optional[OutputLogger] = None
         self.dual_logger: Optional[DualOutputLogger] = None
+        self.status_line: Optional["LiveStatusLine"] = None
+        # tracemalloc profiling; it slows headless runs about 20x and detailed runs, which
+        # allocate a string per printed line, about 25x (see README, Memory Profiling)
+        self.memory_profile: bool = memory_profile
         
         if dual_output:
             # Dual output mode - separate terminal and file output
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"sailfish_detailed_SF{n_sailfish}_S{n_sardines}_{timestamp}.txt"
             self.dual_logger = DualOutputLogger(filename)
+            from terminal_output import print_terminal_optimization_start, print_terminal_data_info, print_terminal_parameters
             # Show terminal info only
             print_terminal_optimization_start(self)
             print_terminal_data_info(self)
@@ -57,30 +181,33 @@ class SailfishOptimizer:
             self.dual_logger.write_to_file(f"Output will be logged to: {filename}\n")
             self.dual_logger.write_to_file(f"Run started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
             self.dual_logger.write_to_file(f"Parameters: {n_sailfish} sailfish, {n_sardines} sardines, A={A}, epsilon={epsilon}\n")
-            self.dual_logger.write_to_file(f"NOTE: Convergence checking is DISABLED - will run for full {max_iter} iterations\n")
+            from sfo.reporting import run_length_note
+            self.dual_logger.write_to_file(run_length_note(self) + "\n")
             self.dual_logger.write_to_file("="*80 + "\n\n")
-            # Redirect all print statements to file only
-            sys.stdout = self.dual_logger
         elif log_to_file:
             # Original single output mode
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"sailfish_output_SF{n_sailfish}_S{n_sardines}_{timestamp}.txt"
             self.logger = OutputLogger(filename)
-            sys.stdout = self.logger
-            print(f"Output will be logged to: {filename}")
-            print(f"Run started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            print(f"Parameters: {n_sailfish} sailfish, {n_sardines} sardines, A={A}, epsilon={epsilon}")
-            print(f"NOTE: Convergence checking is DISABLED - will run for full {max_iter} iterations")
-            print("="*80 + "\n")
+            print(f"Output will be logged to: {filename}", file=self.out)
+            print(f"Run started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", file=self.out)
+            print(f"Parameters: {n_sailfish} sailfish, {n_sardines} sardines, A={A}, epsilon={epsilon}", file=self.out)
+            from sfo.reporting import run_length_note
+            print(run_length_note(self), file=self.out)
+            print("="*80 + "\n", file=self.out)
+        if live_status:
+            from terminal_output import LiveStatusLine
+            # Terminal mode: status line on the real terminal, otherwise on stderr
+            self.status_line = LiveStatusLine(self.terminal if self.dual_logger else sys.stderr)
         self.sailfish_random_values: List[List[float]] = []
-        self.sailfish_solutions: List[List[int]] = []
+        self.sailfish_solutions: List[array] = []
         self.sailfish_fitness: List[float] = []
         self.sardine_random_values: List[List[float]] = []
-        self.sardine_solutions: List[List[int]] = []
+        self.sardine_solutions: List[array] = []
         self.sardine_fitness: List[float] = []
         self.original_sailfish_positions: List[List[float]] = []
         self.original_sardine_positions: List[List[float]] = []
-        self.best_solution: Optional[List[int]] = None
+        self.best_solution: Optional[array] = None
         self.best_fitness: float = float('inf')
         self.best_sardine_fitness: float = float('inf')
         self.fitness_history: List[float] = []
@@ -92,6 +219,34 @@ class SailfishOptimizer:
         self.PD: Optional[float] = None
         self.AP: Optional[float] = None
         self.current_iteration: int = 0
+        self.fitness_evaluations: int = 0
+        self.wall_time: float = 0.0
+        self.tabu_start_fitness: Optional[float] = None
+        self.annealing_steps: int = 0
+        # Diversity metric: individuals per iteration that duplicate another's permutation
+        self.duplicate_history: List[int] = []
+        self.reseeded_duplicates: int = 0
+        self.restarts: int = 0
+        # Populations (solutions, fitness) of the previous fitness step and the costs obtained without a full evaluation
+        self.previous_sailfish: Optional[Tuple[List[array], List[float]]] = None
+        self.previous_sardines: Optional[Tuple[List[array], List[float]]] = None
+        self.reused_costs: int = 0
+        self.incremental_costs: int = 0
+        # (elapsed seconds, fitness evaluations, best fitness) after every iteration
+        self.progress: List[Tuple[float, int, float]] = []
+        # Cumulative seconds per phase of run_iteration and the last improvement time
+        self.phase_times: Dict[str, float] = {}
+        self.run_start_time: Optional[float] = None
+        # Runs can pause between begin_run/continue_run/finish_run calls (e.g. racing rounds)
+        self.paused_at: Optional[float] = None
+        self.run_stopped: bool = False
+        # Why the run ended: a key of sfo.reporting.STOP_REASONS, set by finish_run at the latest
+        self.stop_reason: Optional[str] = None
+        self.last_improvement_time: Optional[float] = None
+        # Filled by sfo.memory when memory_profile is enabled
+        self.memory_history: List[dict] = []
+        self.memory_phase_peaks: Dict[str, int] = {}
+        self.memory_top_sites: list = []
         # NEW: Track which sailfish should use sardine sorted positions for updates
         self.sailfish_using_sardine_positions: dict = {}
 
@@ -99,50 +254,74 @@ class SailfishOptimizer:
         if self.dual_output and self.dual_logger:
             self.dual_logger.write_to_file(f"\nRun completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
             self.dual_logger.write_to_file("="*80 + "\n")
-            # Restore terminal output
-            sys.stdout = self.dual_logger.terminal
             self.dual_logger.close()
         elif self.log_to_file and self.logger:
-            print(f"\nRun completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            print("="*80)
-            sys.stdout = self.logger.terminal
+            print(f"\nRun completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", file=self.out)
+            print("="*80, file=self.out)
             self.logger.close()
 
+    @property
+    def out(self) -> TextIO:
+        """Sink of the detailed report: the log file when logging, else the output stream or sys.stdout."""
+        if self.dual_logger:
+            return self.dual_logger
+        if self.logger:
+            return self.logger
+        return self.output_stream if self.output_stream is not None else sys.stdout
+
+    @property
+    def terminal(self) -> TextIO:
+        """Sink of the terminal summaries of dual output mode."""
+        return self.terminal_stream if self.terminal_stream is not None else sys.stdout
+
     def _redirect_to_file(self, func, *args, **kwargs):
-        """Helper function to redirect output to file in dual output mode"""
-        if self.dual_output and self.dual_logger:
-            # stdout is already redirected to dual_logger, just call the function
-            func(*args, **kwargs)
-        else:
-            func(*args, **kwargs)
+        """Run a printing step; printers write to self.out, which is the log file in dual output mode"""
+        func(*args, **kwargs)
+
+    def _report(self, func, *args, **kwargs):
+        """Run an output-only step; skipped on the headless (verbose=False) path"""
+        if self.verbose:
+            self._redirect_to_file(func, *args, **kwargs)
 
     def save_original_positions(self) -> None:
         self._redirect_to_file(_save_original_positions, self)
 
     def print_initial_parameters(self) -> None:
-        self._redirect_to_file(_print_initial_parameters, self)
+        if self.verbose:
+            from sfo.reporting import print_initial_parameters as _print_initial_parameters
+            self._redirect_to_file(_print_initial_parameters, self)
 
     def generate_random_values(self, n_individuals: int) -> List[List[float]]:
         random_values: List[List[float]] = []
         for i in range(n_individuals):
-            individual_values = [round(random.random(), 3) for _ in range(self.problem_size)]
+            individual_values = [round(self.rng.random(), 3) for _ in range(self.problem_size)]
             random_values.append(individual_values)
         return random_values
 
     def print_random_populations(self) -> None:
         self._redirect_to_file(_print_random_populations, self)
 
-    def convert_random_to_solution(self, random_values: List[float]) -> Tuple[List[int], List[int]]:
-        n = len(random_values)
-        value_index_pairs: List[Tuple[float, int]] = [(random_values[i], i+1) for i in range(n)]
-        sorted_pairs: List[Tuple[float, int]] = sorted(value_index_pairs)
-        sorted_array = [pos for val, pos in sorted_pairs]
-        solution = sorted_array.copy()
+    def decode_random_keys(self, random_values: List[float]) -> array:
+        """0-based permutation of a random-key vector: key indices in ascending key order (ties by index)."""
+        return array(self.permutation_typecode, sorted(range(len(random_values)), key=random_values.__getitem__))
+
+    def convert_random_to_solution(self, random_values: List[float]) -> Tuple[array, List[int]]:
+        solution = self.decode_random_keys(random_values)
+        sorted_array = one_based(solution)
         return solution, sorted_array
 
+    def convert_solution_to_random(self, solution: array, random_values: List[float]) -> List[float]:
+        return _encode_solution_to_random_values(solution, random_values)
+
     def print_sorted_arrays_and_solutions(self) -> None:
         self._redirect_to_file(_print_sorted_arrays_and_solutions, self)
 
+    def detect_duplicate_permutations(self) -> None:
+        self._redirect_to_file(_detect_duplicate_permutations, self)
+
+    def restart_sardine_population(self) -> None:
+        _restart_sardine_population(self)
+
     def calculate_detailed_fitness(self) -> None:
         self._redirect_to_file(_calculate_detailed_fitness, self)
 
@@ -153,7 +332,9 @@ class SailfishOptimizer:
         _perform_sailfish_sardine_replacement(self)
 
     def print_comprehensive_results_table(self) -> None:
-        self._redirect_to_file(_print_comprehensive_results_table, self)
+        if self.verbose:
+            from sfo.reporting import print_comprehensive_results_table as _print_comprehensive_results_table
+            self._redirect_to_file(_print_comprehensive_results_table, self)
 
     def calculate_pd_and_lambda_values(self) -> None:
         _calculate_pd_and_lambda_values(self)
@@ -172,105 +353,306 @@ class SailfishOptimizer:
         from sfo.dynamics import update_partial_sardines as __update_partial
         __update_partial(self)
 
+    def _run_phase(self, phase: str, func: Callable[[], None]) -> None:
+        """Run one phase of an iteration and accumulate its wall time."""
+        if self.memory_profile:
+            from sfo.memory import begin_phase_memory, record_phase_memory
+            begin_phase_memory()
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        self.phase_times[phase] = self.phase_times.get(phase, 0.0) + elapsed
+        if self.metrics is not None:
+            self.metrics.observe_phase(phase, elapsed)
+        if self.memory_profile:
+            record_phase_memory(self, phase)
+
+    def calculate_lower_bound(self) -> None:
+        if self.precomputed_lower_bound is not None:
+            self.lower_bound = self.precomputed_lower_bound
+        else:
+            self.lower_bound = gilmore_lawler_bound(self.freq_matrix, self.distance_matrix)
+        self._report(lambda: print(f"Gilmore-Lawler lower bound: {self.lower_bound}", file=self.out))
+
+    def early_stop_conditions(self) -> List[str]:
+        """Conditions besides max_iter that can end this run, for the run headers."""
+        conditions = []
+        if self.restart_policy is None:
+            conditions.append("sardine extinction")
+        if self.compute_lower_bound or self.target_gap is not None:
+            conditions.append("reaching the lower bound")
+        if self.target_gap is not None:
+            conditions.append(f"a gap of {self.target_gap} to the lower bound")
+        if self.target_cost is not None:
+            conditions.append(f"a cost of {self.target_cost}")
+        if self.time_budget is not None:
+            conditions.append(f"a time budget of {self.time_budget}s")
+        return conditions
+
+    def target_stop_reason(self) -> Optional[str]:
+        """
+        'target_cost' once best_fitness reaches target_cost, 'lower_bound' once it
+        is provably optimal, 'target_gap' once it is within target_gap of the
+        lower bound, else None.
+        """
+        if self.target_cost is not None and self.best_fitness <= self.target_cost:
+            return "target_cost"
+        if self.lower_bound is None:
+            return None
+        gap = optimality_gap(self.best_fitness, self.lower_bound)
+        if gap == 0.0:
+            return "lower_bound"
+        if self.target_gap is not None and gap <= self.target_gap:
+            return "target_gap"
+        return None
+
+    def target_reached(self) -> bool:
+        """True once best_fitness reaches target_cost, is provably optimal, or is within target_gap of the lower bound."""
+        return self.target_stop_reason() is not None
+
+    def _record_iteration_best(self) -> None:
+        now = time.perf_counter()
+        if not self.fitness_history or self.best_fitness < self.fitness_history[-1]:
+            self.last_improvement_time = now
+        self.fitness_history.append(self.best_fitness)
+        self.progress.append((now - self.run_start_time, self.fitness_evaluations, self.best_fitness))
+        if self.trace is not None:
+            self.trace.record_iteration(self)
+        if self.metrics is not None:
+            self.metrics.maybe_write()
+
+    def _print_iteration_status(self, iteration_num: int) -> None:
+        if self.status_line:
+            self.status_line.update(self)
+        elif self.dual_output:
+            from terminal_output import print_terminal_iteration_summary
+            print_terminal_iteration_summary(self, iteration_num)
+
     def run_iteration_zero(self) -> None:
         self.current_iteration = 0
-        self.print_initial_parameters()
-        self.print_random_populations()
-        self.save_original_positions()
-        self.print_sorted_arrays_and_solutions()
-        self.calculate_detailed_fitness()
-        self.print_fitness_summary()
-        self.print_comprehensive_results_table()
-        self.calculate_pd_and_lambda_values()
-        self.update_sailfish_positions()
-        self.calculate_ap_and_update_sardines()
-        self.fitness_history.append(self.best_fitness)
+        if self.memory_profile:
+            from sfo.memory import begin_iteration_memory
+            begin_iteration_memory(self)
+        self._run_phase("initial_parameters", self.print_initial_parameters)
+        self._run_phase("initialization", self.print_random_populations)
+        self._run_phase("save_positions", self.save_original_positions)
+        self._run_phase("sorting", self.print_sorted_arrays_and_solutions)
+        self._run_phase("diversity", self.detect_duplicate_permutations)
+        self._run_phase("fitness", self.calculate_detailed_fitness)
+        self._run_phase("fitness_summary", self.print_fitness_summary)
+        self._run_phase("results_table", self.print_comprehensive_results_table)
+        self._run_phase("pd_lambda", self.calculate_pd_and_lambda_values)
+        self._run_phase("sailfish_update", self.update_sailfish_positions)
+        self._run_phase("sardine_update", self.calculate_ap_and_update_sardines)
+        self._record_iteration_best()
         
         # File output
-        self._redirect_to_file(lambda: print(f"\n" + "="*80))
-        self._redirect_to_file(lambda: print("ITERATION 0 COMPLETED"))
-        self._redirect_to_file(lambda: print("="*80))
-        self._redirect_to_file(lambda: print(f"Best fitness so far: {self.best_fitness}"))
-        self._redirect_to_file(lambda: print(f"Best solution: {self.best_solution}"))
-        self._redirect_to_file(lambda: print(f"Current populations: {self.n_sailfish} sailfish, {self.n_sardines} sardines"))
+        self._report(lambda: print(f"\n" + "="*80, file=self.out))
+        self._report(lambda: print("ITERATION 0 COMPLETED", file=self.out))
+        self._report(lambda: print("="*80, file=self.out))
+        self._report(lambda: print(f"Best fitness so far: {self.best_fitness}", file=self.out))
+        self._report(lambda: print(f"Best solution: {one_based(self.best_solution)}", file=self.out))
+        self._report(lambda: print(f"Current populations: {self.n_sailfish} sailfish, {self.n_sardines} sardines", file=self.out))
         
         # Terminal output
-        if self.dual_output:
-            # Restore terminal output temporarily for iteration summary
-            original_stdout = sys.stdout
-            sys.stdout = self.dual_logger.terminal
-            print_terminal_iteration_summary(self, 0)
-            sys.stdout = original_stdout
+        self._print_iteration_status(0)
 
     def run_iteration(self, iteration_num: int) -> None:
         self.current_iteration = iteration_num
+        if self.memory_profile:
+            from sfo.memory import begin_iteration_memory
+            begin_iteration_memory(self)
         
         # File output
-        self._redirect_to_file(lambda: print(f"\n" + "="*100))
-        self._redirect_to_file(lambda: print(f"STARTING ITERATION {iteration_num}"))
-        self._redirect_to_file(lambda: print("="*100))
-        self._redirect_to_file(lambda: print("CRITICAL FIX: Saving original positions from previous iteration for position updates..."))
+        self._report(lambda: print(f"\n" + "="*100, file=self.out))
+        self._report(lambda: print(f"STARTING ITERATION {iteration_num}", file=self.out))
+        self._report(lambda: print("="*100, file=self.out))
+        self._report(lambda: print("CRITICAL FIX: Saving original positions from previous iteration for position updates...", file=self.out))
         
-        self.save_original_positions()
-        self.print_sorted_arrays_and_solutions()
-        self.calculate_detailed_fitness()
-        self.print_fitness_summary()
-        self.perform_sailfish_sardine_replacement()
-        self.print_comprehensive_results_table()
-        self.calculate_pd_and_lambda_values()
-        self.update_sailfish_positions()
-        self.calculate_ap_and_update_sardines()
-        self.fitness_history.append(self.best_fitness)
+        self._run_phase("save_positions", self.save_original_positions)
+        self._run_phase("sorting", self.print_sorted_arrays_and_solutions)
+        self._run_phase("diversity", self.detect_duplicate_permutations)
+        self._run_phase("fitness", self.calculate_detailed_fitness)
+        self._run_phase("fitness_summary", self.print_fitness_summary)
+        self._run_phase("replacement", self.perform_sailfish_sardine_replacement)
+        self._run_phase("results_table", self.print_comprehensive_results_table)
+        self._run_phase("pd_lambda", self.calculate_pd_and_lambda_values)
+        self._run_phase("sailfish_update", self.update_sailfish_positions)
+        self._run_phase("sardine_update", self.calculate_ap_and_update_sardines)
+        self._record_iteration_best()
         
         # File output
-        self._redirect_to_file(lambda: print(f"\n" + "="*80))
-        self._redirect_to_file(lambda: print(f"ITERATION {iteration_num} COMPLETED"))
-        self._redirect_to_file(lambda: print("="*80))
-        self._redirect_to_file(lambda: print(f"Best fitness so far: {self.best_fitness}"))
-        self._redirect_to_file(lambda: print(f"Best solution: {self.best_solution}"))
-        self._redirect_to_file(lambda: print(f"Current populations: {self.n_sailfish} sailfish, {self.n_sardines} sardines"))
+        self._report(lambda: print(f"\n" + "="*80, file=self.out))
+        self._report(lambda: print(f"ITERATION {iteration_num} COMPLETED", file=self.out))
+        self._report(lambda: print("="*80, file=self.out))
+        self._report(lambda: print(f"Best fitness so far: {self.best_fitness}", file=self.out))
+        self._report(lambda: print(f"Best solution: {one_based(self.best_solution)}", file=self.out))
+        self._report(lambda: print(f"Current populations: {self.n_sailfish} sailfish, {self.n_sardines} sardines", file=self.out))
         
         # Terminal output
-        if self.dual_output:
-            # Restore terminal output temporarily for iteration summary
-            original_stdout = sys.stdout
-            sys.stdout = self.dual_logger.terminal
-            print_terminal_iteration_summary(self, iteration_num)
-            sys.stdout = original_stdout
+        self._print_iteration_status(iteration_num)
 
     def run_optimization(self) -> None:
+        self.begin_run()
+        self.continue_run()
+        self.finish_run()
+
+    def begin_run(self) -> None:
+        """Start a run: set up profiling and evaluation, then run iteration 0."""
         # File output
-        self._redirect_to_file(lambda: print("STARTING SAILFISH OPTIMIZATION ALGORITHM (NO CONVERGENCE CHECK)"))
-        self._redirect_to_file(lambda: print("="*80))
-        self._redirect_to_file(lambda: print("NOTE: Algorithm will run for the full number of specified iterations"))
-        self._redirect_to_file(lambda: print("regardless of improvement rate between iterations."))
-        self._redirect_to_file(lambda: print())
+        self._report(lambda: print("STARTING SAILFISH OPTIMIZATION ALGORITHM (NO CONVERGENCE CHECK)", file=self.out))
+        self._report(lambda: print("="*80, file=self.out))
+        conditions = self.early_stop_conditions()
+        if conditions:
+            self._report(lambda: print(f"NOTE: Algorithm will run for up to {self.max_iter} iterations, stopping early on", file=self.out))
+            self._report(lambda: print(f"{', '.join(conditions)}, regardless of improvement rate between iterations.", file=self.out))
+        else:
+            self._report(lambda: print("NOTE: Algorithm will run for the full number of specified iterations", file=self.out))
+            self._report(lambda: print("regardless of improvement rate between iterations.", file=self.out))
+        self._report(lambda: print(file=self.out))
         
-        self.run_iteration_zero()
-        for iteration in range(1, self.max_iter + 1):
-            # Check if sardines were eliminated during the previous iteration
-            if self.n_sardines == 0:
-                self._redirect_to_file(lambda: print(f"\nNo sardines remaining after iteration {iteration-1}. Stopping optimization."))
-                break
-            self.run_iteration(iteration)
-            # Check if sardines were eliminated during this iteration (after replacement)
-            if self.n_sardines == 0:
-                self._redirect_to_file(lambda: print(f"\nSardine population eliminated during iteration {iteration}. Stopping optimization."))
-                break
+        if self.memory_profile:
+            from sfo.memory import start_memory_profiling
+            start_memory_profiling(self)
+        self.run_start_time = time.perf_counter()
+        self.run_stopped = False
+        self.stop_reason = None
+        if self.metrics_file:
+            from sfo.metrics import metrics_exporter
+            self.metrics = metrics_exporter(self.metrics_file, self.metrics_interval)
+            self.metrics.start_run(self)
+        # Verbose runs print every cost calculation and so evaluate serially
+        if self.eval_workers > 0 and not self.verbose:
+            from sfo.evaluation import start_parallel_evaluation
+            start_parallel_evaluation(self)
+        try:
+            if self.compute_lower_bound or self.target_gap is not None:
+                self._run_phase("lower_bound", self.calculate_lower_bound)
+            self.run_iteration_zero()
+        except BaseException:
+            self._release_run()
+            raise
+        self.paused_at = time.perf_counter()
+
+    def continue_run(self, until_iteration: Optional[int] = None) -> bool:
+        """
+        Run iterations up to until_iteration (default: max_iter) or until a
+        stopping condition. Time spent paused between calls is not counted as
+        run time. Returns True if the run can be continued further.
+        """
+        # Paused time is excluded from elapsed times, time_budget and adaptive throughput
+        self.run_start_time += time.perf_counter() - self.paused_at
+        last = self.max_iter if until_iteration is None else min(until_iteration, self.max_iter)
+        try:
+            for iteration in range(self.current_iteration + 1, last + 1):
+                if self.run_stopped:
+                    break
+                # Check if sardines were eliminated during the previous iteration
+                if self.n_sardines == 0:
+                    if self.restart_policy is None:
+                        self._report(lambda: print(f"\nNo sardines remaining after iteration {iteration-1}. Stopping optimization.", file=self.out))
+                        self.stop_reason = "extinction"
+                        self.run_stopped = True
+                        break
+                    self._run_phase("restart", self.restart_sardine_population)
+                if self.time_budget is not None and time.perf_counter() - self.run_start_time >= self.time_budget:
+                    self._report(lambda: print(f"\nTime budget of {self.time_budget}s reached after iteration {iteration-1}. Stopping optimization.", file=self.out))
+                    self.stop_reason = "time_budget"
+                    self.run_stopped = True
+                    break
+                target = self.target_stop_reason()
+                if target:
+                    self._report(lambda: print(f"\nTarget reached (best fitness {self.best_fitness}, lower bound {self.lower_bound}) "
+                                               f"after iteration {iteration-1}. Stopping optimization.", file=self.out))
+                    self.stop_reason = target
+                    self.run_stopped = True
+                    break
+                self.run_iteration(iteration)
+                # Check if sardines were eliminated during this iteration (after replacement)
+                if self.n_sardines == 0 and self.restart_policy is None:
+                    self._report(lambda: print(f"\nSardine population eliminated during iteration {iteration}. Stopping optimization.", file=self.out))
+                    self.stop_reason = "extinction"
+                    self.run_stopped = True
+                    break
+                if self.adaptive_sardines:
+                    self._run_phase("adaptive_sizing", self.adapt_sardine_population)
+        except BaseException:
+            self._release_run()
+            raise
+        self.paused_at = time.perf_counter()
+        return not self.run_stopped and self.current_iteration < self.max_iter
+
+    def finish_run(self) -> None:
+        """End a run: tabu intensification, final results, results store and trace."""
+        self.run_start_time += time.perf_counter() - self.paused_at
+        if self.stop_reason is None:
+            self.stop_reason = "max_iter" if self.current_iteration >= self.max_iter else "caller"
+        try:
+            if self.tabu_iterations > 0 and not self.target_reached():
+                self._run_phase("tabu", self.run_tabu_intensification)
+                self.progress.append((time.perf_counter() - self.run_start_time, self.fitness_evaluations, self.best_fitness))
+        finally:
+            self._release_run()
+        self.wall_time = time.perf_counter() - self.run_start_time
+        if self.status_line:
+            self.status_line.finish(self)
+        if self.memory_profile:
+            from sfo.memory import finish_memory_profiling
+            finish_memory_profiling(self)
         
         # Show final results
         if self.dual_output:
-            # Restore terminal output temporarily for final results
-            original_stdout = sys.stdout
-            sys.stdout = self.dual_logger.terminal
+            from terminal_output import print_terminal_final_results
             print_terminal_final_results(self)
-            sys.stdout = original_stdout
         self.print_final_results()
+        if self.memory_profile:
+            self.print_memory_report()
+        if self.results_db:
+            self.record_run()
+        if self.trace_file:
+            self.trace.write(self.trace_file, self)
+
+    def abandon_run(self) -> None:
+        """Drop a paused run without finishing it (no results, store row or trace); frees its evaluation pool."""
+        self.wall_time = self.paused_at - self.run_start_time
+        self._release_run()
+
+    def _release_run(self) -> None:
+        """Stop the evaluation pool and report the run as ended to the metrics file."""
+        if self.evaluator is not None:
+            from sfo.evaluation import stop_parallel_evaluation
+            stop_parallel_evaluation(self)
+        if self.metrics is not None:
+            self.metrics.end_run(self)
+            self.metrics = None
+
+    def print_memory_report(self) -> None:
+        from sfo.reporting import print_memory_report as _print_memory_report
+        self._report(_print_memory_report, self)
+        if self.dual_output:
+            _print_memory_report(self, self.terminal)
+
+    def record_run(self) -> None:
+        """Append this run's summary row to the results store."""
+        from results_store import RunStore, run_record
+        with RunStore(self.results_db) as store:
+            store.append_run(run_record(self, self.wall_time))
+
+    def adapt_sardine_population(self) -> None:
+        from sfo.adaptive import adapt_sardine_population as _adapt_sardine_population
+        _adapt_sardine_population(self)
+
+    def run_tabu_intensification(self) -> None:
+        from sfo.tabu import run_tabu_intensification as _run_tabu_intensification
+        self._redirect_to_file(_run_tabu_intensification, self)
 
     def print_final_results(self) -> None:
-        self._redirect_to_file(_print_final_results, self)
+        if self.verbose:
+            from sfo.reporting import print_final_results as _print_final_results
+            self._redirect_to_file(_print_final_results, self)
 
     def report_sardine_population_extinction(self, iteration_when_extinct: int) -> None:
+        from sfo.reporting import report_sardine_population_extinction as _report_sardine_population_extinction
         _report_sardine_population_extinction(self, iteration_when_extinct)
 
 
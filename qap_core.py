@@ -1,4 +1,7 @@
-from typing import List, Tuple
+import hashlib
+import operator
+from array import array
+from typing import List, Optional, Sequence, TextIO, Tuple
 
 
 def get_default_matrices() -> Tuple[List[List[float]], List[List[float]]]:
@@ -25,9 +28,11 @@ def calculate_qap_fitness(
     freq_matrix: List[List[float]],
     distance_matrix: List[List[float]],
     show_details: bool = False,
+    out: Optional[TextIO] = None,
 ) -> float:
     """
     Calculate the Quadratic Assignment Problem (QAP) fitness value.
+    The details are printed to out (default: sys.stdout).
     """
     n = len(permutation)
     assignment_matrix: List[List[int]] = [[0 for _ in range(n)] for _ in range(n)]
@@ -42,21 +47,21 @@ def calculate_qap_fitness(
     total_cost: float = 0
     calculation_details: List[dict] = []
     if show_details:
-        print(f"\n" + "="*80)
-        print(f"DETAILED QAP CALCULATION FOR PERMUTATION {permutation}")
-        print("="*80)
-        print_assignment_matrix(permutation)
-        print("="*80)
+        print(f"\n" + "="*80, file=out)
+        print(f"DETAILED QAP CALCULATION FOR PERMUTATION {permutation}", file=out)
+        print("="*80, file=out)
+        print_assignment_matrix(permutation, out)
+        print("="*80, file=out)
     for i, (facility_i, location_j) in enumerate(non_zero_positions):
         if show_details:
-            print(f"\nLoop {i+1} - x{facility_i+1}{location_j+1} with all other non-zero positions:")
+            print(f"\nLoop {i+1} - x{facility_i+1}{location_j+1} with all other non-zero positions:", file=out)
         loop_total = 0
         for k, (facility_k, location_l) in enumerate(non_zero_positions):
             freq_ik = freq_matrix[facility_i][facility_k]
             dist_jl = distance_matrix[location_j][location_l]
             term_value = freq_ik * dist_jl
             if show_details:
-                print(f"  x{facility_i+1}{location_j+1} × x{facility_k+1}{location_l+1} × f{facility_i+1}{facility_k+1} × d{location_j+1}{location_l+1} = (1)(1)({freq_ik})({dist_jl}) = {term_value}")
+                print(f"  x{facility_i+1}{location_j+1} × x{facility_k+1}{location_l+1} × f{facility_i+1}{facility_k+1} × d{location_j+1}{location_l+1} = (1)(1)({freq_ik})({dist_jl}) = {term_value}", file=out)
             calculation_details.append({
                 'x_ij': f'x{facility_i+1}{location_j+1}',
                 'x_kl': f'x{facility_k+1}{location_l+1}',
@@ -67,88 +72,326 @@ def calculate_qap_fitness(
             loop_total += term_value
             total_cost += term_value
         if show_details:
-            print(f"  Loop {i+1} subtotal: {loop_total}")
+            print(f"  Loop {i+1} subtotal: {loop_total}", file=out)
     if show_details:
-        print(f"\n" + "="*80)
-        print(f"CALCULATION SUMMARY:")
-        print("="*80)
-        print(f"All terms: {' + '.join([str(detail['value']) for detail in calculation_details])}")
-        print(f"TOTAL COST = {total_cost}")
-        print("="*80)
+        print(f"\n" + "="*80, file=out)
+        print(f"CALCULATION SUMMARY:", file=out)
+        print("="*80, file=out)
+        print(f"All terms: {' + '.join([str(detail['value']) for detail in calculation_details])}", file=out)
+        print(f"TOTAL COST = {total_cost}", file=out)
+        print("="*80, file=out)
     return total_cost
 
 
-def print_assignment_matrix(permutation: List[int]) -> None:
-    """Print the assignment matrix for visualization."""
+def permutation_typecode(n: int) -> str:
+    """Smallest array typecode holding the 0-based facilities of an n-facility instance."""
+    return "h" if n < 32768 else "i"
+
+
+# Matrix storage modes of the instance loaders
+MATRIX_STORAGE = ("float", "exact", "compact")
+_INT32 = 2 ** 31
+
+
+def matrix_typecode(matrix: Sequence[Sequence[float]]) -> str:
+    """
+    Smallest array typecode holding every entry of a matrix exactly: 'i' (int32)
+    or 'q' (int64) when all entries are whole numbers, otherwise 'd'.
+    """
+    typecode = "i"
+    for row in matrix:
+        for x in row:
+            if not float(x).is_integer():
+                return "d"
+            if not -_INT32 <= x < _INT32:
+                typecode = "q"
+    return typecode
+
+
+def store_matrix(matrix: Sequence[Sequence[float]], storage: str = "float") -> Sequence[Sequence[float]]:
+    """
+    Rows of a matrix in a storage mode. "float" keeps the matrix as given.
+    "exact" turns an integral matrix into lists of ints, so costs are exact
+    integer sums at any magnitude. "compact" stores the rows as arrays of the
+    matrix_typecode (4 bytes per entry for int32 instead of a pointer to a
+    float object). Non-integral matrices keep their float values.
+    """
+    if storage not in MATRIX_STORAGE:
+        raise ValueError(f"Unknown matrix storage '{storage}'. Choose from: {', '.join(MATRIX_STORAGE)}")
+    if storage == "float":
+        return matrix
+    typecode = matrix_typecode(matrix)
+    if storage == "compact":
+        return [array(typecode, row if typecode == "d" else map(int, row)) for row in matrix]
+    if typecode == "d":
+        return matrix
+    # One int object per distinct value: the rows then cost a pointer per entry
+    values: dict = {}
+    return [[values.setdefault(x, int(x)) for x in row] for row in matrix]
+
+
+def one_based(facilities: Sequence[int]) -> List[int]:
+    """1-based facility list of a 0-based permutation, for reports and stored results."""
+    return [facility + 1 for facility in facilities]
+
+
+def calculate_qap_cost(
+    permutation: List[int],
+    freq_matrix: List[List[float]],
+    distance_matrix: List[List[float]],
+) -> float:
+    """
+    Calculate the QAP cost of a 1-based permutation without building the
+    assignment matrix or any calculation details.
+    """
+    return calculate_facilities_cost([facility - 1 for facility in permutation], freq_matrix, distance_matrix)
+
+
+def calculate_facilities_cost(
+    facilities: Sequence[int],
+    freq_matrix: List[List[float]],
+    distance_matrix: List[List[float]],
+) -> float:
+    """QAP cost of a 0-based permutation (the facility at each location), as stored by the optimizer."""
+    total_cost: float = 0
+    for location_j, facility_i in enumerate(facilities):
+        freq_row = freq_matrix[facility_i]
+        dist_row = distance_matrix[location_j]
+        for location_l, facility_k in enumerate(facilities):
+            total_cost += freq_row[facility_k] * dist_row[location_l]
+    return total_cost
+
+
+def calculate_swap_delta(
+    facilities: List[int],
+    freq_matrix: List[List[float]],
+    distance_matrix: List[List[float]],
+    r: int,
+    s: int,
+) -> float:
+    """
+    Return the cost change of exchanging the facilities at locations r and s
+    in O(n). `facilities` holds the 0-based facility at each location.
+    """
+    f, d = freq_matrix, distance_matrix
+    fr, fs = facilities[r], facilities[s]
+    delta = (d[r][r] - d[s][s]) * (f[fs][fs] - f[fr][fr]) + (d[r][s] - d[s][r]) * (f[fs][fr] - f[fr][fs])
+    for k, fk in enumerate(facilities):
+        if k != r and k != s:
+            delta += (d[k][r] - d[k][s]) * (f[fk][fs] - f[fk][fr]) + (d[r][k] - d[s][k]) * (f[fs][fk] - f[fr][fk])
+    return delta
+
+
+def calculate_cost_by_swaps(
+    previous: Sequence[int],
+    previous_cost: float,
+    permutation: Sequence[int],
+    freq_matrix: List[List[float]],
+    distance_matrix: List[List[float]],
+    max_swaps: int,
+) -> Tuple[Optional[float], int]:
+    """
+    Cost of a 0-based permutation derived from a previous one and its cost by
+    the shortest sequence of swaps between them, each costed in O(n).
+    Returns (None, swaps) once more than max_swaps swaps would be needed.
+    """
+    facilities = list(previous)
+    location_of = [0] * len(facilities)
+    for location, facility in enumerate(facilities):
+        location_of[facility] = location
+    # Plan the swaps first (O(n)) so permutations too far away cost no delta work
+    target = permutation
+    planned = facilities.copy()
+    swaps: List[Tuple[int, int]] = []
+    for location, facility in enumerate(target):
+        if planned[location] == facility:
+            continue
+        other = location_of[facility]
+        swaps.append((location, other))
+        if len(swaps) > max_swaps:
+            return None, len(swaps)
+        planned[location], planned[other] = facility, planned[location]
+        location_of[planned[other]] = other
+        location_of[facility] = location
+    cost = previous_cost
+    for r, s in swaps:
+        cost += calculate_swap_delta(facilities, freq_matrix, distance_matrix, r, s)
+        facilities[r], facilities[s] = facilities[s], facilities[r]
+    return cost, len(swaps)
+
+
+def solve_linear_assignment(cost: List[List[float]]) -> Tuple[List[int], float]:
+    """
+    Minimum-cost assignment of rows to columns of a square cost matrix with the
+    shortest augmenting path Hungarian algorithm (Jonker-Volgenant style), O(n^3).
+    Returns (column assigned to each row, total cost).
+    """
+    n = len(cost)
+    inf = float("inf")
+    # Dual potentials of rows (u) and columns (v); index 0 is a virtual column
+    u = [0.0] * (n + 1)
+    v = [0.0] * (n + 1)
+    row_of = [0] * (n + 1)
+    way = [0] * (n + 1)
+    for row in range(1, n + 1):
+        row_of[0] = row
+        column = 0
+        min_slack = [inf] * (n + 1)
+        used = [False] * (n + 1)
+        while True:
+            used[column] = True
+            current = row_of[column]
+            current_cost = cost[current - 1]
+            delta = inf
+            next_column = 0
+            for j in range(1, n + 1):
+                if not used[j]:
+                    slack = current_cost[j - 1] - u[current] - v[j]
+                    if slack < min_slack[j]:
+                        min_slack[j] = slack
+                        way[j] = column
+                    if min_slack[j] < delta:
+                        delta = min_slack[j]
+                        next_column = j
+            for j in range(n + 1):
+                if used[j]:
+                    u[row_of[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_slack[j] -= delta
+            column = next_column
+            if row_of[column] == 0:
+                break
+        while column:
+            previous = way[column]
+            row_of[column] = row_of[previous]
+            column = previous
+    assignment = [0] * n
+    for j in range(1, n + 1):
+        assignment[row_of[j] - 1] = j - 1
+    return assignment, sum(cost[i][assignment[i]] for i in range(n))
+
+
+def gilmore_lawler_bound(freq_matrix: List[List[float]], distance_matrix: List[List[float]]) -> float:
+    """
+    Gilmore-Lawler lower bound. Placing facility i at location j costs at least
+    F[i][i]*D[j][j] plus the minimal scalar product of the off-diagonal rows
+    F[i] (ascending) and D[j] (descending); the optimal linear assignment over
+    these costs bounds every permutation's QAP cost from below.
+    """
+    n = len(freq_matrix)
+    freq_rows = [sorted(freq_matrix[i][k] for k in range(n) if k != i) for i in range(n)]
+    dist_rows = [sorted((distance_matrix[j][l] for l in range(n) if l != j), reverse=True) for j in range(n)]
+    cost = [[freq_matrix[i][i] * distance_matrix[j][j] + sum(map(operator.mul, freq_rows[i], dist_rows[j]))
+             for j in range(n)] for i in range(n)]
+    return solve_linear_assignment(cost)[1]
+
+
+def optimality_gap(cost: float, lower_bound: float) -> float:
+    """Relative gap of a cost above a lower bound (0.0 means provably optimal)."""
+    if cost <= lower_bound:
+        return 0.0
+    return (cost - lower_bound) / abs(lower_bound) if lower_bound else float("inf")
+
+
+def print_assignment_matrix(permutation: List[int], out: Optional[TextIO] = None) -> None:
+    """Print the assignment matrix for visualization (to out, default sys.stdout)."""
     n = len(permutation)
     assignment_matrix: List[List[int]] = [[0 for _ in range(n)] for _ in range(n)]
     for location in range(n):
         facility = permutation[location] - 1
         assignment_matrix[facility][location] = 1
-    print("\nAssignment Matrix:")
-    print("Facilities\\Locations ", end="")
+    print("\nAssignment Matrix:", file=out)
+    print("Facilities\\Locations ", end="", file=out)
     for j in range(n):
-        print(f"{j+1:2}", end=" ")
-    print()
+        print(f"{j+1:2}", end=" ", file=out)
+    print(file=out)
     for i in range(n):
-        print(f"Facility {i+1}        ( ", end="")
+        print(f"Facility {i+1}        ( ", end="", file=out)
         for j in range(n):
-            print(f"{assignment_matrix[i][j]:2}", end=" ")
-        print(")")
-    print(f"\nPermutation {permutation} interpretation:")
+            print(f"{assignment_matrix[i][j]:2}", end=" ", file=out)
+        print(")", file=out)
+    print(f"\nPermutation {permutation} interpretation:", file=out)
     for location in range(n):
         facility = permutation[location]
-        print(f"  Location {location+1} → Facility {facility}")
+        print(f"  Location {location+1} → Facility {facility}", file=out)
+
 
+def instance_hash(freq_matrix: List[List[float]], distance_matrix: List[List[float]]) -> str:
+    """Return a stable SHA-256 digest identifying a QAP instance by its matrix contents."""
+    digest = hashlib.sha256()
+    digest.update(str(len(freq_matrix)).encode("ascii"))
+    for matrix in (freq_matrix, distance_matrix):
+        for row in matrix:
+            digest.update(b"|" + ",".join(repr(float(x)) for x in row).encode("ascii"))
+    return digest.hexdigest()
 
-def print_matrices(freq_matrix: List[List[float]], distance_matrix: List[List[float]]) -> None:
-    """Print the frequency and distance matrices in a clear, readable format."""
+
+def print_matrices(
+    freq_matrix: List[List[float]],
+    distance_matrix: List[List[float]],
+    out: Optional[TextIO] = None,
+) -> None:
+    """Print the frequency and distance matrices in a clear, readable format (to out, default sys.stdout)."""
     n = len(freq_matrix)
     
-    print("\n📊 FREQUENCY MATRIX (Flow between facilities)")
-    print("=" * 60)
-    print("    ", end="")
+    print("\n📊 FREQUENCY MATRIX (Flow between facilities)", file=out)
+    print("=" * 60, file=out)
+    print("    ", end="", file=out)
     for j in range(n):
-        print(f"F{j+1:>6}", end="")
-    print()
-    print("    " + "-" * (7 * n))
+        print(f"F{j+1:>6}", end="", file=out)
+    print(file=out)
+    print("    " + "-" * (7 * n), file=out)
     
     for i in range(n):
-        print(f"F{i+1} |", end="")
+        print(f"F{i+1} |", end="", file=out)
         for j in range(n):
             if freq_matrix[i][j] == int(freq_matrix[i][j]):
-                print(f"{int(freq_matrix[i][j]):>6}", end="")
+                print(f"{int(freq_matrix[i][j]):>6}", end="", file=out)
             else:
-                print(f"{freq_matrix[i][j]:>6.1f}", end="")
-        print()
+                print(f"{freq_matrix[i][j]:>6.1f}", end="", file=out)
+        print(file=out)
     
-    print("\n📍 DISTANCE MATRIX (Distance between locations)")
-    print("=" * 60)
-    print("    ", end="")
+    print("\n📍 DISTANCE MATRIX (Distance between locations)", file=out)
+    print("=" * 60, file=out)
+    print("    ", end="", file=out)
     for j in range(n):
-        print(f"L{j+1:>6}", end="")
-    print()
-    print("    " + "-" * (7 * n))
+        print(f"L{j+1:>6}", end="", file=out)
+    print(file=out)
+    print("    " + "-" * (7 * n), file=out)
     
     for i in range(n):
-        print(f"L{i+1} |", end="")
+        print(f"L{i+1} |", end="", file=out)
         for j in range(n):
             if distance_matrix[i][j] == int(distance_matrix[i][j]):
-                print(f"{int(distance_matrix[i][j]):>6}", end="")
+                print(f"{int(distance_matrix[i][j]):>6}", end="", file=out)
             else:
-                print(f"{distance_matrix[i][j]:>6.1f}", end="")
-        print()
+                print(f"{distance_matrix[i][j]:>6.1f}", end="", file=out)
+        print(file=out)
     
-    print("\n💡 Matrix Interpretation:")
-    print("   • Frequency Matrix: Shows interaction frequency between facilities")
-    print("   • Distance Matrix: Shows physical distances between locations")
-    print("   • Goal: Minimize total cost = Σ(frequency × distance) for all pairs")
+    print("\n💡 Matrix Interpretation:", file=out)
+    print("   • Frequency Matrix: Shows interaction frequency between facilities", file=out)
+    print("   • Distance Matrix: Shows physical distances between locations", file=out)
+    print("   • Goal: Minimize total cost = Σ(frequency × distance) for all pairs", file=out)
 
 
 __all__ = [
     "get_default_matrices",
     "calculate_qap_fitness",
+    "calculate_qap_cost",
+    "calculate_facilities_cost",
+    "permutation_typecode",
+    "MATRIX_STORAGE",
+    "matrix_typecode",
+    "store_matrix",
+    "one_based",
+    "calculate_swap_delta",
+    "calculate_cost_by_swaps",
+    "solve_linear_assignment",
+    "gilmore_lawler_bound",
+    "optimality_gap",
     "print_assignment_matrix",
+    "instance_hash",
     "print_matrices",
 ]
 
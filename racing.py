@@ -0,0 +1,158 @@
+import argparse
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+from io_utils import NullWriter, read_instance
+from qap_core import MATRIX_STORAGE
+from sweep import SWEEP_PARAMETERS, parse_seeds, parse_value
+
+
+DEFAULT_MIN_ITERATIONS: int = 4
+DEFAULT_KEEP_FRACTION: float = 0.5
+DEFAULT_GROWTH: float = 2.0
+
+
+def race(
+    freq_matrix: Sequence[Sequence[float]],
+    distance_matrix: Sequence[Sequence[float]],
+    params: Dict[str, Any],
+    seeds: Sequence[int],
+    min_iterations: int = DEFAULT_MIN_ITERATIONS,
+    keep_fraction: float = DEFAULT_KEEP_FRACTION,
+    growth: float = DEFAULT_GROWTH,
+    data_file: str = "Unknown",
+    results_db: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Successive halving over multi-start seeds. Every seed runs min_iterations
+    iterations; then the best keep_fraction (by best_fitness) are paused and
+    resumed for growth times as many iterations, and so on. The last survivor
+    runs to max_iter and is finished (and recorded in results_db). Returns the
+    winning optimizer, one summary per round and the iterations and fitness
+    evaluations spent over all seeds.
+    """
+    from optimizer import SailfishOptimizer
+    from qap_core import gilmore_lawler_bound
+
+    if not 0 < keep_fraction < 1:
+        raise ValueError("keep_fraction must be between 0 and 1")
+    if growth <= 1:
+        raise ValueError("growth must be greater than 1")
+    # The bound depends only on the instance: compute it once, not once per seed
+    lower_bound = None
+    if params.get("compute_lower_bound", True) or params.get("target_gap") is not None:
+        lower_bound = gilmore_lawler_bound(freq_matrix, distance_matrix)
+    engines = [
+        SailfishOptimizer(
+            freq_matrix=freq_matrix,
+            distance_matrix=distance_matrix,
+            log_to_file=False,
+            data_file=data_file,
+            seed=seed,
+            verbose=False,
+            output=NullWriter(),
+            results_db=results_db,
+            lower_bound=lower_bound,
+            **params,
+        )
+        for seed in seeds
+    ]
+    max_iter = engines[0].max_iter
+    rounds: List[Dict[str, Any]] = []
+    alive = engines
+    until = min(max(1, min_iterations), max_iter)
+    for engine in alive:
+        engine.begin_run()
+    while True:
+        if len(alive) == 1:
+            until = max_iter
+        for engine in alive:
+            engine.continue_run(until)
+        # Stable sort: equal costs keep seed order
+        alive.sort(key=lambda engine: engine.best_fitness)
+        rounds.append({
+            "iterations": until,
+            "seeds": len(alive),
+            "best_cost": alive[0].best_fitness,
+            "best_seed": alive[0].seed,
+            "worst_cost": alive[-1].best_fitness,
+        })
+        if len(alive) == 1 or until >= max_iter:
+            break
+        keep = max(1, math.ceil(len(alive) * keep_fraction))
+        for engine in alive[keep:]:
+            engine.abandon_run()
+        alive = alive[:keep]
+        until = min(max_iter, max(until + 1, math.ceil(until * growth)))
+    winner = alive[0]
+    for engine in alive[1:]:
+        engine.abandon_run()
+    winner.finish_run()
+    return {
+        "winner": winner,
+        "rounds": rounds,
+        # Iteration 0 included, as in fitness_history
+        "iterations": sum(len(engine.fitness_history) for engine in engines),
+        "evaluations": sum(engine.fitness_evaluations for engine in engines),
+        "wall_time": sum(engine.wall_time for engine in engines),
+    }
+
+
+def print_race(result: Dict[str, Any], n_seeds: int) -> None:
+    """Print the rounds of a race and its cost compared with running every seed to max_iter"""
+    winner = result["winner"]
+    print("\n" + "="*80)
+    print("🏁 SUCCESSIVE-HALVING RACE")
+    print("="*80)
+    print(f"{'Round':>5} {'Iterations':>11} {'Seeds':>6} {'Best Cost':>14} {'Best Seed':>10} {'Worst Cost':>14}")
+    print("-" * 80)
+    for number, entry in enumerate(result["rounds"], 1):
+        print(f"{number:>5} {entry['iterations']:>11} {entry['seeds']:>6} {entry['best_cost']:>14.2f} "
+              f"{str(entry['best_seed']):>10} {entry['worst_cost']:>14.2f}")
+    print("="*80)
+    full = n_seeds * (winner.max_iter + 1)
+    print(f"Winner: seed {winner.seed}, cost {winner.best_fitness}")
+    print(f"Iterations spent: {result['iterations']} of {full} for every seed to max_iter "
+          f"({result['iterations'] / full * 100:.1f}%), fitness evaluations: {result['evaluations']}, "
+          f"run time: {result['wall_time']:.2f}s")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Successive-halving race over Sailfish Optimizer seeds")
+    parser.add_argument("instance", help="Instance file: project CSV or QAPLIB .dat")
+    parser.add_argument("--seeds", default="0-31", help="Seeds to race, e.g. '0-31' or '1,2,7'")
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE",
+                        help="Optimizer parameter (repeatable; max_iter is the winner's budget)")
+    parser.add_argument("--min-iterations", type=int, default=DEFAULT_MIN_ITERATIONS,
+                        help=f"Iterations of the first round (default: {DEFAULT_MIN_ITERATIONS})")
+    parser.add_argument("--keep", type=float, default=DEFAULT_KEEP_FRACTION,
+                        help=f"Fraction of seeds kept after each round (default: {DEFAULT_KEEP_FRACTION})")
+    parser.add_argument("--growth", type=float, default=DEFAULT_GROWTH,
+                        help=f"Factor by which the iterations grow per round (default: {DEFAULT_GROWTH})")
+    parser.add_argument("--db", default=None, help="Record the winning run in this results store")
+    parser.add_argument("--matrix-storage", choices=MATRIX_STORAGE, default="float",
+                        help="Matrix storage: float, exact (ints for integral matrices) or compact (int32 arrays)")
+    args = parser.parse_args(argv)
+
+    params = dict(SWEEP_PARAMETERS)
+    for item in args.set:
+        name, value = item.split("=", 1)
+        if name not in SWEEP_PARAMETERS:
+            parser.error(f"Unknown parameter '{name}'. Choose from: {', '.join(SWEEP_PARAMETERS)}")
+        params[name] = parse_value(name, value)
+    seeds = parse_seeds(args.seeds)
+    freq_matrix, distance_matrix = read_instance(args.instance, args.matrix_storage)
+    result = race(freq_matrix, distance_matrix, params, seeds, args.min_iterations, args.keep, args.growth,
+                  data_file=args.instance, results_db=args.db)
+    print_race(result, len(seeds))
+
+
+__all__ = [
+    "race",
+    "print_race",
+    "main",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,333 @@
+import argparse
+import json
+import sqlite3
+from array import array
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+
+DEFAULT_RESULTS_DB: str = "sailfish_runs.db"
+HISTORY_POINTS: int = 64
+# Columns added after the first schema, appended to existing stores on open
+ADDED_COLUMNS: Dict[str, str] = {
+    "restarts": "INTEGER",
+    "stop_reason": "TEXT",
+}
+# Optional optimizer features, omitted from the canonical parameters while at their defaults
+OPTIONAL_PARAMETERS: Dict[str, Any] = {
+    "tabu_iterations": 0,
+    "sa_sardines": 0,
+    "sa_steps": 100,
+    "reseed_duplicates": False,
+    "time_budget": None,
+    "incremental_fitness": True,
+    "compute_lower_bound": True,
+    "target_gap": None,
+    "target_cost": None,
+    "restart_policy": None,
+    "restart_radius": 0.1,
+    "adaptive_sardines": False,
+    "target_iteration_time": None,
+    "max_sardines": None,
+    "warm_start_share": 0.5,
+    "warm_start_jitter": 0.05,
+    "initializer": "uniform",
+}
+
+
+def canonical_parameters(params: Dict[str, Any]) -> str:
+    """Return the canonical JSON encoding of a run's constructor parameters."""
+    return json.dumps(
+        {name: value for name, value in params.items()
+         if name not in OPTIONAL_PARAMETERS or value != OPTIONAL_PARAMETERS[name]},
+        sort_keys=True,
+    )
+
+
+def optimizer_parameters(engine) -> Dict[str, Any]:
+    """Collect the constructor parameters that define a run."""
+    params = {
+        "n_sailfish": engine.original_n_sailfish,
+        "n_sardines": engine.original_n_sardines,
+        "max_iter": engine.max_iter,
+        "A": engine.A,
+        "epsilon": engine.epsilon,
+    }
+    for name in OPTIONAL_PARAMETERS:
+        params[name] = getattr(engine, name)
+    return params
+
+
+def history_indices(length: int, max_points: int = HISTORY_POINTS) -> List[int]:
+    """Iteration indices kept when a history of the given length is downsampled."""
+    if length <= max_points:
+        return list(range(length))
+    step = (length - 1) / (max_points - 1)
+    return [round(i * step) for i in range(max_points)]
+
+
+def downsample_history(history: Sequence[float], max_points: int = HISTORY_POINTS) -> List[float]:
+    """Keep evenly spaced points of a fitness history, always including the first and last."""
+    return [history[i] for i in history_indices(len(history), max_points)]
+
+
+def _pack_permutation(permutation: Sequence[int]) -> bytes:
+    typecode = "H" if max(permutation) < 65536 else "I"
+    return array(typecode, permutation).tobytes()
+
+
+def _unpack_permutation(blob: bytes, problem_size: int) -> List[int]:
+    typecode = "H" if len(blob) == 2 * problem_size else "I"
+    values = array(typecode)
+    values.frombytes(blob)
+    return values.tolist()
+
+
+def _unpack_history(blob: bytes) -> List[float]:
+    values = array("d")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+class RunStore:
+    """Append-only SQLite store with one compact row per optimizer run"""
+    def __init__(self, path: str = DEFAULT_RESULTS_DB) -> None:
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        # WAL keeps appends cheap and lets readers query while runs are being recorded
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS runs ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " instance_hash TEXT NOT NULL,"
+            " data_file TEXT,"
+            " problem_size INTEGER NOT NULL,"
+            " params TEXT NOT NULL,"
+            " seed INTEGER,"
+            " best_cost REAL NOT NULL,"
+            " best_permutation BLOB NOT NULL,"
+            " evaluations INTEGER NOT NULL,"
+            " iterations INTEGER NOT NULL,"
+            " wall_time REAL NOT NULL,"
+            " fitness_history BLOB NOT NULL,"
+            " created_at TEXT NOT NULL,"
+            " restarts INTEGER,"
+            " stop_reason TEXT)"
+        )
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(runs)")}
+        for name, column_type in ADDED_COLUMNS.items():
+            if name not in columns:
+                self.connection.execute(f"ALTER TABLE runs ADD COLUMN {name} {column_type}")
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS runs_instance_cost ON runs (instance_hash, best_cost)"
+        )
+        self.connection.execute(
+            "CREATE INDEX IF NOT EXISTS runs_instance_params_seed ON runs (instance_hash, params, seed)"
+        )
+        self.connection.commit()
+
+    def append_run(self, record: Dict[str, Any]) -> int:
+        """Append one run record (as built by run_record) and return its row id."""
+        cursor = self.connection.execute(
+            "INSERT INTO runs (instance_hash, data_file, problem_size, params, seed, best_cost,"
+            " best_permutation, evaluations, iterations, wall_time, fitness_history, created_at,"
+            " restarts, stop_reason)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                record["instance_hash"],
+                record.get("data_file"),
+                len(record["best_permutation"]),
+                record["params"],
+                record.get("seed"),
+                record["best_cost"],
+                _pack_permutation(record["best_permutation"]),
+                record["evaluations"],
+                record["iterations"],
+                record["wall_time"],
+                array("d", downsample_history(record["fitness_history"])).tobytes(),
+                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                record.get("restarts"),
+                record.get("stop_reason"),
+            ),
+        )
+        self.connection.commit()
+        return cursor.lastrowid
+
+    def has_run(self, instance: str, params: str, seed: Optional[int]) -> bool:
+        row = self.connection.execute(
+            "SELECT 1 FROM runs WHERE instance_hash = ? AND params = ? AND seed IS ? LIMIT 1",
+            (instance, params, seed),
+        ).fetchone()
+        return row is not None
+
+    def _row_to_dict(self, row: Sequence[Any]) -> Dict[str, Any]:
+        (run_id, instance, data_file, problem_size, params, seed, best_cost, permutation,
+         evaluations, iterations, wall_time, history, created_at, restarts, stop_reason) = row
+        return {
+            "id": run_id,
+            "instance_hash": instance,
+            "data_file": data_file,
+            "problem_size": problem_size,
+            "params": params,
+            "seed": seed,
+            "best_cost": best_cost,
+            "best_permutation": _unpack_permutation(permutation, problem_size),
+            "evaluations": evaluations,
+            "iterations": iterations,
+            "wall_time": wall_time,
+            "fitness_history": _unpack_history(history),
+            "created_at": created_at,
+            "restarts": restarts,
+            "stop_reason": stop_reason,
+        }
+
+    def runs(self, instance: Optional[str] = None, params: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Return stored runs, optionally filtered by instance hash and canonical parameters."""
+        query = "SELECT * FROM runs"
+        conditions: List[str] = []
+        arguments: List[Any] = []
+        if instance is not None:
+            conditions.append("instance_hash = ?")
+            arguments.append(instance)
+        if params is not None:
+            conditions.append("params = ?")
+            arguments.append(params)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        rows = self.connection.execute(query + " ORDER BY id", arguments).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def best_known(self, instance: str) -> Optional[Dict[str, Any]]:
+        """Return the lowest-cost run recorded for an instance, or None."""
+        row = self.connection.execute(
+            "SELECT * FROM runs WHERE instance_hash = ? ORDER BY best_cost, id LIMIT 1",
+            (instance,),
+        ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def best_permutations(
+        self,
+        problem_size: int,
+        instance: Optional[str] = None,
+        data_file: Optional[str] = None,
+        limit: int = 5,
+    ) -> List[List[int]]:
+        """
+        Distinct best permutations (1-based, lowest cost first) of the stored runs
+        of an instance, or of a data file whose flows may have changed since, to
+        warm-start a new run.
+        """
+        conditions = ["problem_size = ?"]
+        arguments: List[Any] = [problem_size]
+        if instance is not None:
+            conditions.append("instance_hash = ?")
+            arguments.append(instance)
+        if data_file is not None:
+            conditions.append("data_file = ?")
+            arguments.append(data_file)
+        permutations: List[List[int]] = []
+        seen = set()
+        for (blob,) in self.connection.execute(
+            "SELECT best_permutation FROM runs WHERE " + " AND ".join(conditions) + " ORDER BY best_cost, id",
+            arguments,
+        ):
+            if blob not in seen and len(permutations) < limit:
+                seen.add(blob)
+                permutations.append(_unpack_permutation(blob, problem_size))
+        return permutations
+
+    def best_known_per_instance(self) -> List[Dict[str, Any]]:
+        """Return the best-known run for every instance in the store."""
+        instances = [row[0] for row in self.connection.execute(
+            "SELECT DISTINCT instance_hash FROM runs ORDER BY instance_hash")]
+        return [self.best_known(instance) for instance in instances]
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self) -> "RunStore":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def run_record(engine, wall_time: float) -> Dict[str, Any]:
+    """Build a store record from a finished SailfishOptimizer."""
+    from qap_core import instance_hash, one_based
+
+    return {
+        "instance_hash": instance_hash(engine.freq_matrix, engine.distance_matrix),
+        "data_file": engine.data_file,
+        "params": canonical_parameters(optimizer_parameters(engine)),
+        "seed": engine.seed,
+        "best_cost": engine.best_fitness,
+        "best_permutation": one_based(engine.best_solution),
+        "evaluations": engine.fitness_evaluations,
+        "iterations": len(engine.fitness_history),
+        "restarts": engine.restarts,
+        "stop_reason": engine.stop_reason,
+        "wall_time": wall_time,
+        "fitness_history": list(engine.fitness_history),
+    }
+
+
+def print_best_known(store: RunStore) -> None:
+    """Print the best-known solution for every instance in the store"""
+    print("\n" + "="*100)
+    print("🏆 BEST-KNOWN SOLUTIONS PER INSTANCE")
+    print("="*100)
+    print(f"{'Instance':<14} {'Data file':<16} {'n':>4} {'Best Cost':>14} {'Runs':>6}  Best Permutation")
+    print("-" * 100)
+    for best in store.best_known_per_instance():
+        n_runs = len(store.runs(best["instance_hash"]))
+        permutation = str(best["best_permutation"])
+        if len(permutation) > 40:
+            permutation = permutation[:37] + "...]"
+        print(f"{best['instance_hash'][:12]:<14} {str(best['data_file']):<16} {best['problem_size']:>4} "
+              f"{best['best_cost']:>14.2f} {n_runs:>6}  {permutation}")
+    print("="*100)
+
+
+def print_runs(store: RunStore, instance_prefix: str) -> None:
+    """Print every run of the instances whose hash starts with the given prefix"""
+    print(f"{'Run':>6} {'Seed':>6} {'Best Cost':>14} {'Evals':>10} {'Iters':>6} {'Time (s)':>10}  Parameters")
+    print("-" * 100)
+    for run in store.runs():
+        if run["instance_hash"].startswith(instance_prefix):
+            print(f"{run['id']:>6} {str(run['seed']):>6} {run['best_cost']:>14.2f} {run['evaluations']:>10} "
+                  f"{run['iterations']:>6} {run['wall_time']:>10.3f}  {run['params']}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Query the Sailfish Optimizer run results store")
+    parser.add_argument("--db", default=DEFAULT_RESULTS_DB, help="Results database path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("best", help="Best-known solution per instance")
+    runs_parser = subparsers.add_parser("runs", help="All runs for an instance")
+    runs_parser.add_argument("instance", help="Instance hash or hash prefix")
+    args = parser.parse_args(argv)
+    with RunStore(args.db) as store:
+        if args.command == "best":
+            print_best_known(store)
+        else:
+            print_runs(store, args.instance)
+
+
+__all__ = [
+    "DEFAULT_RESULTS_DB",
+    "OPTIONAL_PARAMETERS",
+    "RunStore",
+    "canonical_parameters",
+    "optimizer_parameters",
+    "downsample_history",
+    "history_indices",
+    "run_record",
+    "print_best_known",
+    "print_runs",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,4 @@
-from . import population, fitness, dynamics, reporting, replacement
+import importlib
 
 __all__ = [
     "population",
@@ -6,7 +6,20 @@ __all__ = [
     "dynamics",
     "reporting",
     "replacement",
+    "tabu",
+    "annealing",
+    "memory",
+    "diversity",
+    "evaluation",
+    "trace",
+    "adaptive",
+    "initialization",
+    "metrics",
 ]
 
 
-
+def __getattr__(name):
+    # Submodules load on first access so `import sfo` does not pull in the printers
+    if name in __all__:
+        return importlib.import_module(f"{__name__}.{name}")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
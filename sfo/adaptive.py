@@ -0,0 +1,104 @@
+import math
+from typing import Optional
+
+# Growth and shrink factors applied to the sardine count between iterations
+GROW_FACTOR: float = 1.25
+SHRINK_FACTOR: float = 0.9
+# Upper limit on the sardine count, relative to n_sardines, when max_sardines is not given
+DEFAULT_MAX_FACTOR: int = 4
+# Iterations over which the improvement rate is judged, and the smoothing of the throughput estimate
+IMPROVEMENT_WINDOW: int = 3
+THROUGHPUT_SMOOTHING: float = 0.5
+# Iterations (including iteration 0) measured before the population is first resized
+WARMUP_ITERATIONS: int = 2
+
+
+def target_iteration_seconds(engine) -> Optional[float]:
+    """Wall-clock seconds the next iteration may take: the fixed target, else the remaining budget per remaining iteration."""
+    if engine.target_iteration_time is not None:
+        return engine.target_iteration_time
+    if engine.time_budget is None:
+        return None
+    elapsed = engine.progress[-1][0] if engine.progress else 0.0
+    remaining_iterations = max(1, engine.max_iter - engine.current_iteration)
+    return max(0.0, engine.time_budget - elapsed) / remaining_iterations
+
+
+def measure_throughput(engine) -> None:
+    """Update the smoothed seconds per individual from the wall time of the last iteration."""
+    if len(engine.progress) < 2:
+        return
+    seconds = engine.progress[-1][0] - engine.progress[-2][0]
+    per_individual = seconds / max(1, engine.n_sailfish + engine.n_sardines)
+    if engine.seconds_per_individual is None:
+        engine.seconds_per_individual = per_individual
+    else:
+        engine.seconds_per_individual += THROUGHPUT_SMOOTHING * (per_individual - engine.seconds_per_individual)
+
+
+def is_improving(engine) -> bool:
+    history = engine.fitness_history
+    return len(history) > IMPROVEMENT_WINDOW and history[-1] < history[-1 - IMPROVEMENT_WINDOW]
+
+
+def resize_sardine_population(engine, size: int) -> None:
+    """
+    Grow the sardine population with fresh random keys or shrink it by
+    dropping the worst sardines. The remaining sardines keep their index
+    order, so their previous costs can still be reused.
+    """
+    if size > engine.n_sardines:
+        added = engine.generate_random_values(size - engine.n_sardines)
+        engine.sardine_random_values.extend(added)
+        engine.original_sardine_positions.extend(values.copy() for values in added)
+        # New lists: the previous-cost lists stay as they were and simply have no entry for the new sardines
+        engine.sardine_solutions = engine.sardine_solutions + [engine.decode_random_keys(values) for values in added]
+        engine.sardine_fitness = engine.sardine_fitness + [float("inf")] * len(added)
+    elif size < engine.n_sardines:
+        worst = sorted(range(engine.n_sardines), key=lambda i: engine.sardine_fitness[i])[size:]
+        for i in sorted(worst, reverse=True):
+            del engine.sardine_random_values[i]
+            del engine.original_sardine_positions[i]
+            del engine.sardine_solutions[i]
+            del engine.sardine_fitness[i]
+    engine.n_sardines = size
+
+
+def adapt_sardine_population(engine) -> None:
+    """
+    Between iterations: grow the target sardine count while the search
+    stagnates, ease a grown target back while it improves, cap it so the
+    next iteration fits the per-iteration time target at the measured
+    throughput, and resize the population to it.
+    """
+    measure_throughput(engine)
+    if engine.n_sardines == 0:
+        return
+    if engine.sardine_schedule is not None:
+        # Replay of a recorded run: apply the recorded sizes instead of re-measuring
+        size = engine.sardine_schedule.get(engine.current_iteration, engine.n_sardines)
+    else:
+        if len(engine.progress) <= WARMUP_ITERATIONS or engine.seconds_per_individual is None:
+            return
+        # The target size evolves with the improvement rate; replacement losses are refilled up to it
+        size = engine.sardine_target or engine.original_n_sardines
+        if not is_improving(engine):
+            size = math.ceil(size * GROW_FACTOR)
+        elif size > engine.original_n_sardines:
+            # Improving on a grown population: ease back towards the configured size
+            size = max(engine.original_n_sardines, math.floor(size * SHRINK_FACTOR))
+        target = target_iteration_seconds(engine)
+        if target is not None and engine.seconds_per_individual > 0:
+            size = min(size, int(target / engine.seconds_per_individual) - engine.n_sailfish)
+        max_sardines = engine.max_sardines or DEFAULT_MAX_FACTOR * engine.original_n_sardines
+        size = max(engine.n_sailfish + 1, min(max_sardines, size))
+        engine.sardine_target = size
+    if size == engine.n_sardines:
+        return
+    previous_size = engine.n_sardines
+    resize_sardine_population(engine, size)
+    engine.sardine_resizes.append((engine.current_iteration, size))
+    if engine.verbose:
+        print(f"\nAdaptive sizing after iteration {engine.current_iteration}: {previous_size} -> {size} sardines "
+              f"({'improving' if is_improving(engine) else 'stagnating'}, "
+              f"{(engine.seconds_per_individual or 0.0) * 1000:.3f} ms per individual)", file=engine.out)
@@ -0,0 +1,103 @@
+import math
+import random
+from array import array
+from typing import List, Optional, Sequence, Tuple
+
+from qap_core import calculate_facilities_cost, calculate_swap_delta, one_based
+
+
+def anneal_permutation(
+    facilities: Sequence[int],
+    freq_matrix: List[List[float]],
+    distance_matrix: List[List[float]],
+    cost: float,
+    steps: int,
+    rng: random.Random,
+) -> Tuple[List[int], float]:
+    """
+    Short simulated-annealing chain over swap moves with O(n) delta costs.
+    The start temperature is the mean absolute delta of the first few proposals
+    and cools geometrically to 1% of it over the chain.
+
+    Returns the best 0-based permutation visited and its cost.
+    """
+    n = len(facilities)
+    facilities = list(facilities)
+    best_facilities = facilities.copy()
+    best_cost = current_cost = cost
+    if n < 2 or steps <= 0:
+        return best_facilities, cost
+
+    probes = min(steps, max(5, n))
+    sample = [abs(calculate_swap_delta(facilities, freq_matrix, distance_matrix, *rng.sample(range(n), 2)))
+              for _ in range(probes)]
+    temperature = (sum(sample) / len(sample)) or 1.0
+    cooling = 0.01 ** (1.0 / steps)
+
+    for _ in range(steps):
+        r, s = rng.sample(range(n), 2)
+        delta = calculate_swap_delta(facilities, freq_matrix, distance_matrix, r, s)
+        if delta <= 0 or rng.random() < math.exp(-delta / temperature):
+            facilities[r], facilities[s] = facilities[s], facilities[r]
+            current_cost += delta
+            if current_cost < best_cost:
+                best_cost = current_cost
+                best_facilities = facilities.copy()
+        temperature *= cooling
+    return best_facilities, best_cost
+
+
+def low_ap_start_iteration(A: float, epsilon: float) -> Optional[int]:
+    """
+    First iteration with AP = A * (1 - 2 * (iteration + 1) * epsilon) < 0.5,
+    where annealing starts (437 for A=4, epsilon=0.001), or None if never.
+    """
+    def attack_power(iteration: int) -> float:
+        return A * (1 - (2 * (iteration + 1) * epsilon))
+
+    if attack_power(0) < 0.5:
+        return 0
+    if epsilon <= 0:
+        return None
+    iteration = max(0, math.floor((1 - 0.5 / A) / (2 * epsilon)) - 1)
+    while attack_power(iteration) >= 0.5:
+        iteration += 1
+    return iteration
+
+
+def refine_sardines_with_annealing(engine) -> None:
+    """
+    Low-AP refinement: run a short simulated-annealing chain on the best
+    sa_sardines sardines and write improved permutations back into their
+    random-key vectors.
+    """
+    verbose = engine.verbose
+    if verbose:
+        print(f"\nSIMULATED-ANNEALING REFINEMENT (AP < 0.5):", file=engine.out)
+    n_refine = min(engine.sa_sardines, engine.n_sardines)
+    if n_refine == 0:
+        if verbose:
+            print("No sardines available for refinement.", file=engine.out)
+        return
+    ranked = sorted(range(engine.n_sardines), key=lambda i: engine.sardine_fitness[i])[:n_refine]
+    if verbose:
+        print(f"Refining the best {n_refine} sardines with {engine.sa_steps} swap moves each: {[f'S{i+1}' for i in ranked]}", file=engine.out)
+    for i in ranked:
+        solution = engine.decode_random_keys(engine.sardine_random_values[i])
+        cost = calculate_facilities_cost(solution, engine.freq_matrix, engine.distance_matrix)
+        engine.fitness_evaluations += 1
+        refined, refined_cost = anneal_permutation(
+            solution, engine.freq_matrix, engine.distance_matrix, cost, engine.sa_steps, engine.rng
+        )
+        engine.annealing_steps += engine.sa_steps
+        if refined_cost < cost:
+            engine.sardine_random_values[i] = engine.convert_solution_to_random(refined, engine.sardine_random_values[i])
+            if verbose:
+                print(f"  S{i+1}: {cost} -> {refined_cost} (new solution {one_based(refined)})", file=engine.out)
+            if refined_cost < engine.best_fitness:
+                engine.best_fitness = refined_cost
+                engine.best_solution = array(engine.permutation_typecode, refined)
+                if verbose:
+                    print(f"     NEW BEST SOLUTION! Fitness: {refined_cost}", file=engine.out)
+        elif verbose:
+            print(f"  S{i+1}: {cost} (no improvement)", file=engine.out)
@@ -0,0 +1,95 @@
+from typing import List, Set, Tuple
+
+from qap_core import one_based
+from sfo.population import encode_near_solution
+
+
+def duplicate_indices(engine) -> Tuple[int, List[int]]:
+    """
+    Hash the decoded permutations of both populations. Returns the number of
+    individuals whose permutation already appeared earlier (sailfish first,
+    then sardines) and the indices of the sardines among them.
+    """
+    seen: Set[bytes] = set()
+    duplicates = 0
+    duplicate_sardines: List[int] = []
+    for solution in engine.sailfish_solutions:
+        key = solution.tobytes()
+        if key in seen:
+            duplicates += 1
+        seen.add(key)
+    for i, solution in enumerate(engine.sardine_solutions):
+        key = solution.tobytes()
+        if key in seen:
+            duplicates += 1
+            duplicate_sardines.append(i)
+        seen.add(key)
+    return duplicates, duplicate_sardines
+
+
+def reseed_sardine(engine, index: int) -> None:
+    """Give a sardine fresh random keys and decode its new permutation."""
+    engine.sardine_random_values[index] = engine.generate_random_values(1)[0]
+    engine.original_sardine_positions[index] = engine.sardine_random_values[index].copy()
+    engine.sardine_solutions[index] = engine.decode_random_keys(engine.sardine_random_values[index])
+
+
+def detect_duplicate_permutations(engine) -> None:
+    """
+    Per-iteration duplicate detector run between decoding and fitness evaluation.
+    Records the duplicate count as a diversity metric and, with
+    reseed_duplicates, replaces surplus duplicate sardines by fresh random keys.
+    """
+    duplicates, duplicate_sardines = duplicate_indices(engine)
+    engine.duplicate_history.append(duplicates)
+    if engine.verbose:
+        print(f"\n" + "="*80, file=engine.out)
+        print(f"ITERATION {engine.current_iteration} - DUPLICATE PERMUTATION CHECK", file=engine.out)
+        print("="*80, file=engine.out)
+        total = engine.n_sailfish + engine.n_sardines
+        print(f"Duplicate permutations: {duplicates} of {total} individuals ({total - duplicates} distinct)", file=engine.out)
+    if not engine.reseed_duplicates or not duplicate_sardines:
+        return
+    for i in duplicate_sardines:
+        reseed_sardine(engine, i)
+    engine.reseeded_duplicates += len(duplicate_sardines)
+    if engine.verbose:
+        print(f"Re-seeded duplicate sardines with fresh random keys: {[f'S{i+1}' for i in duplicate_sardines]}", file=engine.out)
+
+
+RESTART_POLICIES = ("random", "elite")
+
+
+def restart_sardine_population(engine) -> None:
+    """
+    Re-seed an extinct sardine population with original_n_sardines fresh
+    individuals. "random" draws uniform random keys; "elite" draws keys that
+    decode to the elite sailfish's permutation and jitters each by up to
+    restart_radius, so the new sardines start in its neighbourhood. The
+    sailfish and the global best are kept.
+    """
+    n = engine.original_n_sardines
+    random_values = engine.generate_random_values(n)
+    if engine.restart_policy == "elite":
+        elite = min(range(engine.n_sailfish), key=lambda i: engine.sailfish_fitness[i])
+        elite_solution = engine.sailfish_solutions[elite]
+        radius = engine.restart_radius
+        random_values = [encode_near_solution(engine, elite_solution, values, radius) for values in random_values]
+    engine.n_sardines = n
+    engine.sardine_random_values = random_values
+    engine.original_sardine_positions = [values.copy() for values in random_values]
+    engine.sardine_solutions = [engine.decode_random_keys(values) for values in random_values]
+    engine.sardine_fitness = []
+    # The new sardines have no previous costs to reuse
+    engine.previous_sardines = None
+    engine.restarts += 1
+    if engine.verbose:
+        print(f"\n" + "="*80, file=engine.out)
+        print(f"SARDINE POPULATION RESTART {engine.restarts} AFTER ITERATION {engine.current_iteration}", file=engine.out)
+        print("="*80, file=engine.out)
+        if engine.restart_policy == "elite":
+            print(f"Re-seeded {n} sardines around elite sailfish SF{elite+1} {one_based(elite_solution)} "
+                  f"(fitness {engine.sailfish_fitness[elite]}, key jitter ±{radius})", file=engine.out)
+        else:
+            print(f"Re-seeded {n} sardines with fresh random keys", file=engine.out)
+        print(f"Sailfish and the best solution so far (fitness {engine.best_fitness}) are kept", file=engine.out)
@@ -0,0 +1,94 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+
+from qap_core import calculate_facilities_cost
+from shared_matrices import SharedHandle, resolve_matrices, share_matrices
+
+
+# Least work per chunk, in cost terms (chunk permutations x n^2), for the pool to pay off. A chunk
+# round trip (pickling, IPC, scheduling) measured 0.4-1.4 ms, the cost of 6k-15k terms of
+# pure-Python evaluation; 200k terms (10-20 ms) keep that overhead to a few percent of the chunk
+MIN_CHUNK_TERMS: int = 200_000
+
+# Matrices attached once per worker process by the pool initializer
+_worker_matrices: Optional[Tuple[List[List[float]], List[List[float]]]] = None
+
+
+def _init_evaluation_worker(
+    handle: Optional[SharedHandle],
+    matrices: Optional[Tuple[List[List[float]], List[List[float]]]],
+) -> None:
+    global _worker_matrices
+    _worker_matrices = resolve_matrices(handle, matrices)
+
+
+def _evaluate_chunk(chunk: Sequence[Sequence[int]]) -> List[float]:
+    freq_matrix, distance_matrix = _worker_matrices
+    return [calculate_facilities_cost(solution, freq_matrix, distance_matrix) for solution in chunk]
+
+
+def parallel_evaluation_pays_off(problem_size: int, batch_size: int, chunk_size: int) -> bool:
+    """True if a batch splits into at least two chunks of at least MIN_CHUNK_TERMS cost terms each."""
+    return batch_size > chunk_size and chunk_size * problem_size * problem_size >= MIN_CHUNK_TERMS
+
+
+class PopulationEvaluator:
+    """
+    Shards a population across a process pool in chunks of chunk_size
+    permutations and returns one cost vector per call, in input order.
+    Workers attach to the matrices in shared memory; if shared memory is
+    unavailable they are pickled to each worker once, when the pool starts.
+    Batches too small for parallel_evaluation_pays_off are costed in-process.
+    """
+    def __init__(
+        self,
+        freq_matrix: List[List[float]],
+        distance_matrix: List[List[float]],
+        workers: int,
+        chunk_size: int = 16,
+    ) -> None:
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.chunk_size = chunk_size
+        self.freq_matrix = freq_matrix
+        self.distance_matrix = distance_matrix
+        self.shared = share_matrices(freq_matrix, distance_matrix)
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_evaluation_worker,
+            initargs=(self.shared.handle, None) if self.shared else (None, (freq_matrix, distance_matrix)),
+        )
+
+    def evaluate(self, solutions: Sequence[Sequence[int]]) -> List[float]:
+        if not solutions or not parallel_evaluation_pays_off(len(solutions[0]), len(solutions), self.chunk_size):
+            return [calculate_facilities_cost(solution, self.freq_matrix, self.distance_matrix) for solution in solutions]
+        chunks = [solutions[start:start + self.chunk_size] for start in range(0, len(solutions), self.chunk_size)]
+        costs: List[float] = []
+        for chunk_costs in self.executor.map(_evaluate_chunk, chunks):
+            costs.extend(chunk_costs)
+        return costs
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        if self.shared:
+            self.shared.close()
+
+
+def start_parallel_evaluation(engine) -> None:
+    """
+    Start the evaluation pool for a run when eval_workers is set and the
+    population at the start of the run is large enough for the pool to pay off.
+    """
+    population = engine.n_sailfish + engine.n_sardines
+    if not parallel_evaluation_pays_off(engine.problem_size, population, engine.eval_chunk_size):
+        return
+    if engine.eval_workers > 0 and engine.evaluator is None:
+        engine.evaluator = PopulationEvaluator(
+            engine.freq_matrix, engine.distance_matrix, engine.eval_workers, engine.eval_chunk_size
+        )
+
+
+def stop_parallel_evaluation(engine) -> None:
+    if engine.evaluator is not None:
+        engine.evaluator.close()
+        engine.evaluator = None
@@ -1,72 +1,195 @@
-from typing import List
-from qap_core import calculate_qap_fitness
+from array import array
+from typing import Dict, List, Optional, Tuple
+from qap_core import calculate_qap_fitness, calculate_facilities_cost, calculate_cost_by_swaps, one_based
 
 
-def calculate_detailed_fitness(engine) -> None:
-    print("\n" + "="*80)
-    if engine.current_iteration == 0:
-        print("4. DETAILED FITNESS CALCULATION FOR EACH INDIVIDUAL")
+def cached_cost(engine, solution: array, cache: Dict[bytes, float]) -> float:
+    """Cost of a permutation, evaluated only the first time it is seen in this iteration."""
+    key = solution.tobytes()
+    fitness = cache.get(key)
+    if fitness is None:
+        fitness = calculate_facilities_cost(solution, engine.freq_matrix, engine.distance_matrix)
+        engine.fitness_evaluations += 1
+        cache[key] = fitness
+    return fitness
+
+
+def previous_costs(solutions: List[array], previous: Optional[Tuple[List[array], List[float]]]) -> list:
+    """
+    Pair each individual with its (permutation, cost) from the previous
+    iteration. Replacement and adaptive shrinking keep the populations
+    index-aligned and adaptive growth appends at the end, so individuals
+    beyond the previous population have nothing to reuse. If the previous
+    population is larger, nothing is reused.
+    """
+    if previous is None or len(previous[0]) > len(solutions) or len(previous[1]) != len(previous[0]):
+        return [None] * len(solutions)
+    return list(zip(*previous)) + [None] * (len(solutions) - len(previous[0]))
+
+
+def known_cost(engine, solution: array, previous, cache: Dict[bytes, float]) -> Tuple[Optional[float], str]:
+    """
+    Cost of a permutation without a full evaluation where possible: from this
+    iteration's cache, from the individual's unchanged previous permutation,
+    or from a short swap sequence away from it. Returns (cost, how it was
+    obtained), or (None, "") when a full evaluation is needed.
+    """
+    key = solution.tobytes()
+    if key in cache:
+        return cache[key], "duplicate"
+    if previous is None or not engine.incremental_fitness:
+        return None, ""
+    previous_solution, previous_cost = previous
+    if previous_solution == solution:
+        engine.reused_costs += 1
+        cache[key] = previous_cost
+        return previous_cost, "unchanged"
+    cost, swaps = calculate_cost_by_swaps(previous_solution, previous_cost, solution, engine.freq_matrix,
+                                          engine.distance_matrix, max(1, engine.problem_size // 8))
+    if cost is None:
+        return None, ""
+    engine.incremental_costs += 1
+    cache[key] = cost
+    return cost, f"{swaps} swap deltas"
+
+
+def remember_population_costs(engine) -> None:
+    # The same list objects are kept in step by replacement, so they stay aligned with the populations
+    engine.previous_sailfish = (engine.sailfish_solutions, engine.sailfish_fitness)
+    engine.previous_sardines = (engine.sardine_solutions, engine.sardine_fitness)
+
+
+def individual_cost(engine, solution: array, previous, cache: Dict[bytes, float]) -> float:
+    """
+    Cost of one individual: reused where known_cost allows, else a full
+    evaluation. Detailed runs print how the cost was obtained, including the
+    full derivation of every evaluated permutation.
+    """
+    fitness, source = known_cost(engine, solution, previous, cache)
+    if not engine.verbose:
+        return fitness if fitness is not None else cached_cost(engine, solution, cache)
+    if source == "duplicate":
+        print(f"Duplicate permutation {one_based(solution)} - reusing fitness {fitness}", file=engine.out)
+    elif source == "unchanged":
+        print(f"Permutation {one_based(solution)} unchanged since the previous iteration - reusing fitness {fitness}", file=engine.out)
+    elif source:
+        print(f"Permutation {one_based(solution)} is {source} away from the previous iteration - fitness {fitness}", file=engine.out)
     else:
-        print(f"ITERATION {engine.current_iteration} - STEP 2: DETAILED FITNESS CALCULATION")
-    print("="*80)
+        fitness = calculate_qap_fitness(one_based(solution), engine.freq_matrix, engine.distance_matrix, show_details=True, out=engine.out)
+        engine.fitness_evaluations += 1
+        cache[solution.tobytes()] = fitness
+    return fitness
+
+
+def prefetch_population_costs(engine, populations, cache: Dict[bytes, float]) -> None:
+    """
+    Parallel mode: settle every cost that can be reused, then cost the
+    remaining distinct permutations in one sharded call on engine.evaluator.
+    All costs of the iteration are then in the cache.
+    """
+    distinct: Dict[bytes, array] = {}
+    for solutions, previous_population in populations:
+        for solution, previous in zip(solutions, previous_population):
+            if known_cost(engine, solution, previous, cache)[0] is None:
+                distinct[solution.tobytes()] = solution
+    cache.update(zip(distinct, engine.evaluator.evaluate(list(distinct.values()))))
+    engine.fitness_evaluations += len(distinct)
+
+
+def calculate_detailed_fitness(engine) -> None:
+    """
+    Cost every individual with as few full evaluations as possible (unchanged,
+    slightly changed and duplicate permutations are not re-costed) and update the bests.
+    """
+    verbose = engine.verbose
+    if verbose:
+        print("\n" + "="*80, file=engine.out)
+        if engine.current_iteration == 0:
+            print("4. DETAILED FITNESS CALCULATION FOR EACH INDIVIDUAL", file=engine.out)
+        else:
+            print(f"ITERATION {engine.current_iteration} - STEP 2: DETAILED FITNESS CALCULATION", file=engine.out)
+        print("="*80, file=engine.out)
+    populations = ((engine.sailfish_solutions, previous_costs(engine.sailfish_solutions, engine.previous_sailfish)),
+                   (engine.sardine_solutions, previous_costs(engine.sardine_solutions, engine.previous_sardines)))
+    # Duplicates and unchanged or slightly changed individuals are not fully re-evaluated
+    cache: Dict[bytes, float] = {}
+    if engine.evaluator is not None:
+        prefetch_population_costs(engine, populations, cache)
     engine.sailfish_fitness = []
     engine.sardine_fitness = []
-    print("SAILFISH Fitness Calculations:")
-    print("=" * 50)
-    for i, solution in enumerate(engine.sailfish_solutions):
-        print(f"\nFISH CALCULATING FITNESS FOR SAILFISH SF{i+1}")
-        fitness = calculate_qap_fitness(solution, engine.freq_matrix, engine.distance_matrix, show_details=True)
+    if verbose:
+        print("SAILFISH Fitness Calculations:", file=engine.out)
+        print("=" * 50, file=engine.out)
+    solutions, previous_population = populations[0]
+    for i, solution in enumerate(solutions):
+        if verbose:
+            print(f"\nFISH CALCULATING FITNESS FOR SAILFISH SF{i+1}", file=engine.out)
+        fitness = individual_cost(engine, solution, previous_population[i], cache)
         engine.sailfish_fitness.append(fitness)
         if fitness < engine.best_fitness:
             engine.best_fitness = fitness
-            engine.best_solution = solution.copy()
-            print(f"     NEW BEST SOLUTION! Fitness: {fitness}")
-    print("\n" + "=" * 50)
-    print("SARDINE Fitness Calculations:")
-    print("=" * 50)
-    for i, solution in enumerate(engine.sardine_solutions):
-        print(f"\nFISH CALCULATING FITNESS FOR SARDINE S{i+1}")
-        fitness = calculate_qap_fitness(solution, engine.freq_matrix, engine.distance_matrix, show_details=True)
+            # Permutation arrays are never modified in place, so the best one is shared, not copied
+            engine.best_solution = solution
+            if verbose:
+                print(f"     NEW BEST SOLUTION! Fitness: {fitness}", file=engine.out)
+    if verbose:
+        print("\n" + "=" * 50, file=engine.out)
+        print("SARDINE Fitness Calculations:", file=engine.out)
+        print("=" * 50, file=engine.out)
+    solutions, previous_population = populations[1]
+    for i, solution in enumerate(solutions):
+        if verbose:
+            print(f"\nFISH CALCULATING FITNESS FOR SARDINE S{i+1}", file=engine.out)
+        fitness = individual_cost(engine, solution, previous_population[i], cache)
         engine.sardine_fitness.append(fitness)
         if fitness < engine.best_sardine_fitness:
             engine.best_sardine_fitness = fitness
         if fitness < engine.best_fitness:
             engine.best_fitness = fitness
-            engine.best_solution = solution.copy()
-            print(f"     NEW BEST SOLUTION! Fitness: {fitness}")
+            engine.best_solution = solution
+            if verbose:
+                print(f"     NEW BEST SOLUTION! Fitness: {fitness}", file=engine.out)
+    remember_population_costs(engine)
+
+
+def update_elite_scores(engine) -> None:
+    """Set the elite sailfish and injured sardine fitness scores used by the position updates."""
+    engine.elite_sailfish_fitness_score = min(engine.sailfish_fitness)
+    if engine.sardine_fitness:
+        engine.injured_sardine_fitness_score = min(engine.sardine_fitness)
+    else:
+        engine.injured_sardine_fitness_score = engine.elite_sailfish_fitness_score
 
 
 def print_fitness_summary(engine) -> None:
-    print(f"\n" + "="*80)
+    update_elite_scores(engine)
+    if not engine.verbose:
+        return
+    print(f"\n" + "="*80, file=engine.out)
     if engine.current_iteration == 0:
-        print("FITNESS SUMMARY")
+        print("FITNESS SUMMARY", file=engine.out)
     else:
-        print(f"ITERATION {engine.current_iteration} - STEP 3: FITNESS SUMMARY")
-    print("="*80)
-    print("SAILFISH FITNESS SCORES:")
-    print("-" * 30)
+        print(f"ITERATION {engine.current_iteration} - STEP 3: FITNESS SUMMARY", file=engine.out)
+    print("="*80, file=engine.out)
+    print("SAILFISH FITNESS SCORES:", file=engine.out)
+    print("-" * 30, file=engine.out)
     for i, fitness in enumerate(engine.sailfish_fitness):
         marker = " STAR BEST" if fitness == min(engine.sailfish_fitness) else ""
-        print(f"SF{i+1}: {fitness}{marker}")
-    print("\nSARDINE FITNESS SCORES:")
-    print("-" * 25)
+        print(f"SF{i+1}: {fitness}{marker}", file=engine.out)
+    print("\nSARDINE FITNESS SCORES:", file=engine.out)
+    print("-" * 25, file=engine.out)
     for i, fitness in enumerate(engine.sardine_fitness):
         marker = " STAR BEST" if fitness == min(engine.sardine_fitness) else ""
-        print(f"S{i+1}: {fitness}{marker}")
-    print(f"\nOVERALL SUMMARY:")
-    print("-" * 20)
-    print(f"Best Sailfish Fitness: {min(engine.sailfish_fitness)}")
-    print(f"Best Sardine Fitness: {min(engine.sardine_fitness)}")
-    print(f"Overall Best Fitness: {engine.best_fitness}")
-    print(f"Best Solution: {engine.best_solution}")
-    engine.elite_sailfish_fitness_score = min(engine.sailfish_fitness)
-    if engine.sardine_fitness:
-        engine.injured_sardine_fitness_score = min(engine.sardine_fitness)
-    else:
-        engine.injured_sardine_fitness_score = engine.elite_sailfish_fitness_score
-    print(f"\nFITNESS SCORES FOR POSITION UPDATES:")
-    print(f"- Elite Sailfish Fitness Score: {engine.elite_sailfish_fitness_score}")
-    print(f"- Injured Sardine Fitness Score: {engine.injured_sardine_fitness_score}")
+        print(f"S{i+1}: {fitness}{marker}", file=engine.out)
+    print(f"\nOVERALL SUMMARY:", file=engine.out)
+    print("-" * 20, file=engine.out)
+    print(f"Best Sailfish Fitness: {min(engine.sailfish_fitness)}", file=engine.out)
+    print(f"Best Sardine Fitness: {min(engine.sardine_fitness)}", file=engine.out)
+    print(f"Overall Best Fitness: {engine.best_fitness}", file=engine.out)
+    print(f"Best Solution: {one_based(engine.best_solution)}", file=engine.out)
+    print(f"\nFITNESS SCORES FOR POSITION UPDATES:", file=engine.out)
+    print(f"- Elite Sailfish Fitness Score: {engine.elite_sailfish_fitness_score}", file=engine.out)
+    print(f"- Injured Sardine Fitness Score: {engine.injured_sardine_fitness_score}", file=engine.out)
 
 
 
@@ -0,0 +1,85 @@
+from typing import List
+
+from qap_core import calculate_facilities_cost
+
+# Initial population samplers; "uniform" draws independent keys exactly as generate_random_values
+INITIALIZERS = ("uniform", "lhs", "halton", "opposition")
+
+
+def first_primes(count: int) -> List[int]:
+    primes: List[int] = []
+    candidate = 2
+    while len(primes) < count:
+        if all(candidate % p for p in primes if p * p <= candidate):
+            primes.append(candidate)
+        candidate += 1
+    return primes
+
+
+def untie(engine, random_values: List[float]) -> List[float]:
+    """Spread keys that rounding made equal by 0.001, keeping the permutation they decode to."""
+    return engine.convert_solution_to_random(engine.decode_random_keys(random_values), random_values)
+
+
+def latin_hypercube(engine, n_individuals: int) -> List[List[float]]:
+    """
+    Latin hypercube sample: for every location the population's keys fall one
+    per stratum of width 1/n_individuals, in a random stratum order per location.
+    """
+    columns = []
+    for _ in range(engine.problem_size):
+        strata = engine.rng.sample(range(n_individuals), n_individuals)
+        columns.append([round((stratum + engine.rng.random()) / n_individuals, 3) for stratum in strata])
+    return [untie(engine, list(values)) for values in zip(*columns)]
+
+
+def scrambled_halton(engine, n_individuals: int) -> List[List[float]]:
+    """
+    Low-discrepancy sample: the Halton sequence (one prime base per location)
+    with a random digit permutation per location. The scrambling breaks the
+    correlation between high bases, so the keys of an individual do not all
+    grow with its index.
+    """
+    columns = []
+    for base in first_primes(engine.problem_size):
+        scramble = engine.rng.sample(range(base), base)
+        digits = 1
+        while base ** digits < n_individuals:
+            digits += 1
+        column = []
+        for index in range(n_individuals):
+            value, scale = 0.0, 1.0 / base
+            for _ in range(digits):
+                index, digit = divmod(index, base)
+                value += scramble[digit] * scale
+                scale /= base
+            column.append(round(value, 3))
+        columns.append(column)
+    return [untie(engine, list(values)) for values in zip(*columns)]
+
+
+def opposition_based(engine, n_individuals: int) -> List[List[float]]:
+    """
+    Opposition-based sample: draw uniform keys x, form the opposite keys 1 - x
+    (which decode to the reversed permutation) and keep whichever of the two
+    costs less. Costs 2 * n_individuals fitness evaluations.
+    """
+    random_values: List[List[float]] = []
+    for values in engine.generate_random_values(n_individuals):
+        opposite = untie(engine, [round(1.0 - key, 3) for key in values])
+        costs = [calculate_facilities_cost(engine.decode_random_keys(keys), engine.freq_matrix, engine.distance_matrix)
+                 for keys in (values, opposite)]
+        engine.fitness_evaluations += 2
+        random_values.append(values if costs[0] <= costs[1] else opposite)
+    return random_values
+
+
+def initial_random_values(engine, n_individuals: int) -> List[List[float]]:
+    """Random keys of an initial population, drawn by engine.initializer."""
+    if engine.initializer == "lhs":
+        return latin_hypercube(engine, n_individuals)
+    if engine.initializer == "halton":
+        return scrambled_halton(engine, n_individuals)
+    if engine.initializer == "opposition":
+        return opposition_based(engine, n_individuals)
+    return engine.generate_random_values(n_individuals)
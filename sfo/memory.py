@@ -0,0 +1,58 @@
+import tracemalloc
+from typing import Dict, Tuple
+
+
+def start_memory_profiling(engine, frames: int = 1) -> None:
+    """
+    Start tracemalloc for this run unless something else is already tracing.
+    Every stored frame is walked on each allocation, so deeper tracebacks cost
+    time; one frame is enough for the file:line allocation sites.
+    """
+    engine.memory_started_tracing = not tracemalloc.is_tracing()
+    if engine.memory_started_tracing:
+        tracemalloc.start(frames)
+    engine.memory_history = []
+    engine.memory_phase_peaks = {}
+
+
+def begin_iteration_memory(engine) -> None:
+    current, _ = tracemalloc.get_traced_memory()
+    engine.memory_history.append({
+        "iteration": engine.current_iteration,
+        "start": current,
+        "phases": {},
+    })
+
+
+def begin_phase_memory() -> None:
+    tracemalloc.reset_peak()
+
+
+def record_phase_memory(engine, phase: str) -> None:
+    """Record current and peak traced memory for a phase that just finished."""
+    current, peak = tracemalloc.get_traced_memory()
+    if not engine.memory_history:
+        begin_iteration_memory(engine)
+    engine.memory_history[-1]["phases"][phase] = (current, peak)
+    engine.memory_phase_peaks[phase] = max(engine.memory_phase_peaks.get(phase, 0), peak)
+
+
+def iteration_memory(record: Dict) -> Tuple[int, int]:
+    """Return (current at end, peak) in bytes for one iteration record."""
+    phases = list(record["phases"].values())
+    if not phases:
+        return record["start"], record["start"]
+    return phases[-1][0], max(peak for _, peak in phases)
+
+
+def finish_memory_profiling(engine, top: int = 10) -> None:
+    """Snapshot the top allocation sites and stop tracing if this run started it."""
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ))
+    engine.memory_top_sites = snapshot.statistics("lineno")[:top]
+    if engine.memory_started_tracing:
+        tracemalloc.stop()
+
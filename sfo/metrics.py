@@ -0,0 +1,159 @@
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from qap_core import instance_hash
+
+# Upper bounds (seconds) of the phase-time histogram buckets; +Inf is implicit
+PHASE_BUCKETS: Tuple[float, ...] = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+DEFAULT_METRICS_INTERVAL: float = 5.0
+
+_exporters: Dict[str, "MetricsExporter"] = {}
+_exporters_lock = threading.Lock()
+
+
+def _label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _bound(value: float) -> str:
+    return "+Inf" if value == float("inf") else repr(value)
+
+
+class MetricsExporter:
+    """
+    Process-wide OpenMetrics textfile for all optimizers configured with the
+    same metrics_file. The file is rewritten atomically (temporary file and
+    os.replace) at most every interval seconds and when a run ends, so a
+    node-exporter textfile collector never reads a partial file.
+    """
+    def __init__(self, path: str, interval: float = DEFAULT_METRICS_INTERVAL, labels: Optional[Dict[str, str]] = None) -> None:
+        self.path = path
+        self.interval = interval
+        # Constant labels on every sample, e.g. the pid when each worker process writes its own file
+        self.labels = labels or {}
+        self.lock = threading.Lock()
+        self.active: List = []
+        self.runs_started = 0
+        self.runs_finished = 0
+        # Totals of the runs that are no longer active
+        self.iterations = 0
+        self.evaluations = 0
+        self.reused_costs = 0
+        self.incremental_costs = 0
+        # (instance hash, data file) -> best cost seen
+        self.best_costs: Dict[Tuple[str, str], float] = {}
+        # phase -> (bucket counts, count, sum)
+        self.phases: Dict[str, Tuple[List[int], int, float]] = {}
+        self.last_write = 0.0
+
+    def start_run(self, engine) -> None:
+        engine.metrics_instance = (instance_hash(engine.freq_matrix, engine.distance_matrix)[:12], engine.data_file)
+        with self.lock:
+            self.active.append(engine)
+            self.runs_started += 1
+        self.write()
+
+    def end_run(self, engine) -> None:
+        with self.lock:
+            if engine in self.active:
+                self.active.remove(engine)
+                self.runs_finished += 1
+                self.iterations += len(engine.fitness_history)
+                self.evaluations += engine.fitness_evaluations
+                self.reused_costs += engine.reused_costs
+                self.incremental_costs += engine.incremental_costs
+                self._update_best(engine)
+        self.write()
+
+    def observe_phase(self, phase: str, seconds: float) -> None:
+        with self.lock:
+            buckets, count, total = self.phases.get(phase) or ([0] * len(PHASE_BUCKETS), 0, 0.0)
+            for i, bound in enumerate(PHASE_BUCKETS):
+                if seconds <= bound:
+                    buckets[i] += 1
+            self.phases[phase] = (buckets, count + 1, total + seconds)
+
+    def _update_best(self, engine) -> None:
+        if engine.best_fitness < self.best_costs.get(engine.metrics_instance, float("inf")):
+            self.best_costs[engine.metrics_instance] = engine.best_fitness
+
+    def maybe_write(self) -> None:
+        """Rewrite the file if the last write is at least interval seconds old."""
+        if time.monotonic() - self.last_write >= self.interval:
+            self.write()
+
+    def _sample(self, name: str, value, **labels) -> str:
+        labels = {**self.labels, **labels}
+        if not labels:
+            return f"{name} {value!r}"
+        text = ",".join(f"{key}=\"{_label(label)}\"" for key, label in labels.items())
+        return f"{name}{{{text}}} {value!r}"
+
+    def render(self) -> str:
+        with self.lock:
+            for engine in self.active:
+                self._update_best(engine)
+            iterations = self.iterations + sum(len(engine.fitness_history) for engine in self.active)
+            evaluations = self.evaluations + sum(engine.fitness_evaluations for engine in self.active)
+            reused = self.reused_costs + sum(engine.reused_costs for engine in self.active)
+            incremental = self.incremental_costs + sum(engine.incremental_costs for engine in self.active)
+            lines = [
+                "# TYPE sfo_runs_active gauge",
+                "# HELP sfo_runs_active Optimizer runs in progress.",
+                self._sample("sfo_runs_active", len(self.active)),
+                "# TYPE sfo_runs_started counter",
+                self._sample("sfo_runs_started_total", self.runs_started),
+                "# TYPE sfo_runs_finished counter",
+                self._sample("sfo_runs_finished_total", self.runs_finished),
+                "# TYPE sfo_iterations counter",
+                "# HELP sfo_iterations Iterations completed, iteration 0 included.",
+                self._sample("sfo_iterations_total", iterations),
+                "# TYPE sfo_fitness_evaluations counter",
+                "# HELP sfo_fitness_evaluations Full QAP cost evaluations.",
+                self._sample("sfo_fitness_evaluations_total", evaluations),
+                "# TYPE sfo_cost_cache_hits counter",
+                "# HELP sfo_cost_cache_hits Costs obtained without a full evaluation.",
+                self._sample("sfo_cost_cache_hits_total", reused, kind="unchanged"),
+                self._sample("sfo_cost_cache_hits_total", incremental, kind="swap_delta"),
+                "# TYPE sfo_best_cost gauge",
+                "# HELP sfo_best_cost Best cost found per instance.",
+            ]
+            for (digest, data_file), cost in sorted(self.best_costs.items()):
+                lines.append(self._sample("sfo_best_cost", cost, instance=digest, data_file=data_file))
+            lines += [
+                "# TYPE sfo_phase_seconds histogram",
+                "# HELP sfo_phase_seconds Time per run_iteration phase.",
+            ]
+            for phase, (buckets, count, total) in sorted(self.phases.items()):
+                for bound, bucket in zip(PHASE_BUCKETS + (float("inf"),), buckets + [count]):
+                    lines.append(self._sample("sfo_phase_seconds_bucket", bucket, phase=phase, le=_bound(bound)))
+                lines.append(self._sample("sfo_phase_seconds_count", count, phase=phase))
+                lines.append(self._sample("sfo_phase_seconds_sum", total, phase=phase))
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def write(self) -> None:
+        """Write the metrics to a temporary file next to path and atomically replace path with it."""
+        text = self.render()
+        temporary = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary, "w", encoding="utf-8") as file:
+            file.write(text)
+        os.replace(temporary, self.path)
+        self.last_write = time.monotonic()
+
+
+def metrics_exporter(path: str, interval: float = DEFAULT_METRICS_INTERVAL) -> MetricsExporter:
+    """
+    The exporter of a metrics file, shared within the process. '{pid}' in the
+    path is replaced by the process id, which also becomes a pid label so the
+    files of several processes do not export the same series.
+    """
+    labels = {"pid": str(os.getpid())} if "{pid}" in path else None
+    path = path.replace("{pid}", str(os.getpid()))
+    with _exporters_lock:
+        exporter = _exporters.get(path)
+        if exporter is None:
+            exporter = _exporters[path] = MetricsExporter(path, interval, labels)
+        return exporter
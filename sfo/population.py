@@ -1,87 +1,140 @@
-from typing import List, Tuple
+from typing import List, Sequence, Tuple
+
+from qap_core import one_based
+from sfo.initialization import initial_random_values
 
 
 def print_random_populations(engine) -> None:
-    print("\n" + "="*80)
-    print("2. RANDOM SAILFISH AND SARDINES")
-    print("="*80)
-    engine.sailfish_random_values = engine.generate_random_values(engine.n_sailfish)
-    engine.sardine_random_values = engine.generate_random_values(engine.n_sardines)
-    print("SAILFISH Random Values:")
-    print(f"{'ID':<8}", end="")
+    if engine.verbose:
+        print("\n" + "="*80, file=engine.out)
+        print("2. RANDOM SAILFISH AND SARDINES", file=engine.out)
+        print("="*80, file=engine.out)
+    engine.sailfish_random_values = initial_random_values(engine, engine.n_sailfish)
+    engine.sardine_random_values = initial_random_values(engine, engine.n_sardines)
+    if engine.warm_start:
+        seed_warm_start(engine)
+    if not engine.verbose:
+        return
+    print("SAILFISH Random Values:", file=engine.out)
+    print(f"{'ID':<8}", end="", file=engine.out)
     for loc in range(engine.problem_size):
-        print(f"{'Loc ' + str(loc+1):>8}", end="")
-    print()
+        print(f"{'Loc ' + str(loc+1):>8}", end="", file=engine.out)
+    print(file=engine.out)
     for i in range(engine.n_sailfish):
-        print(f"SF{i+1:<7}", end="")
+        print(f"SF{i+1:<7}", end="", file=engine.out)
         for val in engine.sailfish_random_values[i]:
-            print(f"{val:8.3f}", end="")
-        print()
-    print("\nSARDINE Random Values:")
-    print(f"{'ID':<8}", end="")
+            print(f"{val:8.3f}", end="", file=engine.out)
+        print(file=engine.out)
+    print("\nSARDINE Random Values:", file=engine.out)
+    print(f"{'ID':<8}", end="", file=engine.out)
     for loc in range(engine.problem_size):
-        print(f"{'Loc ' + str(loc+1):>8}", end="")
-    print()
+        print(f"{'Loc ' + str(loc+1):>8}", end="", file=engine.out)
+    print(file=engine.out)
     for i in range(engine.n_sardines):
-        print(f"S{i+1:<7}", end="")
+        print(f"S{i+1:<7}", end="", file=engine.out)
         for val in engine.sardine_random_values[i]:
-            print(f"{val:8.3f}", end="")
-        print()
+            print(f"{val:8.3f}", end="", file=engine.out)
+        print(file=engine.out)
+
+
+def encode_solution_to_random_values(solution: Sequence[int], random_values: List[float]) -> List[float]:
+    """
+    Inverse of convert_random_to_solution: reuse the sorted key values so the
+    returned vector decodes to the 0-based `solution`. Ties are spread by 0.001 so the
+    decoding is unambiguous.
+    """
+    sorted_values: List[float] = []
+    for value in sorted(random_values):
+        if sorted_values and value <= sorted_values[-1]:
+            value = round(sorted_values[-1] + 0.001, 3)
+        sorted_values.append(value)
+    encoded = [0.0] * len(solution)
+    for location, facility in enumerate(solution):
+        encoded[facility] = sorted_values[location]
+    return encoded
+
+
+def encode_near_solution(engine, solution: Sequence[int], random_values: List[float], radius: float) -> List[float]:
+    """Random keys that decode to the 0-based `solution`, each jittered by up to ±radius and clamped to [0, 1]."""
+    return [round(min(1.0, max(0.0, key + radius * (2 * engine.rng.random() - 1))), 3)
+            for key in encode_solution_to_random_values(solution, random_values)]
+
+
+def seed_warm_start(engine) -> None:
+    """
+    Replace the freshly drawn keys of the first warm_start_share of the
+    sailfish (at least one) and of the sardines by keys that decode to the
+    warm-start permutations, cycling through them. The first copy of each
+    permutation is exact; further copies are jittered by up to
+    warm_start_jitter per key so they start in its neighbourhood.
+    """
+    permutations = engine.warm_start
+    n_sailfish = min(engine.n_sailfish, max(1, round(engine.warm_start_share * engine.n_sailfish)))
+    n_sardines = min(engine.n_sardines, round(engine.warm_start_share * engine.n_sardines))
+    seeded = ([(engine.sailfish_random_values, i) for i in range(n_sailfish)]
+              + [(engine.sardine_random_values, i) for i in range(n_sardines)])
+    for copy, (population, i) in enumerate(seeded):
+        solution = permutations[copy % len(permutations)]
+        if copy < len(permutations):
+            population[i] = encode_solution_to_random_values(solution, population[i])
+        else:
+            population[i] = encode_near_solution(engine, solution, population[i], engine.warm_start_jitter)
+    engine.warm_started = (n_sailfish, n_sardines)
+    if engine.verbose:
+        print(f"Warm start: SF1-SF{n_sailfish} and {f'S1-S{n_sardines}' if n_sardines else 'no sardines'} seeded from "
+              f"{len(permutations)} given permutation(s) (repeats jittered by ±{engine.warm_start_jitter})", file=engine.out)
+        for k, solution in enumerate(permutations):
+            print(f"  Warm-start permutation {k+1}: {one_based(solution)}", file=engine.out)
 
 
 def save_original_positions(engine) -> None:
     engine.original_sailfish_positions = [pos.copy() for pos in engine.sailfish_random_values]
     engine.original_sardine_positions = [pos.copy() for pos in engine.sardine_random_values]
-    if engine.current_iteration == 0:
-        print(f"\n" + "="*80)
-        print("SAVING ORIGINAL POSITIONS FOR NEXT ITERATION")
-        print("="*80)
-        print("IMPORTANT: These original positions will be used for position updates")
-        print("in the next iteration, NOT the positions after sorting/replacement!")
-        print()
-        print("Original Sailfish Positions (before sorting/replacement):")
+    if engine.current_iteration == 0 and engine.verbose:
+        print(f"\n" + "="*80, file=engine.out)
+        print("SAVING ORIGINAL POSITIONS FOR NEXT ITERATION", file=engine.out)
+        print("="*80, file=engine.out)
+        print("IMPORTANT: These original positions will be used for position updates", file=engine.out)
+        print("in the next iteration, NOT the positions after sorting/replacement!", file=engine.out)
+        print(file=engine.out)
+        print("Original Sailfish Positions (before sorting/replacement):", file=engine.out)
         for i, pos in enumerate(engine.original_sailfish_positions):
-            print(f"  SF{i+1}: {[f'{x:.3f}' for x in pos]}")
-        print("\nOriginal Sardine Positions (before sorting/replacement):")
+            print(f"  SF{i+1}: {[f'{x:.3f}' for x in pos]}", file=engine.out)
+        print("\nOriginal Sardine Positions (before sorting/replacement):", file=engine.out)
         for i, pos in enumerate(engine.original_sardine_positions):
-            print(f"  S{i+1}: {[f'{x:.3f}' for x in pos]}")
+            print(f"  S{i+1}: {[f'{x:.3f}' for x in pos]}", file=engine.out)
 
 
-def print_sorted_arrays_and_solutions(engine) -> None:
-    print("\n" + "="*80)
-    if engine.current_iteration == 0:
-        print("3. SORTED ARRAYS FOR EACH SAILFISH AND SARDINE")
-    else:
-        print(f"ITERATION {engine.current_iteration} - STEP 1: SORTING NEW POSITIONS")
-    print("="*80)
-    engine.sailfish_solutions = []
-    engine.sardine_solutions = []
-    print("SAILFISH Sorted Arrays and Solutions:")
-    for i in range(engine.n_sailfish):
-        print(f"\n===== SF{i+1} ====================================================")
-        random_vals = engine.sailfish_random_values[i]
-        solution, sorted_array = engine.convert_random_to_solution(random_vals)
-        engine.sailfish_solutions.append(solution)
-        sorted_values = sorted(random_vals)
-        print(f"Original: {random_vals}")
-        print(f"Sorted  : {sorted_values} -> {sorted_array}")
-        facility_assignments = []
-        for loc, facility in enumerate(sorted_array, 1):
-            facility_assignments.append(f"Facility {facility} for Loc {loc}")
-        print(f"Assignment: {', '.join(facility_assignments)}")
-    print(f"\nSARDINE Sorted Arrays and Solutions:")
-    for i in range(engine.n_sardines):
-        print(f"\n===== S{i+1} ====================================================")
-        random_vals = engine.sardine_random_values[i]
-        solution, sorted_array = engine.convert_random_to_solution(random_vals)
-        engine.sardine_solutions.append(solution)
-        sorted_values = sorted(random_vals)
-        print(f"Original: {random_vals}")
-        print(f"Sorted  : {sorted_values} -> {sorted_array}")
-        facility_assignments = []
-        for loc, facility in enumerate(sorted_array, 1):
-            facility_assignments.append(f"Facility {facility} for Loc {loc}")
-        print(f"Assignment: {', '.join(facility_assignments)}")
+def decode_populations(engine) -> None:
+    """Decode every random-key vector into its permutation; detailed runs print each decoding."""
+    engine.sailfish_solutions = [engine.decode_random_keys(engine.sailfish_random_values[i])
+                                 for i in range(engine.n_sailfish)]
+    engine.sardine_solutions = [engine.decode_random_keys(engine.sardine_random_values[i])
+                                for i in range(engine.n_sardines)]
 
 
+def _print_decoding(engine, label: str, random_vals: List[float], solution) -> None:
+    print(f"\n===== {label} ====================================================", file=engine.out)
+    sorted_array = one_based(solution)
+    print(f"Original: {random_vals}", file=engine.out)
+    print(f"Sorted  : {sorted(random_vals)} -> {sorted_array}", file=engine.out)
+    facility_assignments = [f"Facility {facility} for Loc {loc}" for loc, facility in enumerate(sorted_array, 1)]
+    print(f"Assignment: {', '.join(facility_assignments)}", file=engine.out)
 
+
+def print_sorted_arrays_and_solutions(engine) -> None:
+    decode_populations(engine)
+    if not engine.verbose:
+        return
+    print("\n" + "="*80, file=engine.out)
+    if engine.current_iteration == 0:
+        print("3. SORTED ARRAYS FOR EACH SAILFISH AND SARDINE", file=engine.out)
+    else:
+        print(f"ITERATION {engine.current_iteration} - STEP 1: SORTING NEW POSITIONS", file=engine.out)
+    print("="*80, file=engine.out)
+    print("SAILFISH Sorted Arrays and Solutions:", file=engine.out)
+    for i, solution in enumerate(engine.sailfish_solutions):
+        _print_decoding(engine, f"SF{i+1}", engine.sailfish_random_values[i], solution)
+    print(f"\nSARDINE Sorted Arrays and Solutions:", file=engine.out)
+    for i, solution in enumerate(engine.sardine_solutions):
+        _print_decoding(engine, f"S{i+1}", engine.sardine_random_values[i], solution)
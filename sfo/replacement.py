@@ -1,29 +1,37 @@
+from qap_core import one_based
+
+
 def perform_sailfish_sardine_replacement(engine) -> None:
-    print(f"\n" + "="*80)
-    print(f"ITERATION {engine.current_iteration} - STEP 4: SAILFISH-SARDINE REPLACEMENT")
-    print("="*80)
-    print("REPLACEMENT MECHANISM:")
-    print("- Sardines with better fitness than any sailfish will replace the worst sailfish")
-    print("- Replaced sardines are removed from sardine population")
-    print("- No sailfish are demoted")
-    print("- NEW: Replaced sailfish will use the sardine's sorted position for future updates")
-    print()
+    verbose = engine.verbose
+    if verbose:
+        print(f"\n" + "="*80, file=engine.out)
+        print(f"ITERATION {engine.current_iteration} - STEP 4: SAILFISH-SARDINE REPLACEMENT", file=engine.out)
+        print("="*80, file=engine.out)
+        print("REPLACEMENT MECHANISM:", file=engine.out)
+        print("- Sardines with better fitness than any sailfish will replace the worst sailfish", file=engine.out)
+        print("- Replaced sardines are removed from sardine population", file=engine.out)
+        print("- No sailfish are demoted", file=engine.out)
+        print("- NEW: Replaced sailfish will use the sardine's sorted position for future updates", file=engine.out)
+        print(file=engine.out)
     worst_sailfish_fitness = max(engine.sailfish_fitness)
     better_sardines = []
     for i, sardine_fitness in enumerate(engine.sardine_fitness):
         if sardine_fitness < worst_sailfish_fitness:
             better_sardines.append((i, sardine_fitness))
-    print(f"Analysis:")
-    print(f"- Worst sailfish fitness: {worst_sailfish_fitness}")
-    print(f"- Sardines better than worst sailfish: {len(better_sardines)}")
+    if verbose:
+        print(f"Analysis:", file=engine.out)
+        print(f"- Worst sailfish fitness: {worst_sailfish_fitness}", file=engine.out)
+        print(f"- Sardines better than worst sailfish: {len(better_sardines)}", file=engine.out)
     if not better_sardines:
-        print("- No sardines are better than the worst sailfish")
-        print("- No replacement will occur")
+        if verbose:
+            print("- No sardines are better than the worst sailfish", file=engine.out)
+            print("- No replacement will occur", file=engine.out)
         return
     better_sardines.sort(key=lambda x: x[1])
-    print(f"\nSardines eligible for replacement:")
-    for sardine_idx, fitness in better_sardines:
-        print(f"- S{sardine_idx+1}: fitness = {fitness}")
+    if verbose:
+        print(f"\nSardines eligible for replacement:", file=engine.out)
+        for sardine_idx, fitness in better_sardines:
+            print(f"- S{sardine_idx+1}: fitness = {fitness}", file=engine.out)
     sardines_to_remove = []
     replacements_made = []
     
@@ -34,13 +42,15 @@ def perform_sailfish_sardine_replacement(engine) -> None:
         worst_sf_idx = engine.sailfish_fitness.index(max(engine.sailfish_fitness))
         worst_sf_fitness = engine.sailfish_fitness[worst_sf_idx]
         if sardine_fitness < worst_sf_fitness:
-            print(f"\nReplacement {len(replacements_made) + 1}:")
-            print(f"- Sardine S{sardine_idx+1} (fitness: {sardine_fitness}) -> Sailfish SF{worst_sf_idx+1} (fitness: {worst_sf_fitness})")
+            if verbose:
+                print(f"\nReplacement {len(replacements_made) + 1}:", file=engine.out)
+                print(f"- Sardine S{sardine_idx+1} (fitness: {sardine_fitness}) -> Sailfish SF{worst_sf_idx+1} (fitness: {worst_sf_fitness})", file=engine.out)
             
             # Store the original sailfish data for reference
-            old_sf_values = engine.sailfish_random_values[worst_sf_idx].copy()
-            old_sf_solution = engine.sailfish_solutions[worst_sf_idx].copy()
-            old_sf_fitness = engine.sailfish_fitness[worst_sf_idx]
+            if verbose:
+                old_sf_values = engine.sailfish_random_values[worst_sf_idx].copy()
+                old_sf_solution = engine.sailfish_solutions[worst_sf_idx]
+                old_sf_fitness = engine.sailfish_fitness[worst_sf_idx]
             
             # Store the sardine's sorted position for future updates
             sardine_sorted_position = sorted(engine.sardine_random_values[sardine_idx])
@@ -48,12 +58,14 @@ def perform_sailfish_sardine_replacement(engine) -> None:
             
             # Perform the replacement
             engine.sailfish_random_values[worst_sf_idx] = engine.sardine_random_values[sardine_idx].copy()
-            engine.sailfish_solutions[worst_sf_idx] = engine.sardine_solutions[sardine_idx].copy()
+            # The sardine is removed below, so its permutation array is moved rather than copied
+            engine.sailfish_solutions[worst_sf_idx] = engine.sardine_solutions[sardine_idx]
             engine.sailfish_fitness[worst_sf_idx] = engine.sardine_fitness[sardine_idx]
             
-            print(f"  Old SF{worst_sf_idx+1}: values={old_sf_values}, solution={old_sf_solution}, fitness={old_sf_fitness}")
-            print(f"  New SF{worst_sf_idx+1}: values={engine.sailfish_random_values[worst_sf_idx]}, solution={engine.sailfish_solutions[worst_sf_idx]}, fitness={engine.sailfish_fitness[worst_sf_idx]}")
-            print(f"  NEW: SF{worst_sf_idx+1} will use sardine S{sardine_idx+1}'s sorted position for future updates: {[f'{x:.3f}' for x in sardine_sorted_position]}")
+            if verbose:
+                print(f"  Old SF{worst_sf_idx+1}: values={old_sf_values}, solution={one_based(old_sf_solution)}, fitness={old_sf_fitness}", file=engine.out)
+                print(f"  New SF{worst_sf_idx+1}: values={engine.sailfish_random_values[worst_sf_idx]}, solution={one_based(engine.sailfish_solutions[worst_sf_idx])}, fitness={engine.sailfish_fitness[worst_sf_idx]}", file=engine.out)
+                print(f"  NEW: SF{worst_sf_idx+1} will use sardine S{sardine_idx+1}'s sorted position for future updates: {[f'{x:.3f}' for x in sardine_sorted_position]}", file=engine.out)
             
             sardines_to_remove.append(sardine_idx)
             replacements_made.append({
@@ -66,50 +78,55 @@ def perform_sailfish_sardine_replacement(engine) -> None:
             
             if sardine_fitness < engine.best_fitness:
                 engine.best_fitness = sardine_fitness
-                engine.best_solution = engine.sardine_solutions[sardine_idx].copy()
-                print(f"  NEW OVERALL BEST SOLUTION! Fitness: {sardine_fitness}")
+                engine.best_solution = engine.sardine_solutions[sardine_idx]
+                if verbose:
+                    print(f"  NEW OVERALL BEST SOLUTION! Fitness: {sardine_fitness}", file=engine.out)
         else:
             break
     
     # NEW: Store the replacement information in the engine for use in position updates
     if replacements_made:
         engine.sailfish_using_sardine_positions = sailfish_using_sardine_positions
-        print(f"\nReplacement Position Tracking:")
-        print("The following sailfish will use their original sardine sorted positions for future updates:")
-        for sf_idx, sardine_pos in sailfish_using_sardine_positions.items():
-            print(f"  SF{sf_idx+1}: Using sardine sorted position {[f'{x:.3f}' for x in sardine_pos]}")
+        if verbose:
+            print(f"\nReplacement Position Tracking:", file=engine.out)
+            print("The following sailfish will use their original sardine sorted positions for future updates:", file=engine.out)
+            for sf_idx, sardine_pos in sailfish_using_sardine_positions.items():
+                print(f"  SF{sf_idx+1}: Using sardine sorted position {[f'{x:.3f}' for x in sardine_pos]}", file=engine.out)
     else:
         engine.sailfish_using_sardine_positions = {}
     
     sardines_to_remove.sort(reverse=True)
-    print(f"\nRemoving replaced sardines from sardine population:")
+    if verbose:
+        print(f"\nRemoving replaced sardines from sardine population:", file=engine.out)
     for sardine_idx in sardines_to_remove:
-        print(f"- Removing S{sardine_idx+1} (now SF{[r['sailfish_idx']+1 for r in replacements_made if r['sardine_idx'] == sardine_idx][0]})")
+        if verbose:
+            print(f"- Removing S{sardine_idx+1} (now SF{[r['sailfish_idx']+1 for r in replacements_made if r['sardine_idx'] == sardine_idx][0]})", file=engine.out)
         del engine.sardine_random_values[sardine_idx]
         del engine.sardine_solutions[sardine_idx]
         del engine.sardine_fitness[sardine_idx]
         del engine.original_sardine_positions[sardine_idx]
         engine.n_sardines -= 1
     
-    print(f"\nReplacement Summary:")
-    print(f"- Total replacements made: {len(replacements_made)}")
-    print(f"- New sailfish population size: {engine.n_sailfish}")
-    print(f"- New sardine population size: {engine.n_sardines}")
+    if verbose:
+        print(f"\nReplacement Summary:", file=engine.out)
+        print(f"- Total replacements made: {len(replacements_made)}", file=engine.out)
+        print(f"- New sailfish population size: {engine.n_sailfish}", file=engine.out)
+        print(f"- New sardine population size: {engine.n_sardines}", file=engine.out)
     
     # Check for sardine population extinction
-    if engine.n_sardines == 0:
+    if engine.n_sardines == 0 and verbose:
         from sfo.reporting import report_sardine_population_extinction
         report_sardine_population_extinction(engine, engine.current_iteration)
     
-    if replacements_made:
-        print(f"\nUpdated populations after replacement:")
-        print("SAILFISH (after replacement):")
+    if replacements_made and verbose:
+        print(f"\nUpdated populations after replacement:", file=engine.out)
+        print("SAILFISH (after replacement):", file=engine.out)
         for i in range(engine.n_sailfish):
             marker = " (NEW)" if any(r['sailfish_idx'] == i for r in replacements_made) else ""
-            print(f"  SF{i+1}: fitness = {engine.sailfish_fitness[i]}{marker}")
-        print("SARDINES (after removal):")
+            print(f"  SF{i+1}: fitness = {engine.sailfish_fitness[i]}{marker}", file=engine.out)
+        print("SARDINES (after removal):", file=engine.out)
         for i in range(engine.n_sardines):
-            print(f"  S{i+1}: fitness = {engine.sardine_fitness[i]}")
+            print(f"  S{i+1}: fitness = {engine.sardine_fitness[i]}", file=engine.out)
     
     engine.elite_sailfish_fitness_score = min(engine.sailfish_fitness)
     if engine.sardine_fitness:
@@ -1,37 +1,73 @@
-from qap_core import print_matrices, calculate_qap_fitness
+from typing import Optional, TextIO
+
+from qap_core import print_matrices, calculate_qap_fitness, one_based, optimality_gap
+from sfo.memory import iteration_memory
+
+# engine.stop_reason -> how the final report describes it
+STOP_REASONS = {
+    "max_iter": "all requested iterations completed",
+    "extinction": "sardine population extinct",
+    "time_budget": "time budget reached",
+    "target_cost": "target cost reached",
+    "target_gap": "within target_gap of the lower bound",
+    "lower_bound": "lower bound reached (provably optimal)",
+    "caller": "finished by the caller before max_iter",
+}
+
+
+def run_length_note(engine) -> str:
+    """Header note on how long the run will go."""
+    conditions = engine.early_stop_conditions()
+    if not conditions:
+        return f"NOTE: Convergence checking is DISABLED - will run for full {engine.max_iter} iterations"
+    return (f"NOTE: Convergence checking is DISABLED - will run for up to {engine.max_iter} iterations, "
+            f"stopping early on {', '.join(conditions)}")
 
 
 def print_initial_parameters(engine) -> None:
     # Header is already printed at file beginning, start with parameters section
-    print("="*80)
-    print("1. INITIAL VARIABLES AND QAP MATRICES")
-    print("="*80)
-    print(f"Initial Parameters:")
-    print(f"- Problem size: {engine.problem_size}x{engine.problem_size}")
-    print(f"- Sailfish population: {engine.n_sailfish}")
-    print(f"- Sardine population: {engine.n_sardines}")
-    print(f"- Total population: {engine.n_sailfish + engine.n_sardines}")
-    print(f"- Maximum iterations: {engine.max_iter}")
-    print(f"- Parameter A: {engine.A}")
-    print(f"- Epsilon (for AP calculation): {engine.epsilon}")
-    print(f"- Convergence checking: DISABLED")
+    print("="*80, file=engine.out)
+    print("1. INITIAL VARIABLES AND QAP MATRICES", file=engine.out)
+    print("="*80, file=engine.out)
+    print(f"Initial Parameters:", file=engine.out)
+    print(f"- Problem size: {engine.problem_size}x{engine.problem_size}", file=engine.out)
+    print(f"- Sailfish population: {engine.n_sailfish}", file=engine.out)
+    print(f"- Sardine population: {engine.n_sardines}", file=engine.out)
+    print(f"- Total population: {engine.n_sailfish + engine.n_sardines}", file=engine.out)
+    print(f"- Maximum iterations: {engine.max_iter}", file=engine.out)
+    print(f"- Parameter A: {engine.A}", file=engine.out)
+    print(f"- Epsilon (for AP calculation): {engine.epsilon}", file=engine.out)
+    print(f"- Convergence checking: DISABLED", file=engine.out)
+    conditions = engine.early_stop_conditions()
+    if conditions:
+        print(f"- Early stopping on: {', '.join(conditions)}", file=engine.out)
+    if engine.initializer != "uniform":
+        print(f"- Initial population sampling: {engine.initializer}", file=engine.out)
+    if engine.eval_workers > 0:
+        print(f"- Parallel evaluation: not used (eval_workers={engine.eval_workers} applies to headless runs only; "
+              f"detailed runs evaluate serially)", file=engine.out)
+    if engine.sa_sardines > 0:
+        from sfo.annealing import low_ap_start_iteration
+        start = low_ap_start_iteration(engine.A, engine.epsilon)
+        when = "never" if start is None or start > engine.max_iter else f"from iteration {start}"
+        print(f"- Simulated annealing: best {engine.sa_sardines} sardines once AP < 0.5 ({when})", file=engine.out)
     if engine.log_to_file:
-        print(f"- Logging to file: ENABLED")
-    print()
-    print_matrices(engine.freq_matrix, engine.distance_matrix)
+        print(f"- Logging to file: ENABLED", file=engine.out)
+    print(file=engine.out)
+    print_matrices(engine.freq_matrix, engine.distance_matrix, engine.out)
 
 
 def print_comprehensive_results_table(engine) -> None:
-    print(f"\n" + "="*140)
+    print(f"\n" + "="*140, file=engine.out)
     if engine.current_iteration == 0:
-        print("COMPREHENSIVE RESULTS TABLE")
+        print("COMPREHENSIVE RESULTS TABLE", file=engine.out)
     else:
-        print(f"ITERATION {engine.current_iteration} - COMPREHENSIVE RESULTS TABLE")
-    print("="*140)
+        print(f"ITERATION {engine.current_iteration} - COMPREHENSIVE RESULTS TABLE", file=engine.out)
+    print("="*140, file=engine.out)
     
     # Improved table header with better spacing
-    print(f"{'Agent':<8} {'Random Values':<35} {'Sorted Array':<20} {'Solution':<25} {'Fitness':<12} {'Best':<6}")
-    print("-" * 140)
+    print(f"{'Agent':<8} {'Random Values':<35} {'Sorted Array':<20} {'Solution':<25} {'Fitness':<12} {'Best':<6}", file=engine.out)
+    print("-" * 140, file=engine.out)
     
     # Print sailfish with improved formatting
     for i in range(engine.n_sailfish):
@@ -46,7 +82,7 @@ def print_comprehensive_results_table(engine) -> None:
             random_str = random_str[:29] + "...]"
         
         # Format solution string
-        solution_str = str(engine.sailfish_solutions[i])
+        solution_str = str(one_based(engine.sailfish_solutions[i]))
         if len(solution_str) > 22:
             solution_str = solution_str[:19] + "...]"
         
@@ -58,7 +94,7 @@ def print_comprehensive_results_table(engine) -> None:
         fitness = engine.sailfish_fitness[i]
         marker = "★" if engine.sailfish_solutions[i] == engine.best_solution else ""
         
-        print(f"SF{i+1:<5} {random_str:<35} {sorted_str:<20} {solution_str:<25} {fitness:<12.2f} {marker:<6}")
+        print(f"SF{i+1:<5} {random_str:<35} {sorted_str:<20} {solution_str:<25} {fitness:<12.2f} {marker:<6}", file=engine.out)
     
     # Print sardines with improved formatting
     for i in range(engine.n_sardines):
@@ -73,7 +109,7 @@ def print_comprehensive_results_table(engine) -> None:
             random_str = random_str[:29] + "...]"
         
         # Format solution string
-        solution_str = str(engine.sardine_solutions[i])
+        solution_str = str(one_based(engine.sardine_solutions[i]))
         if len(solution_str) > 22:
             solution_str = solution_str[:19] + "...]"
         
@@ -85,79 +121,107 @@ def print_comprehensive_results_table(engine) -> None:
         fitness = engine.sardine_fitness[i]
         marker = "★" if engine.sardine_solutions[i] == engine.best_solution else ""
         
-        print(f"S{i+1:<6} {random_str:<35} {sorted_str:<20} {solution_str:<25} {fitness:<12.2f} {marker:<6}")
+        print(f"S{i+1:<6} {random_str:<35} {sorted_str:<20} {solution_str:<25} {fitness:<12.2f} {marker:<6}", file=engine.out)
     
-    print("-" * 140)
-    print(f"Best Overall Solution: {engine.best_solution}")
-    print(f"Best Overall Fitness:  {engine.best_fitness:.2f}")
-    print("="*140)
+    print("-" * 140, file=engine.out)
+    print(f"Best Overall Solution: {one_based(engine.best_solution)}", file=engine.out)
+    print(f"Best Overall Fitness:  {engine.best_fitness:.2f}", file=engine.out)
+    print("="*140, file=engine.out)
 
 
 def print_final_results(engine) -> None:
-    print(f"\n" + "="*100)
-    print("FINAL OPTIMIZATION RESULTS (NO CONVERGENCE CHECK VERSION)")
-    print("="*100)
-    print(f"Algorithm Parameters:")
-    print(f"- Initial Sailfish: {engine.original_n_sailfish}")
-    print(f"- Initial Sardines: {engine.original_n_sardines}")
-    print(f"- Final Sailfish: {engine.n_sailfish}")
-    print(f"- Final Sardines: {engine.n_sardines}")
-    print(f"- Iterations Run: {len(engine.fitness_history)}")
-    print(f"- Total Iterations Requested: {engine.max_iter}")
-    print(f"- Parameter A: {engine.A}")
-    print(f"- Epsilon (used in AP calculation): {engine.epsilon}")
-    print(f"- Convergence Check: DISABLED")
-    print()
-    print(f"Best Solution Found:")
-    print(f"- Solution: {engine.best_solution}")
-    print(f"- Fitness: {engine.best_fitness}")
-    print()
+    print(f"\n" + "="*100, file=engine.out)
+    print("FINAL OPTIMIZATION RESULTS (NO CONVERGENCE CHECK VERSION)", file=engine.out)
+    print("="*100, file=engine.out)
+    print(f"Algorithm Parameters:", file=engine.out)
+    print(f"- Initial Sailfish: {engine.original_n_sailfish}", file=engine.out)
+    print(f"- Initial Sardines: {engine.original_n_sardines}", file=engine.out)
+    print(f"- Final Sailfish: {engine.n_sailfish}", file=engine.out)
+    print(f"- Final Sardines: {engine.n_sardines}", file=engine.out)
+    print(f"- Iterations Run: {len(engine.fitness_history)}", file=engine.out)
+    print(f"- Total Iterations Requested: {engine.max_iter}", file=engine.out)
+    print(f"- Parameter A: {engine.A}", file=engine.out)
+    print(f"- Epsilon (used in AP calculation): {engine.epsilon}", file=engine.out)
+    print(f"- Convergence Check: DISABLED", file=engine.out)
+    print(f"- Stop Reason: {STOP_REASONS[engine.stop_reason]}", file=engine.out)
+    if engine.tabu_start_fitness is not None:
+        print(f"- Tabu Search Intensification: {engine.tabu_iterations} iterations "
+              f"(fitness {engine.tabu_start_fitness} -> {engine.best_fitness})", file=engine.out)
+    print(f"- Fitness Evaluations: {engine.fitness_evaluations}", file=engine.out)
+    if engine.incremental_fitness:
+        print(f"- Costs Reused (unchanged): {engine.reused_costs}, Costs by Swap Deltas: {engine.incremental_costs}", file=engine.out)
+    if engine.duplicate_history:
+        print(f"- Duplicate Permutations per Iteration: mean {sum(engine.duplicate_history) / len(engine.duplicate_history):.1f}, "
+              f"last {engine.duplicate_history[-1]}", file=engine.out)
+    if engine.reseed_duplicates:
+        print(f"- Duplicate Sardines Re-seeded: {engine.reseeded_duplicates}", file=engine.out)
+    if engine.restart_policy is not None:
+        print(f"- Sardine Population Restarts ({engine.restart_policy}): {engine.restarts}", file=engine.out)
+    if engine.warm_started is not None:
+        print(f"- Warm Start: {engine.warm_started[0]} sailfish and {engine.warm_started[1]} sardines "
+              f"seeded from {len(engine.warm_start)} permutation(s)", file=engine.out)
+    if engine.adaptive_sardines:
+        sizes = [engine.original_n_sardines] + [size for _, size in engine.sardine_resizes]
+        print(f"- Adaptive Sardine Sizing: {len(engine.sardine_resizes)} resizes, "
+              f"between {min(sizes)} and {max(sizes)} sardines", file=engine.out)
+    print(file=engine.out)
+    print(f"Best Solution Found:", file=engine.out)
+    print(f"- Solution: {one_based(engine.best_solution)}", file=engine.out)
+    print(f"- Fitness: {engine.best_fitness}", file=engine.out)
+    if engine.lower_bound is not None:
+        gap = optimality_gap(engine.best_fitness, engine.lower_bound)
+        print(f"- Gilmore-Lawler Lower Bound: {engine.lower_bound}", file=engine.out)
+        print(f"- Optimality Gap: {gap * 100:.2f}%" + (" (provably optimal)" if gap == 0.0 else ""), file=engine.out)
+    print(file=engine.out)
     if engine.best_solution:
-        print("Detailed Best Solution Analysis:")
-        calculate_qap_fitness(engine.best_solution, engine.freq_matrix, engine.distance_matrix, show_details=True)
-    print(f"\nFitness Evolution:")
-    print(f"- Initial fitness: {engine.fitness_history[0]}")
-    print(f"- Final fitness: {engine.fitness_history[-1]}")
-    print(f"- Total improvement: {engine.fitness_history[0] - engine.fitness_history[-1]}")
+        print("Detailed Best Solution Analysis:", file=engine.out)
+        calculate_qap_fitness(one_based(engine.best_solution), engine.freq_matrix, engine.distance_matrix, show_details=True, out=engine.out)
+    print(f"\nFitness Evolution:", file=engine.out)
+    print(f"- Initial fitness: {engine.fitness_history[0]}", file=engine.out)
+    print(f"- Final fitness: {engine.fitness_history[-1]}", file=engine.out)
+    print(f"- Total improvement: {engine.fitness_history[0] - engine.fitness_history[-1]}", file=engine.out)
     if engine.fitness_history[0] > 0:
-        print(f"- Improvement percentage: {((engine.fitness_history[0] - engine.fitness_history[-1]) / engine.fitness_history[0] * 100):.2f}%")
-    print(f"\nFitness History: {engine.fitness_history}")
+        print(f"- Improvement percentage: {((engine.fitness_history[0] - engine.fitness_history[-1]) / engine.fitness_history[0] * 100):.2f}%", file=engine.out)
+    print(f"\nFitness History: {engine.fitness_history}", file=engine.out)
     
     # Add conclusion explanation
-    print("\n" + "="*100)
-    print("CONCLUSION AND ANALYSIS")
-    print("="*100)
-    print("The Sailfish Optimizer algorithm has successfully completed the optimization process.")
-    print("The algorithm utilized a population-based metaheuristic approach inspired by the")
-    print("hunting behavior of sailfish and sardines in nature.")
-    print()
-    print("Key Findings:")
-    print(f"• The most optimal facility assignment found is: {engine.best_solution}")
-    print(f"• This assignment achieves a total cost of: {engine.best_fitness}")
-    print(f"• The algorithm explored {len(engine.fitness_history)} iterations")
-    print(f"• Starting with {engine.original_n_sailfish} sailfish and {engine.original_n_sardines} sardines")
-    print(f"• Final population: {engine.n_sailfish} sailfish and {engine.n_sardines} sardines")
-    print()
-    print("Algorithm Performance:")
+    print("\n" + "="*100, file=engine.out)
+    print("CONCLUSION AND ANALYSIS", file=engine.out)
+    print("="*100, file=engine.out)
+    print("The Sailfish Optimizer algorithm has successfully completed the optimization process.", file=engine.out)
+    print("The algorithm utilized a population-based metaheuristic approach inspired by the", file=engine.out)
+    print("hunting behavior of sailfish and sardines in nature.", file=engine.out)
+    print(file=engine.out)
+    print("Key Findings:", file=engine.out)
+    print(f"• The most optimal facility assignment found is: {one_based(engine.best_solution)}", file=engine.out)
+    print(f"• This assignment achieves a total cost of: {engine.best_fitness}", file=engine.out)
+    print(f"• The algorithm explored {len(engine.fitness_history)} iterations", file=engine.out)
+    print(f"• Starting with {engine.original_n_sailfish} sailfish and {engine.original_n_sardines} sardines", file=engine.out)
+    print(f"• Final population: {engine.n_sailfish} sailfish and {engine.n_sardines} sardines", file=engine.out)
+    print(file=engine.out)
+    print("Algorithm Performance:", file=engine.out)
     if engine.fitness_history[0] > 0:
         improvement_pct = ((engine.fitness_history[0] - engine.fitness_history[-1]) / engine.fitness_history[0] * 100)
-        print(f"• Achieved {improvement_pct:.2f}% improvement from initial to final solution")
-    print(f"• Total cost reduction: {engine.fitness_history[0] - engine.fitness_history[-1]}")
-    print()
-    print("The optimal solution represents the best possible arrangement of facilities")
-    print("to minimize the total transportation cost, considering both the frequency")
-    print("of interactions between facilities and the distances between locations.")
-    print()
-    print("MOST OPTIMAL ARRAY:")
-    print(f"Facility Assignment: {engine.best_solution}")
-    print("This array indicates which facility should be placed at each location:")
-    for i, facility in enumerate(engine.best_solution):
-        print(f"  Location {i+1} → Facility {facility}")
-    print()
-    print("="*100)
-    print("OPTIMIZATION COMPLETED SUCCESSFULLY!")
-    print("Algorithm ran for all requested iterations without convergence checking.")
-    print("="*100)
+        print(f"• Achieved {improvement_pct:.2f}% improvement from initial to final solution", file=engine.out)
+    print(f"• Total cost reduction: {engine.fitness_history[0] - engine.fitness_history[-1]}", file=engine.out)
+    print(file=engine.out)
+    print("The optimal solution represents the best possible arrangement of facilities", file=engine.out)
+    print("to minimize the total transportation cost, considering both the frequency", file=engine.out)
+    print("of interactions between facilities and the distances between locations.", file=engine.out)
+    print(file=engine.out)
+    print("MOST OPTIMAL ARRAY:", file=engine.out)
+    print(f"Facility Assignment: {one_based(engine.best_solution)}", file=engine.out)
+    print("This array indicates which facility should be placed at each location:", file=engine.out)
+    for i, facility in enumerate(one_based(engine.best_solution)):
+        print(f"  Location {i+1} → Facility {facility}", file=engine.out)
+    print(file=engine.out)
+    print("="*100, file=engine.out)
+    print("OPTIMIZATION COMPLETED SUCCESSFULLY!", file=engine.out)
+    if engine.stop_reason == "max_iter":
+        print("Algorithm ran for all requested iterations without convergence checking.", file=engine.out)
+    else:
+        print(f"Algorithm stopped after iteration {engine.current_iteration}: {STOP_REASONS[engine.stop_reason]}.", file=engine.out)
+    print("="*100, file=engine.out)
 
 
 def report_sardine_population_extinction(engine, iteration_when_extinct: int) -> None:
@@ -169,68 +233,104 @@ def report_sardine_population_extinction(engine, iteration_when_extinct: int) ->
         engine: The SailfishOptimizer instance
         iteration_when_extinct: The iteration number when sardines reached 0
     """
-    print(f"\n" + "="*100)
-    print("🚨 SARDINE POPULATION EXTINCTION EVENT 🚨")
-    print("="*100)
-    print(f"CRITICAL EVENT: All sardines have been eliminated from the population!")
-    print(f"Extinction occurred at: ITERATION {iteration_when_extinct}")
-    print()
+    print(f"\n" + "="*100, file=engine.out)
+    print("🚨 SARDINE POPULATION EXTINCTION EVENT 🚨", file=engine.out)
+    print("="*100, file=engine.out)
+    print(f"CRITICAL EVENT: All sardines have been eliminated from the population!", file=engine.out)
+    print(f"Extinction occurred at: ITERATION {iteration_when_extinct}", file=engine.out)
+    print(file=engine.out)
     
-    print("📊 EXTINCTION ANALYSIS:")
-    print("-" * 50)
-    print(f"• Initial sardine population: {engine.original_n_sardines}")
-    print(f"• Final sardine population: {engine.n_sardines}")
-    print(f"• Total sardines eliminated: {engine.original_n_sardines}")
-    print(f"• Iterations survived: {iteration_when_extinct}")
-    print(f"• Average elimination rate: {engine.original_n_sardines / iteration_when_extinct:.2f} sardines per iteration")
-    print()
+    print("📊 EXTINCTION ANALYSIS:", file=engine.out)
+    print("-" * 50, file=engine.out)
+    print(f"• Initial sardine population: {engine.original_n_sardines}", file=engine.out)
+    print(f"• Final sardine population: {engine.n_sardines}", file=engine.out)
+    print(f"• Total sardines eliminated: {engine.original_n_sardines}", file=engine.out)
+    print(f"• Iterations survived: {iteration_when_extinct}", file=engine.out)
+    print(f"• Average elimination rate: {engine.original_n_sardines / iteration_when_extinct:.2f} sardines per iteration", file=engine.out)
+    print(file=engine.out)
     
-    print("🎯 OPTIMIZATION IMPACT:")
-    print("-" * 50)
-    print(f"• Current sailfish population: {engine.n_sailfish}")
-    print(f"• Best solution found: {engine.best_solution}")
-    print(f"• Best fitness achieved: {engine.best_fitness}")
-    print(f"• Total iterations completed: {len(engine.fitness_history)}")
-    print()
+    print("🎯 OPTIMIZATION IMPACT:", file=engine.out)
+    print("-" * 50, file=engine.out)
+    print(f"• Current sailfish population: {engine.n_sailfish}", file=engine.out)
+    print(f"• Best solution found: {one_based(engine.best_solution)}", file=engine.out)
+    print(f"• Best fitness achieved: {engine.best_fitness}", file=engine.out)
+    print(f"• Total iterations completed: {len(engine.fitness_history)}", file=engine.out)
+    print(file=engine.out)
     
     if len(engine.fitness_history) > 1:
-        print("📈 FITNESS EVOLUTION:")
-        print("-" * 50)
-        print(f"• Initial fitness: {engine.fitness_history[0]}")
-        print(f"• Final fitness: {engine.fitness_history[-1]}")
-        print(f"• Total improvement: {engine.fitness_history[0] - engine.fitness_history[-1]}")
+        print("📈 FITNESS EVOLUTION:", file=engine.out)
+        print("-" * 50, file=engine.out)
+        print(f"• Initial fitness: {engine.fitness_history[0]}", file=engine.out)
+        print(f"• Final fitness: {engine.fitness_history[-1]}", file=engine.out)
+        print(f"• Total improvement: {engine.fitness_history[0] - engine.fitness_history[-1]}", file=engine.out)
         if engine.fitness_history[0] > 0:
             improvement_pct = ((engine.fitness_history[0] - engine.fitness_history[-1]) / engine.fitness_history[0] * 100)
-            print(f"• Improvement percentage: {improvement_pct:.2f}%")
-        print()
+            print(f"• Improvement percentage: {improvement_pct:.2f}%", file=engine.out)
+        print(file=engine.out)
     
-    print("🔍 EXTINCTION CAUSE ANALYSIS:")
-    print("-" * 50)
-    print("The sardine population extinction occurred due to the replacement mechanism")
-    print("in the Sailfish Optimizer algorithm. This happens when:")
-    print("• Sardines consistently find better solutions than the worst sailfish")
-    print("• The replacement process promotes all sardines to sailfish status")
-    print("• No new sardines are introduced to maintain population diversity")
-    print()
+    print("🔍 EXTINCTION CAUSE ANALYSIS:", file=engine.out)
+    print("-" * 50, file=engine.out)
+    print("The sardine population extinction occurred due to the replacement mechanism", file=engine.out)
+    print("in the Sailfish Optimizer algorithm. This happens when:", file=engine.out)
+    print("• Sardines consistently find better solutions than the worst sailfish", file=engine.out)
+    print("• The replacement process promotes all sardines to sailfish status", file=engine.out)
+    print("• No new sardines are introduced to maintain population diversity", file=engine.out)
+    print(file=engine.out)
     
-    print("⚡ ALGORITHM BEHAVIOR AFTER EXTINCTION:")
-    print("-" * 50)
-    print("• Sardine position updates will be skipped (no sardines to update)")
-    print("• Only sailfish will continue to evolve and search for solutions")
-    print("• The algorithm will rely entirely on sailfish hunting strategies")
-    print("• Population diversity is significantly reduced")
-    print()
+    print("⚡ ALGORITHM BEHAVIOR AFTER EXTINCTION:", file=engine.out)
+    print("-" * 50, file=engine.out)
+    print("• Sardine position updates will be skipped (no sardines to update)", file=engine.out)
+    print("• Only sailfish will continue to evolve and search for solutions", file=engine.out)
+    print("• The algorithm will rely entirely on sailfish hunting strategies", file=engine.out)
+    print("• Population diversity is significantly reduced", file=engine.out)
+    print(file=engine.out)
     
-    print("🎯 RECOMMENDATIONS:")
-    print("-" * 50)
-    print("• Consider this a successful convergence event - all sardines became sailfish")
-    print("• The algorithm has found a highly optimized solution space")
-    print("• Further iterations will focus on fine-tuning sailfish positions")
-    print("• This extinction indicates strong optimization performance")
-    print()
+    print("🎯 RECOMMENDATIONS:", file=engine.out)
+    print("-" * 50, file=engine.out)
+    print("• Consider this a successful convergence event - all sardines became sailfish", file=engine.out)
+    print("• The algorithm has found a highly optimized solution space", file=engine.out)
+    print("• Further iterations will focus on fine-tuning sailfish positions", file=engine.out)
+    print("• This extinction indicates strong optimization performance", file=engine.out)
+    print(file=engine.out)
     
-    print("="*100)
-    print("🔄 CONTINUING OPTIMIZATION WITH SAILFISH-ONLY POPULATION")
-    print("="*100)
+    print("="*100, file=engine.out)
+    print("🔄 CONTINUING OPTIMIZATION WITH SAILFISH-ONLY POPULATION", file=engine.out)
+    print("="*100, file=engine.out)
+
+
+
+
+def _format_bytes(size: float) -> str:
+    for unit in ("B", "KiB", "MiB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
 
 
+def print_memory_report(engine, out: Optional[TextIO] = None) -> None:
+    """Print per-iteration and per-phase memory use and the top allocation sites (to out, default engine.out)."""
+    if out is None:
+        out = engine.out
+    print(f"\n" + "="*100, file=out)
+    print("MEMORY PROFILE (tracemalloc)", file=out)
+    print("="*100, file=out)
+    if engine.verbose:
+        print("Detailed run: the figures include the allocations of the printed report, and tracing them", file=out)
+        print("dominates the run time. Profile with verbose=False for the optimizer's own memory use.", file=out)
+        print(file=out)
+    print(f"{'Iteration':<12} {'Start':>14} {'End':>14} {'Peak':>14}", file=out)
+    print("-" * 100, file=out)
+    for record in engine.memory_history:
+        current, peak = iteration_memory(record)
+        print(f"{record['iteration']:<12} {_format_bytes(record['start']):>14} {_format_bytes(current):>14} {_format_bytes(peak):>14}", file=out)
+    print(file=out)
+    print("Peak traced memory per phase (maximum over all iterations):", file=out)
+    for phase, peak in sorted(engine.memory_phase_peaks.items(), key=lambda item: item[1], reverse=True):
+        print(f"  {phase:<20} {_format_bytes(peak):>14}", file=out)
+    print(file=out)
+    print(f"Top {len(engine.memory_top_sites)} allocation sites at the end of the run:", file=out)
+    for rank, stat in enumerate(engine.memory_top_sites, 1):
+        frame = stat.traceback[0]
+        print(f"  {rank:>2}. {frame.filename}:{frame.lineno}  {_format_bytes(stat.size)} in {stat.count} blocks", file=out)
+    print("="*100, file=out)
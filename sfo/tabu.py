@@ -0,0 +1,155 @@
+import random
+from array import array
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from qap_core import calculate_facilities_cost, calculate_swap_delta, one_based
+
+
+def _update_delta_part(
+    facilities: List[int],
+    freq_matrix: List[List[float]],
+    distance_matrix: List[List[float]],
+    delta: List[List[float]],
+    i: int,
+    j: int,
+    r: int,
+    s: int,
+) -> float:
+    """
+    O(1) update of delta[i][j] after locations r and s (disjoint from i, j)
+    exchanged their facilities. `facilities` is already swapped.
+    """
+    f, d = freq_matrix, distance_matrix
+    fi, fj, fr, fs = facilities[i], facilities[j], facilities[r], facilities[s]
+    return (
+        delta[i][j]
+        + (d[r][i] - d[r][j] + d[s][j] - d[s][i]) * (f[fs][fi] - f[fs][fj] + f[fr][fj] - f[fr][fi])
+        + (d[i][r] - d[j][r] + d[j][s] - d[i][s]) * (f[fi][fs] - f[fj][fs] + f[fj][fr] - f[fi][fr])
+    )
+
+
+def robust_tabu_search(
+    permutation: Sequence[int],
+    freq_matrix: List[List[float]],
+    distance_matrix: List[List[float]],
+    max_iterations: int,
+    rng: Optional[random.Random] = None,
+    tenure_range: Optional[Tuple[int, int]] = None,
+    aspiration: Optional[int] = None,
+    on_move: Optional[Callable[[int, List[int], float, List[List[float]]], None]] = None,
+) -> Tuple[List[int], float, int]:
+    """
+    Robust tabu search (Taillard) with swap moves and aspiration, starting from
+    a 0-based permutation (the facility at each location). The n x n swap-delta matrix is maintained
+    incrementally in O(n^2) per move instead of re-costing every neighbour.
+    on_move, if given, is called after every move with (iteration, facilities,
+    current cost, delta matrix); the lists are the live state and must not be
+    modified.
+
+    Returns (best 0-based permutation, best cost, iteration at which it was found).
+    """
+    rng = rng or random.Random()
+    n = len(permutation)
+    facilities = list(permutation)
+    current_cost = calculate_facilities_cost(facilities, freq_matrix, distance_matrix)
+    best_facilities = facilities.copy()
+    best_cost = current_cost
+    best_iteration = 0
+    if n < 2:
+        return facilities, current_cost, best_iteration
+
+    if tenure_range is None:
+        tenure_range = (max(1, int(0.9 * n)), max(2, int(1.1 * n) + 1))
+    if aspiration is None:
+        aspiration = 5 * n * n
+
+    delta: List[List[float]] = [[0] * n for _ in range(n)]
+    for i in range(n - 1):
+        for j in range(i + 1, n):
+            delta[i][j] = calculate_swap_delta(facilities, freq_matrix, distance_matrix, i, j)
+    # tabu[location][facility]: iteration until which the facility may not return to the location
+    tabu: List[List[int]] = [[-(n * i + j) for j in range(n)] for i in range(n)]
+
+    for iteration in range(1, max_iterations + 1):
+        retained: Optional[Tuple[int, int]] = None
+        min_delta = float("inf")
+        already_aspired = False
+        for i in range(n - 1):
+            for j in range(i + 1, n):
+                tabu_i = tabu[i][facilities[j]]
+                tabu_j = tabu[j][facilities[i]]
+                authorized = tabu_i < iteration or tabu_j < iteration
+                aspired = (
+                    tabu_i < iteration - aspiration
+                    or tabu_j < iteration - aspiration
+                    or current_cost + delta[i][j] < best_cost
+                )
+                if (aspired and not already_aspired) or \
+                   (aspired and already_aspired and delta[i][j] < min_delta) or \
+                   (not aspired and not already_aspired and authorized and delta[i][j] < min_delta):
+                    retained = (i, j)
+                    min_delta = delta[i][j]
+                    if aspired:
+                        already_aspired = True
+        if retained is None:
+            continue
+
+        r, s = retained
+        facilities[r], facilities[s] = facilities[s], facilities[r]
+        current_cost += delta[r][s]
+        tabu[r][facilities[s]] = iteration + rng.randint(*tenure_range)
+        tabu[s][facilities[r]] = iteration + rng.randint(*tenure_range)
+        if current_cost < best_cost:
+            best_cost = current_cost
+            best_facilities = facilities.copy()
+            best_iteration = iteration
+
+        for i in range(n - 1):
+            for j in range(i + 1, n):
+                if i != r and i != s and j != r and j != s:
+                    delta[i][j] = _update_delta_part(facilities, freq_matrix, distance_matrix, delta, i, j, r, s)
+                else:
+                    delta[i][j] = calculate_swap_delta(facilities, freq_matrix, distance_matrix, i, j)
+        if on_move is not None:
+            on_move(iteration, facilities, current_cost, delta)
+
+    return best_facilities, best_cost, best_iteration
+
+
+def run_tabu_intensification(engine) -> None:
+    """
+    Intensification phase after the SFO iterations: run robust tabu search
+    from engine.best_solution and keep the result if it improves the best.
+    """
+    verbose = engine.verbose
+    if verbose:
+        print(f"\n" + "="*80, file=engine.out)
+        print("TABU SEARCH INTENSIFICATION (ROBUST TABU SEARCH, SWAP MOVES)", file=engine.out)
+        print("="*80, file=engine.out)
+    if not engine.best_solution:
+        if verbose:
+            print("No best solution available. Skipping tabu search.", file=engine.out)
+        return
+    start_fitness = engine.best_fitness
+    if verbose:
+        print(f"Starting solution: {one_based(engine.best_solution)}", file=engine.out)
+        print(f"Starting fitness: {start_fitness}", file=engine.out)
+        print(f"Tabu iterations: {engine.tabu_iterations}", file=engine.out)
+    solution, fitness, found_at = robust_tabu_search(
+        engine.best_solution,
+        engine.freq_matrix,
+        engine.distance_matrix,
+        engine.tabu_iterations,
+        rng=engine.rng,
+    )
+    engine.fitness_evaluations += 1
+    engine.tabu_start_fitness = start_fitness
+    if fitness < engine.best_fitness:
+        engine.best_fitness = fitness
+        engine.best_solution = array(engine.permutation_typecode, solution)
+        if verbose:
+            print(f"NEW BEST SOLUTION from tabu search at tabu iteration {found_at}!", file=engine.out)
+            print(f"Improved solution: {one_based(solution)}", file=engine.out)
+            print(f"Improved fitness: {fitness} (improvement: {start_fitness - fitness})", file=engine.out)
+    elif verbose:
+        print("Tabu search did not improve the best solution.", file=engine.out)
@@ -0,0 +1,268 @@
+import json
+import math
+import random
+import struct
+import zlib
+from array import array
+from typing import Any, Dict, List, Sequence
+
+TRACE_MAGIC: bytes = b"SFOTRACE"
+TRACE_VERSION: int = 1
+
+
+class RecordingRandom(random.Random):
+    """random.Random that records every value it hands out, per kind of call."""
+    def __init__(self, seed=None) -> None:
+        super().__init__(seed)
+        self.random_values = array("d")
+        self.sample_lengths = array("I")
+        self.sample_values = array("I")
+        self.randint_values = array("q")
+
+    def random(self) -> float:
+        value = super().random()
+        self.random_values.append(value)
+        return value
+
+    def getrandbits(self, k: int) -> int:
+        # Defined so random.Random keeps drawing integers from getrandbits rather than
+        # from random(): the recorded run must consume the same stream as an unrecorded one
+        return super().getrandbits(k)
+
+    def sample(self, population, k, **kwargs):
+        chosen = super().sample(population, k, **kwargs)
+        self.sample_lengths.append(len(chosen))
+        self.sample_values.extend(chosen)
+        return chosen
+
+    def randint(self, a: int, b: int) -> int:
+        value = super().randint(a, b)
+        self.randint_values.append(value)
+        return value
+
+
+class ReplayRandom(random.Random):
+    """
+    Hands out the recorded values again, in order per kind of call. The
+    engine draws in the same order whether or not it prints, so a verbose
+    replay of a trace consumes exactly the recorded stream.
+    """
+    def __init__(self, trace: Dict[str, Any]) -> None:
+        super().__init__(0)
+        self._random = iter(trace["random_values"])
+        self._samples = iter(trace["samples"])
+        self._randints = iter(trace["randint_values"])
+
+    @staticmethod
+    def _next(values, kind: str):
+        try:
+            return next(values)
+        except StopIteration:
+            raise RuntimeError(f"Trace exhausted: the replay asked for more {kind} draws than were recorded") from None
+
+    def random(self) -> float:
+        return self._next(self._random, "random()")
+
+    def sample(self, population, k, **kwargs):
+        return list(self._next(self._samples, "sample()"))
+
+    def randint(self, a: int, b: int) -> int:
+        return self._next(self._randints, "randint()")
+
+
+def _pack_ragged(rows: Sequence[Sequence[float]], typecode: str = "d") -> bytes:
+    lengths = array("I", [len(row) for row in rows])
+    values = array(typecode, [value for row in rows for value in row])
+    return struct.pack("<I", len(lengths)) + lengths.tobytes() + values.tobytes()
+
+
+def _unpack_ragged(blob: bytes, typecode: str = "d") -> List[List[float]]:
+    (count,) = struct.unpack_from("<I", blob)
+    lengths = array("I")
+    lengths.frombytes(blob[4:4 + 4 * count])
+    values = array(typecode)
+    values.frombytes(blob[4 + 4 * count:])
+    rows: List[List[float]] = []
+    start = 0
+    for length in lengths:
+        rows.append(values[start:start + length].tolist())
+        start += length
+    return rows
+
+
+class TraceRecorder:
+    """
+    Records the raw numbers of a run: the random draw stream and, per
+    iteration, PD, AP, lambdas, both fitness vectors, the sardine count and
+    the best fitness. Random keys are not stored; they follow from the draws.
+    """
+    def __init__(self, seed=None) -> None:
+        self.rng = RecordingRandom(seed)
+        self.scalars = array("d")  # PD, AP, best fitness, sardines after the iteration
+        self.lambdas: List[List[float]] = []
+        self.sailfish_fitness: List[List[float]] = []
+        self.sardine_fitness: List[List[float]] = []
+
+    def record_iteration(self, engine) -> None:
+        self.scalars.extend([
+            engine.PD if engine.PD is not None else math.nan,
+            engine.AP if engine.AP is not None else math.nan,
+            engine.best_fitness,
+            engine.n_sardines,
+        ])
+        self.lambdas.append(list(engine.lambda_k_values))
+        self.sailfish_fitness.append(list(engine.sailfish_fitness))
+        self.sardine_fitness.append(list(engine.sardine_fitness))
+
+    def write(self, path: str, engine) -> None:
+        """Write the trace with the instance and the parameters needed to replay it."""
+        from qap_core import one_based
+        from results_store import optimizer_parameters
+
+        n = engine.problem_size
+        meta = {
+            "params": optimizer_parameters(engine),
+            "seed": engine.seed,
+            "data_file": engine.data_file,
+            "problem_size": n,
+            "iterations": len(engine.fitness_history),
+            "sardine_resizes": engine.sardine_resizes,
+            "warm_start": [one_based(solution) for solution in engine.warm_start],
+            # Matrices of ints (exact or compact storage) replay as ints, so costs print the same
+            "integer_matrices": [all(isinstance(x, int) for row in matrix for x in row)
+                                 for matrix in (engine.freq_matrix, engine.distance_matrix)],
+        }
+        sections = [
+            (b"META", json.dumps(meta).encode("utf-8")),
+            (b"FREQ", array("d", [x for row in engine.freq_matrix for x in row]).tobytes()),
+            (b"DIST", array("d", [x for row in engine.distance_matrix for x in row]).tobytes()),
+            (b"RAND", self.rng.random_values.tobytes()),
+            (b"SAMP", struct.pack("<I", len(self.rng.sample_lengths)) + self.rng.sample_lengths.tobytes()
+             + self.rng.sample_values.tobytes()),
+            (b"RINT", self.rng.randint_values.tobytes()),
+            (b"SCAL", self.scalars.tobytes()),
+            (b"LAMB", _pack_ragged(self.lambdas)),
+            (b"SFFT", _pack_ragged(self.sailfish_fitness)),
+            (b"SDFT", _pack_ragged(self.sardine_fitness)),
+        ]
+        payload = b"".join(name + struct.pack("<Q", len(blob)) + blob for name, blob in sections)
+        with open(path, "wb") as file:
+            file.write(TRACE_MAGIC + struct.pack("<I", TRACE_VERSION) + zlib.compress(payload, 6))
+
+
+def read_trace(path: str) -> Dict[str, Any]:
+    """Read a trace file written by TraceRecorder.write."""
+    with open(path, "rb") as file:
+        data = file.read()
+    if not data.startswith(TRACE_MAGIC):
+        raise ValueError(f"{path} is not a Sailfish Optimizer trace")
+    (version,) = struct.unpack_from("<I", data, len(TRACE_MAGIC))
+    if version != TRACE_VERSION:
+        raise ValueError(f"Unsupported trace version {version}")
+    payload = zlib.decompress(data[len(TRACE_MAGIC) + 4:])
+    sections: Dict[bytes, bytes] = {}
+    offset = 0
+    while offset < len(payload):
+        name = payload[offset:offset + 4]
+        (length,) = struct.unpack_from("<Q", payload, offset + 4)
+        sections[name] = payload[offset + 12:offset + 12 + length]
+        offset += 12 + length
+
+    def doubles(blob: bytes) -> List[float]:
+        values = array("d")
+        values.frombytes(blob)
+        return values.tolist()
+
+    trace: Dict[str, Any] = json.loads(sections[b"META"].decode("utf-8"))
+    n = trace["problem_size"]
+    freq, dist = doubles(sections[b"FREQ"]), doubles(sections[b"DIST"])
+    for key, values, integers in zip(("freq_matrix", "distance_matrix"), (freq, dist),
+                                     trace.get("integer_matrices", (False, False))):
+        if integers:
+            values = [int(x) for x in values]
+        trace[key] = [values[i * n:(i + 1) * n] for i in range(n)]
+    trace["random_values"] = doubles(sections[b"RAND"])
+    (count,) = struct.unpack_from("<I", sections[b"SAMP"])
+    trace["samples"] = _unpack_ragged(sections[b"SAMP"], "I")[:count]
+    randints = array("q")
+    randints.frombytes(sections[b"RINT"])
+    trace["randint_values"] = randints.tolist()
+    scalars = doubles(sections[b"SCAL"])
+    trace["iteration_scalars"] = [scalars[i:i + 4] for i in range(0, len(scalars), 4)]
+    trace["lambdas"] = _unpack_ragged(sections[b"LAMB"])
+    trace["sailfish_fitness"] = _unpack_ragged(sections[b"SFFT"])
+    trace["sardine_fitness"] = _unpack_ragged(sections[b"SDFT"])
+    return trace
+
+
+def _same(a: float, b: float) -> bool:
+    return a == b or (math.isnan(a) and math.isnan(b))
+
+
+def verify_replay(engine, trace: Dict[str, Any]) -> List[str]:
+    """Compare a replayed engine's per-iteration numbers with the recorded ones. Returns the mismatches."""
+    replayed = engine.trace
+    mismatches: List[str] = []
+    if len(replayed.lambdas) != len(trace["lambdas"]):
+        return [f"iterations: recorded {len(trace['lambdas'])}, replayed {len(replayed.lambdas)}"]
+    scalars = [replayed.scalars[i:i + 4] for i in range(0, len(replayed.scalars), 4)]
+    for iteration, (recorded, actual) in enumerate(zip(trace["iteration_scalars"], scalars)):
+        for name, a, b in zip(("PD", "AP", "best fitness", "sardines"), recorded, actual):
+            if not _same(a, b):
+                mismatches.append(f"iteration {iteration}: {name} recorded {a}, replayed {b}")
+    for name in ("lambdas", "sailfish_fitness", "sardine_fitness"):
+        for iteration, (recorded, actual) in enumerate(zip(trace[name], getattr(replayed, name))):
+            if recorded != actual:
+                mismatches.append(f"iteration {iteration}: {name} differ")
+    return mismatches
+
+
+def render_trace(trace_path: str, output_path: str) -> List[str]:
+    """
+    Rebuild the detailed (Indonesian) run report of a traced run into
+    output_path by replaying the recorded draws through a verbose engine.
+    Returns the mismatches between the replay and the trace (empty if exact).
+    """
+    from datetime import datetime
+
+    from io_utils import OutputLogger
+    from optimizer import SailfishOptimizer
+    from sfo.reporting import run_length_note
+
+    trace = read_trace(trace_path)
+    params = dict(trace["params"])
+    logger = OutputLogger(output_path)
+    if params.get("time_budget") is not None:
+        # The budget depends on the wall clock; replay exactly the iterations the run completed
+        params["time_budget"] = None
+        params["max_iter"] = min(params["max_iter"], trace["iterations"] - 1)
+    engine = SailfishOptimizer(
+        freq_matrix=trace["freq_matrix"],
+        distance_matrix=trace["distance_matrix"],
+        log_to_file=False,
+        data_file=trace["data_file"],
+        seed=trace["seed"],
+        verbose=True,
+        output=logger,
+        warm_start=trace.get("warm_start"),
+        **params,
+    )
+    engine.trace = TraceRecorder()
+    engine.rng = ReplayRandom(trace)
+    # Adaptive sizing depends on the wall clock; replay the recorded population sizes
+    engine.sardine_schedule = {iteration: size for iteration, size in trace["sardine_resizes"]}
+    # Reproduce the header of a run that logged to a file
+    engine.log_to_file = True
+
+    try:
+        print(f"Output will be logged to: {output_path}", file=logger)
+        print(f"Run started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", file=logger)
+        print(f"Parameters: {engine.n_sailfish} sailfish, {engine.n_sardines} sardines, A={engine.A}, epsilon={engine.epsilon}", file=logger)
+        print(run_length_note(engine), file=logger)
+        print("="*80 + "\n", file=logger)
+        engine.run_optimization()
+        print(f"\nRun completed at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", file=logger)
+        print("="*80, file=logger)
+    finally:
+        logger.close()
+    return verify_replay(engine, trace)
@@ -0,0 +1,109 @@
+import weakref
+from array import array
+from multiprocessing import shared_memory
+from struct import calcsize
+from typing import List, Optional, Sequence, Tuple
+
+from qap_core import matrix_typecode
+
+
+# (segment name, problem size, array typecode): all a worker needs to attach to a shared instance
+SharedHandle = Tuple[str, int, str]
+
+# Segments attached by this (worker) process, kept alive while their row views are in use
+_attached: dict = {}
+
+
+def _release(segment: shared_memory.SharedMemory) -> None:
+    segment.close()
+    try:
+        segment.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class SharedMatrices:
+    """
+    Owner of one shared-memory segment holding the flow and distance matrices
+    as 2 x n x n doubles, or int32/int64 when both matrices hold ints (exact or
+    compact storage), so workers compute the same integer costs. The segment is unlinked by close(), when the owner
+    is garbage collected, or at interpreter exit, whichever comes first; the
+    multiprocessing resource tracker also removes it if the owner crashes.
+    """
+    def __init__(self, freq_matrix: Sequence[Sequence[float]], distance_matrix: Sequence[Sequence[float]]) -> None:
+        n = len(freq_matrix)
+        self.problem_size = n
+        self.typecode = _shared_typecode(freq_matrix, distance_matrix)
+        self.segment = shared_memory.SharedMemory(create=True, size=max(1, 2 * n * n * calcsize(self.typecode)))
+        values = self.segment.buf.cast(self.typecode)
+        for offset, matrix in ((0, freq_matrix), (n * n, distance_matrix)):
+            for i, row in enumerate(matrix):
+                values[offset + i * n:offset + (i + 1) * n] = memoryview(array(self.typecode, row))
+        values.release()
+        self._finalizer = weakref.finalize(self, _release, self.segment)
+
+    @property
+    def handle(self) -> SharedHandle:
+        return self.segment.name, self.problem_size, self.typecode
+
+    def close(self) -> None:
+        self._finalizer()
+
+    def __enter__(self) -> "SharedMatrices":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+def _shared_typecode(*matrices: Sequence[Sequence[float]]) -> str:
+    # Float entries stay doubles, so workers return float costs like the caller's matrices do
+    if any(isinstance(x, float) for matrix in matrices for row in matrix for x in row):
+        return "d"
+    return "q" if any(matrix_typecode(matrix) == "q" for matrix in matrices) else "i"
+
+
+def attach_shared_matrices(handle: SharedHandle) -> Tuple[List[memoryview], List[memoryview]]:
+    """
+    Attach to a shared instance and return (freq_matrix, distance_matrix) as
+    lists of read-only, zero-copy row views indexable like the list matrices.
+    """
+    name, n, typecode = handle
+    segment = _attached.get(name)
+    if segment is None:
+        # Pool workers share the owner's resource tracker, so attaching never unlinks the segment
+        segment = shared_memory.SharedMemory(name=name)
+        _attached[name] = segment
+    values = segment.buf.cast(typecode).toreadonly()
+    rows = [values[i * n:(i + 1) * n] for i in range(2 * n)]
+    return rows[:n], rows[n:]
+
+
+def share_matrices(
+    freq_matrix: Sequence[Sequence[float]],
+    distance_matrix: Sequence[Sequence[float]],
+) -> Optional[SharedMatrices]:
+    """Place an instance in shared memory, or return None where shared memory is unavailable."""
+    try:
+        return SharedMatrices(freq_matrix, distance_matrix)
+    except OSError:
+        return None
+
+
+def resolve_matrices(
+    handle: Optional[SharedHandle],
+    matrices: Optional[Tuple[Sequence[Sequence[float]], Sequence[Sequence[float]]]],
+) -> Tuple[Sequence[Sequence[float]], Sequence[Sequence[float]]]:
+    """Worker-side counterpart of share_matrices: attach if a handle was shared, else use the pickled matrices."""
+    if handle is not None:
+        return attach_shared_matrices(handle)
+    return matrices
+
+
+__all__ = [
+    "SharedHandle",
+    "SharedMatrices",
+    "attach_shared_matrices",
+    "share_matrices",
+    "resolve_matrices",
+]
@@ -0,0 +1,243 @@
+import argparse
+import json
+import os
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+from io_utils import read_matrices_from_csv
+from qap_core import MATRIX_STORAGE, gilmore_lawler_bound
+from shared_matrices import SharedHandle, SharedMatrices, resolve_matrices, share_matrices
+from sweep import SWEEP_PARAMETERS, is_valid_configuration, run_headless
+
+
+# Instance generation -> (where to find its matrices, data file): the shared-memory handle, or the
+# matrices themselves where shared memory is unavailable
+InstanceSource = Tuple[Optional[SharedHandle], Optional[Tuple[List[List[float]], List[List[float]]]], str]
+
+# Instances attached by this worker process, keyed by (name, load generation)
+_worker_instances: Dict[Tuple[str, int], Tuple[List[List[float]], List[List[float]], str]] = {}
+
+
+def _attach_instance(key: Tuple[str, int], source: InstanceSource) -> None:
+    handle, matrices, data_file = source
+    freq_matrix, distance_matrix = resolve_matrices(handle, matrices)
+    _worker_instances[key] = (freq_matrix, distance_matrix, data_file)
+
+
+def _init_worker(sources: Dict[Tuple[str, int], InstanceSource]) -> None:
+    for key, source in sources.items():
+        _attach_instance(key, source)
+
+
+def _solve(
+    instance: str,
+    generation: int,
+    source: InstanceSource,
+    params: Dict[str, Any],
+    seed: Optional[int],
+) -> Dict[str, Any]:
+    # A generation not seen yet (loaded after this worker started) is attached once and then reused;
+    # the request only carries its shared-memory handle
+    key = (instance, generation)
+    if key not in _worker_instances:
+        for stale in [other for other in _worker_instances if other[0] == instance]:
+            del _worker_instances[stale]
+        _attach_instance(key, source)
+    freq_matrix, distance_matrix, data_file = _worker_instances[key]
+    return run_headless(freq_matrix, distance_matrix, params, seed, data_file)
+
+
+class SolverService:
+    """
+    Long-lived solver that keeps instances loaded and answers JSON-line requests.
+
+    Requests (one JSON object per line, "id" is echoed back):
+      {"op": "load", "instance": "sedang", "path": "sedang.csv"}
+      {"op": "solve", "instance": "sedang", "params": {"max_iter": 50}, "seed": 1, "time_budget": 0.5}
+      {"op": "solve", "instance": "sedang", "warm_start": [[3, 1, 2, ...]]}
+      {"op": "instances"}
+      {"op": "shutdown"}
+    """
+    def __init__(
+        self,
+        instances: Optional[Dict[str, str]] = None,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        output: TextIO = sys.stdout,
+        results_db: Optional[str] = None,
+        metrics_file: Optional[str] = None,
+        matrix_storage: str = "float",
+    ) -> None:
+        self.matrix_storage = matrix_storage
+        self.instances: Dict[str, Tuple[List[List[float]], List[List[float]], str]] = {}
+        # Current load generation and worker-side source of every instance
+        self.sources: Dict[str, Tuple[int, InstanceSource]] = {}
+        self.generations = 0
+        # Every segment created, including those of reloaded names: queued solves may still use them
+        self.shared: List[SharedMatrices] = []
+        # Gilmore-Lawler bound per instance, computed at load and passed to every solve
+        self.lower_bounds: Dict[str, float] = {}
+        for name, path in (instances or {}).items():
+            self.load(name, path)
+        max_workers = max_workers or os.cpu_count() or 1
+        # Workers attach to the preloaded instances at startup, and to later loads on first use
+        self.executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=({(name, generation): source for name, (generation, source) in self.sources.items()},),
+        )
+        # Bounded concurrency: at most max_pending solves are queued or running at once
+        self.pending = threading.BoundedSemaphore(max_pending or 2 * max_workers)
+        self.output = output
+        self.output_lock = threading.Lock()
+        self.results_db = results_db
+        # Each worker process keeps its own OpenMetrics textfile ('{pid}' in the name)
+        self.metrics_file = metrics_file
+        self.store_lock = threading.Lock()
+
+    def load(self, name: str, path: str) -> int:
+        """
+        Parse an instance CSV once, place it in shared memory and keep it under
+        the given name. Returns its size. Each load is a new generation, so a
+        reloaded name is attached afresh by the workers.
+        """
+        freq_matrix, distance_matrix = read_matrices_from_csv(path, self.matrix_storage)
+        shared = share_matrices(freq_matrix, distance_matrix)
+        if shared:
+            self.shared.append(shared)
+        self.generations += 1
+        self.sources[name] = (self.generations, (shared.handle, None, path) if shared
+                              else (None, (freq_matrix, distance_matrix), path))
+        self.instances[name] = (freq_matrix, distance_matrix, path)
+        self.lower_bounds[name] = gilmore_lawler_bound(freq_matrix, distance_matrix)
+        return len(freq_matrix)
+
+    def respond(self, response: Dict[str, Any]) -> None:
+        with self.output_lock:
+            self.output.write(json.dumps(response) + "\n")
+            self.output.flush()
+
+    def submit(self, request_id: Any, request: Dict[str, Any]) -> None:
+        """Validate a solve request and queue it on the worker pool."""
+        instance = request["instance"]
+        if instance not in self.instances:
+            raise ValueError(f"Unknown instance '{instance}'. Load it first.")
+        unknown = set(request.get("params", {})) - set(SWEEP_PARAMETERS)
+        if unknown:
+            raise ValueError(f"Unknown parameters: {', '.join(sorted(unknown))}")
+        params = dict(SWEEP_PARAMETERS)
+        params.update(request.get("params", {}))
+        if not is_valid_configuration(params):
+            raise ValueError("Invalid parameter configuration")
+        if request.get("time_budget") is not None:
+            params["time_budget"] = float(request["time_budget"])
+        if self.metrics_file:
+            params["metrics_file"] = self.metrics_file
+        if request.get("warm_start"):
+            # Re-solves after small changes start from the previous answer(s)
+            params["warm_start"] = [list(map(int, permutation)) for permutation in request["warm_start"]]
+        params["lower_bound"] = self.lower_bounds[instance]
+        generation, source = self.sources[instance]
+
+        self.pending.acquire()
+        try:
+            future = self.executor.submit(_solve, instance, generation, source, params, request.get("seed"))
+        except BaseException:
+            self.pending.release()
+            raise
+        future.add_done_callback(lambda done: self._finish(request_id, instance, done))
+
+    def _finish(self, request_id: Any, instance: str, future: Future) -> None:
+        self.pending.release()
+        try:
+            record = future.result()
+        except Exception as error:
+            self.respond({"id": request_id, "ok": False, "error": str(error)})
+            return
+        if self.results_db:
+            from results_store import RunStore
+            with self.store_lock, RunStore(self.results_db) as store:
+                store.append_run(record)
+        self.respond({
+            "id": request_id,
+            "ok": True,
+            "instance": instance,
+            "best_cost": record["best_cost"],
+            "best_permutation": record["best_permutation"],
+            "evaluations": record["evaluations"],
+            "iterations": record["iterations"],
+            "restarts": record["restarts"],
+            "stop_reason": record["stop_reason"],
+            "wall_time": record["wall_time"],
+        })
+
+    def handle(self, line: str) -> bool:
+        """Handle one request line. Returns False once a shutdown was requested."""
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            op = request.get("op", "solve")
+            if op == "solve":
+                self.submit(request_id, request)
+            elif op == "load":
+                size = self.load(request["instance"], request["path"])
+                self.respond({"id": request_id, "ok": True, "instance": request["instance"], "problem_size": size})
+            elif op == "instances":
+                self.respond({"id": request_id, "ok": True,
+                              "instances": {name: len(m[0]) for name, m in self.instances.items()}})
+            elif op == "shutdown":
+                return False
+            else:
+                raise ValueError(f"Unknown op '{op}'")
+        except Exception as error:
+            self.respond({"id": request_id, "ok": False, "error": str(error)})
+        return True
+
+    def serve(self, stream: TextIO = sys.stdin) -> None:
+        """Read JSON-line requests until EOF or shutdown, then wait for running solves."""
+        try:
+            for line in stream:
+                if line.strip() and not self.handle(line):
+                    break
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        self.executor.shutdown(wait=True)
+        for shared in self.shared:
+            shared.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Persistent Sailfish Optimizer solver service (JSON lines on stdin/stdout)")
+    parser.add_argument("--instance", action="append", default=[], metavar="NAME=PATH",
+                        help="Instance CSV to preload (repeatable)")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=None,
+                        help="Maximum queued or running solves (default: twice the pool size)")
+    parser.add_argument("--db", default=None, help="Also append every solve to this results store")
+    parser.add_argument("--metrics-file", default=None,
+                        help="OpenMetrics textfile per worker, e.g. /var/lib/node_exporter/sfo_{pid}.prom")
+    parser.add_argument("--matrix-storage", choices=MATRIX_STORAGE, default="float",
+                        help="Matrix storage: float, exact (ints for integral matrices) or compact (int32 arrays)")
+    args = parser.parse_args(argv)
+    instances = dict(item.split("=", 1) for item in args.instance)
+    metrics_file = args.metrics_file
+    if metrics_file and "{pid}" not in metrics_file:
+        # Worker processes must not overwrite each other's file
+        root, extension = os.path.splitext(metrics_file)
+        metrics_file = f"{root}_{{pid}}{extension}"
+    SolverService(instances, max_workers=args.workers, max_pending=args.max_pending, results_db=args.db,
+                  metrics_file=metrics_file, matrix_storage=args.matrix_storage).serve()
+
+
+__all__ = [
+    "SolverService",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+import argparse
+import itertools
+import json
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from io_utils import NullWriter, read_matrices_from_csv
+from qap_core import MATRIX_STORAGE, gilmore_lawler_bound, instance_hash
+from results_store import DEFAULT_RESULTS_DB, RunStore, run_record
+from results_store import canonical_parameters as _canonical_json
+from shared_matrices import SharedHandle, resolve_matrices, share_matrices
+
+
+# Constructor parameters a sweep may vary, with the defaults used by QAPFItnessfix.main
+SWEEP_PARAMETERS: Dict[str, Any] = {
+    "n_sailfish": 5,
+    "n_sardines": 95,
+    "max_iter": 100,
+    "A": 4,
+    "epsilon": 0.001,
+    "tabu_iterations": 0,
+    "sa_sardines": 0,
+    "sa_steps": 100,
+}
+INTEGER_PARAMETERS = ("n_sailfish", "n_sardines", "max_iter", "tabu_iterations", "sa_sardines", "sa_steps")
+
+# Matrices attached once per worker process by the pool initializer
+_worker_matrices: Optional[Tuple[List[List[float]], List[List[float]], str]] = None
+
+
+def parse_value(name: str, text: str) -> Any:
+    return int(text) if name in INTEGER_PARAMETERS else float(text)
+
+
+def _check_parameter(name: str) -> None:
+    if name not in SWEEP_PARAMETERS:
+        raise ValueError(f"Unknown sweep parameter '{name}'. Choose from: {', '.join(SWEEP_PARAMETERS)}")
+
+
+def canonical_parameters(params: Dict[str, Any]) -> str:
+    """Return the canonical JSON key used to store a parameter configuration."""
+    full = dict(SWEEP_PARAMETERS)
+    full.update(params)
+    return _canonical_json({name: full[name] for name in SWEEP_PARAMETERS})
+
+
+def is_valid_configuration(params: Dict[str, Any]) -> bool:
+    """Apply the same constraints as the optimizer and the interactive prompts."""
+    return (
+        params["n_sailfish"] > 0
+        and params["n_sardines"] > params["n_sailfish"]
+        and params["max_iter"] > 0
+        and params["tabu_iterations"] >= 0
+        and params["sa_sardines"] >= 0
+        and params["sa_steps"] > 0
+    )
+
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Expand a grid specification into the cartesian product of its values.
+    Parameters that are not listed keep their default values.
+    """
+    for name in grid:
+        _check_parameter(name)
+    names = list(grid)
+    configurations: List[Dict[str, Any]] = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        params = dict(SWEEP_PARAMETERS)
+        params.update(zip(names, values))
+        if is_valid_configuration(params):
+            configurations.append(params)
+    return configurations
+
+
+def expand_random(space: Dict[str, Any], n_samples: int, search_seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Draw random configurations from a search space.
+    Each entry is either a list of choices or a (low, high) tuple; integer
+    parameters are drawn uniformly from the closed range, the others uniformly.
+    Samples violating the sailfish/sardine constraint are redrawn.
+    """
+    for name in space:
+        _check_parameter(name)
+    rng = random.Random(search_seed)
+    configurations: List[Dict[str, Any]] = []
+    seen = set()
+    attempts = 0
+    while len(configurations) < n_samples and attempts < n_samples * 100:
+        attempts += 1
+        params = dict(SWEEP_PARAMETERS)
+        for name, spec in space.items():
+            if isinstance(spec, tuple):
+                low, high = spec
+                if name in INTEGER_PARAMETERS:
+                    params[name] = rng.randint(int(low), int(high))
+                else:
+                    params[name] = round(rng.uniform(float(low), float(high)), 6)
+            else:
+                params[name] = rng.choice(list(spec))
+        key = canonical_parameters(params)
+        if is_valid_configuration(params) and key not in seen:
+            seen.add(key)
+            configurations.append(params)
+    return configurations
+
+
+def _init_worker(
+    handle: Optional[SharedHandle],
+    matrices: Optional[Tuple[List[List[float]], List[List[float]]]],
+    data_file: str,
+) -> None:
+    global _worker_matrices
+    freq_matrix, distance_matrix = resolve_matrices(handle, matrices)
+    _worker_matrices = (freq_matrix, distance_matrix, data_file)
+
+
+def run_headless(
+    freq_matrix: List[List[float]],
+    distance_matrix: List[List[float]],
+    params: Dict[str, Any],
+    seed: int,
+    data_file: str = "Unknown",
+) -> Dict[str, Any]:
+    """
+    Run one optimizer configuration with all output suppressed and return its
+    store record. params may carry a precomputed lower_bound, which keeps the
+    bound out of wall_time and out of the stored parameters.
+    """
+    from optimizer import SailfishOptimizer
+
+    start = time.perf_counter()
+    optimizer = SailfishOptimizer(
+        freq_matrix=freq_matrix,
+        distance_matrix=distance_matrix,
+        log_to_file=False,
+        data_file=data_file,
+        seed=seed,
+        verbose=False,
+        output=NullWriter(),
+        **params,
+    )
+    optimizer.run_optimization()
+    wall_time = time.perf_counter() - start
+    return run_record(optimizer, wall_time)
+
+
+def _run_cell(params: Dict[str, Any], seed: int) -> Dict[str, Any]:
+    freq_matrix, distance_matrix, data_file = _worker_matrices
+    return run_headless(freq_matrix, distance_matrix, params, seed, data_file)
+
+
+def run_sweep(
+    freq_matrix: List[List[float]],
+    distance_matrix: List[List[float]],
+    configurations: Iterable[Dict[str, Any]],
+    seeds: Iterable[int],
+    db_path: str = DEFAULT_RESULTS_DB,
+    max_workers: Optional[int] = None,
+    data_file: str = "Unknown",
+) -> List[Dict[str, Any]]:
+    """
+    Run every (configuration, seed) cell that is not already in the results
+    store for this instance on a process pool, and return all stored runs of
+    the instance.
+    """
+    instance = instance_hash(freq_matrix, distance_matrix)
+    seeds = list(seeds)
+    with RunStore(db_path) as store:
+        pending: List[Tuple[Dict[str, Any], int]] = []
+        for params in configurations:
+            key = canonical_parameters(params)
+            for seed in seeds:
+                if not store.has_run(instance, key, seed):
+                    pending.append((params, seed))
+        print(f"Sweep cells to run: {len(pending)} (cached cells are skipped)")
+        if pending:
+            # The bound depends only on the instance: compute it once rather than inside every
+            # timed cell. It is not a sweep parameter, so the cache keys above are unaffected
+            lower_bound = gilmore_lawler_bound(freq_matrix, distance_matrix)
+            # Workers attach to one shared copy of the instance instead of unpickling their own
+            shared = share_matrices(freq_matrix, distance_matrix)
+            initargs = (shared.handle, None, data_file) if shared else (None, (freq_matrix, distance_matrix), data_file)
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=max_workers,
+                    initializer=_init_worker,
+                    initargs=initargs,
+                ) as executor:
+                    futures = [executor.submit(_run_cell, dict(params, lower_bound=lower_bound), seed)
+                               for params, seed in pending]
+                    for done, future in enumerate(as_completed(futures), 1):
+                        result = future.result()
+                        store.append_run(result)
+                        print(f"[{done}/{len(pending)}] {result['params']} seed={result['seed']} "
+                              f"cost={result['best_cost']} time={result['wall_time']:.2f}s")
+            finally:
+                if shared:
+                    shared.close()
+        return store.runs(instance)
+
+
+def summarize_tradeoffs(results: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Aggregate results per configuration and mark the configurations on the
+    cost-versus-time Pareto front (no other configuration is both faster and cheaper).
+    """
+    grouped: Dict[str, List[Dict[str, Any]]] = {}
+    for result in results:
+        grouped.setdefault(result["params"], []).append(result)
+    summary: List[Dict[str, Any]] = []
+    for params, runs in grouped.items():
+        costs = [run["best_cost"] for run in runs]
+        times = [run["wall_time"] for run in runs]
+        summary.append({
+            "params": params,
+            "runs": len(runs),
+            "best_cost": min(costs),
+            "mean_cost": sum(costs) / len(costs),
+            "mean_time": sum(times) / len(times),
+        })
+    for entry in summary:
+        entry["pareto"] = not any(
+            other["mean_time"] <= entry["mean_time"]
+            and other["mean_cost"] <= entry["mean_cost"]
+            and (other["mean_time"] < entry["mean_time"] or other["mean_cost"] < entry["mean_cost"])
+            for other in summary
+        )
+    summary.sort(key=lambda entry: (entry["mean_cost"], entry["mean_time"]))
+    return summary
+
+
+def print_tradeoff_table(summary: List[Dict[str, Any]]) -> None:
+    """Print the cost-versus-time trade-off per configuration"""
+    print("\n" + "="*120)
+    print("📈 SWEEP COST-VERSUS-TIME TRADE-OFFS")
+    print("="*120)
+    print(f"{'SF':>5} {'SD':>6} {'MaxIter':>8} {'A':>6} {'Epsilon':>9} {'Tabu':>6} {'Runs':>5} "
+          f"{'Best Cost':>14} {'Mean Cost':>14} {'Mean Time (s)':>14} {'Pareto':>7}")
+    print("-" * 120)
+    for entry in summary:
+        params = json.loads(entry["params"])
+        marker = "★" if entry["pareto"] else ""
+        print(f"{params['n_sailfish']:>5} {params['n_sardines']:>6} {params['max_iter']:>8} {params['A']:>6} "
+              f"{params['epsilon']:>9} {params.get('tabu_iterations', 0):>6} {entry['runs']:>5} {entry['best_cost']:>14.2f} {entry['mean_cost']:>14.2f} "
+              f"{entry['mean_time']:>14.3f} {marker:>7}")
+    print("="*120)
+    print("★ = on the cost/time Pareto front (no configuration is both faster and cheaper)")
+
+
+def parse_seeds(text: str) -> List[int]:
+    seeds: List[int] = []
+    for part in text.split(","):
+        if "-" in part:
+            low, high = part.split("-")
+            seeds.extend(range(int(low), int(high) + 1))
+        else:
+            seeds.append(int(part))
+    return seeds
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Parallel parameter sweep for the Sailfish Optimizer")
+    parser.add_argument("csv_path", help="Instance CSV (e.g. kecil.csv, sedang.csv, besar.csv)")
+    parser.add_argument("--grid", action="append", default=[], metavar="NAME=V1,V2",
+                        help="Grid values for a parameter (repeatable)")
+    parser.add_argument("--random", action="append", default=[], metavar="NAME=LOW:HIGH|V1,V2",
+                        help="Random-search range or choices for a parameter (repeatable)")
+    parser.add_argument("--samples", type=int, default=10, help="Number of random-search configurations")
+    parser.add_argument("--search-seed", type=int, default=None, help="Seed for drawing random-search configurations")
+    parser.add_argument("--seeds", default="0", help="Run seeds, e.g. '0-4' or '1,2,7'")
+    parser.add_argument("--workers", type=int, default=None, help="Process pool size (default: CPU count)")
+    parser.add_argument("--db", default=DEFAULT_RESULTS_DB, help="Results store database for cached runs")
+    parser.add_argument("--matrix-storage", choices=MATRIX_STORAGE, default="float",
+                        help="Matrix storage: float, exact (ints for integral matrices) or compact (int32 arrays)")
+    args = parser.parse_args(argv)
+
+    configurations: List[Dict[str, Any]] = []
+    if args.grid:
+        grid: Dict[str, List[Any]] = {}
+        for item in args.grid:
+            name, values = item.split("=", 1)
+            grid[name] = [parse_value(name, value) for value in values.split(",")]
+        configurations.extend(expand_grid(grid))
+    if args.random:
+        space: Dict[str, Any] = {}
+        for item in args.random:
+            name, spec = item.split("=", 1)
+            if ":" in spec:
+                low, high = spec.split(":", 1)
+                space[name] = (parse_value(name, low), parse_value(name, high))
+            else:
+                space[name] = [parse_value(name, value) for value in spec.split(",")]
+        configurations.extend(expand_random(space, args.samples, args.search_seed))
+    if not configurations:
+        configurations = [dict(SWEEP_PARAMETERS)]
+    from sfo.annealing import low_ap_start_iteration
+    for params in configurations:
+        start = low_ap_start_iteration(params["A"], params["epsilon"])
+        if params["sa_sardines"] > 0 and (start is None or start > params["max_iter"]):
+            print(f"Note: sa_sardines has no effect in {canonical_parameters(params)}: annealing starts once AP < 0.5, "
+                  f"{'never' if start is None else f'at iteration {start}'} with A={params['A']}, epsilon={params['epsilon']}")
+
+    freq_matrix, distance_matrix = read_matrices_from_csv(args.csv_path, args.matrix_storage)
+    results = run_sweep(freq_matrix, distance_matrix, configurations, parse_seeds(args.seeds),
+                        db_path=args.db, max_workers=args.workers, data_file=args.csv_path)
+    requested = {canonical_parameters(params) for params in configurations}
+    print_tradeoff_table(summarize_tradeoffs([r for r in results if r["params"] in requested]))
+
+
+__all__ = [
+    "SWEEP_PARAMETERS",
+    "canonical_parameters",
+    "expand_grid",
+    "expand_random",
+    "parse_seeds",
+    "parse_value",
+    "run_headless",
+    "run_sweep",
+    "summarize_tradeoffs",
+    "print_tradeoff_table",
+]
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
+import time
 from typing import List, Any
-from qap_core import print_matrices
+from qap_core import one_based, print_matrices
 
 
 def print_header() -> None:
@@ -16,34 +17,37 @@ def print_header() -> None:
 
 def print_terminal_data_info(engine) -> None:
     """Print data information for terminal output"""
-    print("\n" + "="*60)
-    print("📊 DATA INFORMATION")
-    print("="*60)
-    print(f"Data file: {getattr(engine, 'data_file', 'Unknown')}")
-    print(f"Problem size: {engine.problem_size}x{engine.problem_size}")
-    print()
-    print("Frequency Matrix:")
-    print_matrices(engine.freq_matrix, engine.distance_matrix)
+    print("\n" + "="*60, file=engine.terminal)
+    print("📊 DATA INFORMATION", file=engine.terminal)
+    print("="*60, file=engine.terminal)
+    print(f"Data file: {getattr(engine, 'data_file', 'Unknown')}", file=engine.terminal)
+    print(f"Problem size: {engine.problem_size}x{engine.problem_size}", file=engine.terminal)
+    print(file=engine.terminal)
+    print("Frequency Matrix:", file=engine.terminal)
+    print_matrices(engine.freq_matrix, engine.distance_matrix, engine.terminal)
 
 
 def print_terminal_parameters(engine) -> None:
     """Print parameters for terminal output"""
-    print("\n" + "="*60)
-    print("⚙️ ALGORITHM PARAMETERS")
-    print("="*60)
-    print(f"Number of Sailfish: {engine.n_sailfish}")
-    print(f"Number of Sardines: {engine.n_sardines}")
-    print(f"Maximum Iterations: {engine.max_iter}")
-    print(f"Parameter A: {engine.A}")
-    print(f"Epsilon: {engine.epsilon}")
-    print(f"Convergence Check: DISABLED")
+    print("\n" + "="*60, file=engine.terminal)
+    print("⚙️ ALGORITHM PARAMETERS", file=engine.terminal)
+    print("="*60, file=engine.terminal)
+    print(f"Number of Sailfish: {engine.n_sailfish}", file=engine.terminal)
+    print(f"Number of Sardines: {engine.n_sardines}", file=engine.terminal)
+    print(f"Maximum Iterations: {engine.max_iter}", file=engine.terminal)
+    print(f"Parameter A: {engine.A}", file=engine.terminal)
+    print(f"Epsilon: {engine.epsilon}", file=engine.terminal)
+    print(f"Convergence Check: DISABLED", file=engine.terminal)
+    conditions = engine.early_stop_conditions()
+    if conditions:
+        print(f"Early Stopping: {', '.join(conditions)}", file=engine.terminal)
 
 
 def print_terminal_iteration_summary(engine, iteration: int) -> None:
     """Print iteration summary for terminal output"""
-    print(f"\n🔄 ITERATION {iteration}")
-    print("-" * 40)
-    print(f"Best Fitness: {engine.best_fitness}")
+    print(f"\n🔄 ITERATION {iteration}", file=engine.terminal)
+    print("-" * 40, file=engine.terminal)
+    print(f"Best Fitness: {engine.best_fitness}", file=engine.terminal)
     
     # Find which sailfish has the best solution
     best_sailfish = None
@@ -53,24 +57,24 @@ def print_terminal_iteration_summary(engine, iteration: int) -> None:
             break
     
     if best_sailfish:
-        print(f"Best Solution by: Sailfish {best_sailfish}")
+        print(f"Best Solution by: Sailfish {best_sailfish}", file=engine.terminal)
     else:
         # Check sardines if not found in sailfish
         for i, solution in enumerate(engine.sardine_solutions):
             if solution == engine.best_solution:
-                print(f"Best Solution by: Sardine {i + 1}")
+                print(f"Best Solution by: Sardine {i + 1}", file=engine.terminal)
                 break
 
 
 def print_terminal_final_results(engine) -> None:
     """Print final results table for terminal output"""
-    print("\n" + "="*100)
-    print("📋 FINAL RESULTS TABLE")
-    print("="*100)
+    print("\n" + "="*100, file=engine.terminal)
+    print("📋 FINAL RESULTS TABLE", file=engine.terminal)
+    print("="*100, file=engine.terminal)
     
     # Print table header with better formatting
-    print(f"{'Iteration':<12} {'Best Fitness':<18} {'Best Solution':<35} {'Best Agent':<15}")
-    print("-" * 100)
+    print(f"{'Iteration':<12} {'Best Fitness':<18} {'Best Solution':<35} {'Best Agent':<15}", file=engine.terminal)
+    print("-" * 100, file=engine.terminal)
     
     # Show only key iterations for terminal (first 5, last 5, and some middle ones)
     total_iterations = len(engine.fitness_history)
@@ -89,7 +93,7 @@ def print_terminal_final_results(engine) -> None:
     for i in iterations_to_show:
         # Add ellipsis if there's a gap
         if i > prev_shown + 1:
-            print(f"{'...':<12} {'...':<18} {'...':<35} {'...':<15}")
+            print(f"{'...':<12} {'...':<18} {'...':<35} {'...':<15}", file=engine.terminal)
         
         fitness = engine.fitness_history[i]
         
@@ -109,28 +113,73 @@ def print_terminal_final_results(engine) -> None:
             best_agent = "N/A"
         
         # Format solution string (truncate if too long)
-        solution_str = str(engine.best_solution) if engine.best_solution else "N/A"
+        solution_str = str(one_based(engine.best_solution)) if engine.best_solution else "N/A"
         if len(solution_str) > 32:
             solution_str = solution_str[:29] + "..."
         
-        print(f"{i:<12} {fitness:<18.2f} {solution_str:<35} {best_agent:<15}")
+        print(f"{i:<12} {fitness:<18.2f} {solution_str:<35} {best_agent:<15}", file=engine.terminal)
         prev_shown = i
     
-    print("-" * 100)
-    print(f"{'SUMMARY':<12}")
-    print(f"{'Final Best Solution:':<20} {engine.best_solution}")
-    print(f"{'Final Best Fitness:':<20} {engine.best_fitness:.2f}")
-    print(f"{'Total Iterations:':<20} {len(engine.fitness_history)}")
-    print(f"{'Algorithm:':<20} Sailfish Optimizer (SFO)")
-    print("="*100)
+    print("-" * 100, file=engine.terminal)
+    print(f"{'SUMMARY':<12}", file=engine.terminal)
+    print(f"{'Final Best Solution:':<20} {one_based(engine.best_solution)}", file=engine.terminal)
+    print(f"{'Final Best Fitness:':<20} {engine.best_fitness:.2f}", file=engine.terminal)
+    if engine.lower_bound is not None:
+        from qap_core import optimality_gap
+        print(f"{'Lower Bound (GLB):':<20} {engine.lower_bound:.2f} (gap {optimality_gap(engine.best_fitness, engine.lower_bound) * 100:.2f}%)", file=engine.terminal)
+    print(f"{'Total Iterations:':<20} {len(engine.fitness_history)}", file=engine.terminal)
+    from sfo.reporting import STOP_REASONS
+    print(f"{'Stop Reason:':<20} {STOP_REASONS[engine.stop_reason]}", file=engine.terminal)
+    if engine.restart_policy is not None:
+        print(f"{'Sardine Restarts:':<20} {engine.restarts}", file=engine.terminal)
+    print(f"{'Algorithm:':<20} Sailfish Optimizer (SFO)", file=engine.terminal)
+    print("="*100, file=engine.terminal)
 
 
 def print_terminal_optimization_start(engine) -> None:
     """Print optimization start information for terminal"""
-    print("\n" + "="*60)
-    print("🚀 SAILFISH OPTIMIZATION STARTED")
-    print("="*60)
-    print("Running optimization with detailed logging to file...")
-    print("Terminal will show summary information only.")
-    print("="*60)
+    print("\n" + "="*60, file=engine.terminal)
+    print("🚀 SAILFISH OPTIMIZATION STARTED", file=engine.terminal)
+    print("="*60, file=engine.terminal)
+    print("Running optimization with detailed logging to file...", file=engine.terminal)
+    print("Terminal will show summary information only.", file=engine.terminal)
+    print("="*60, file=engine.terminal)
+
+
+
+class LiveStatusLine:
+    """Single-line throughput status for terminal mode, redrawn at most a few times per second"""
+    def __init__(self, stream: Any, refresh_interval: float = 0.25, top_phases: int = 3) -> None:
+        self.stream = stream
+        self.refresh_interval = refresh_interval
+        self.top_phases = top_phases
+        self.last_refresh: float = 0.0
+        self.last_width: int = 0
+
+    def format_status(self, engine) -> str:
+        now = time.perf_counter()
+        elapsed = max(now - (engine.run_start_time or now), 1e-9)
+        iterations = len(engine.fitness_history)
+        since_improvement = now - (engine.last_improvement_time or now)
+        phases = sorted(engine.phase_times.items(), key=lambda item: item[1], reverse=True)[:self.top_phases]
+        phase_text = " ".join(f"{name} {1000 * total / max(iterations, 1):.1f}ms" for name, total in phases)
+        return (f"it {engine.current_iteration}/{engine.max_iter} | {iterations / elapsed:.2f} it/s | "
+                f"{engine.fitness_evaluations / elapsed:.0f} eval/s | best {engine.best_fitness} | "
+                f"last improvement {since_improvement:.1f}s ago | per it: {phase_text}")
+
+    def update(self, engine, force: bool = False) -> None:
+        """Redraw the status line unless it was refreshed less than refresh_interval ago"""
+        now = time.perf_counter()
+        if not force and now - self.last_refresh < self.refresh_interval:
+            return
+        self.last_refresh = now
+        line = self.format_status(engine)
+        self.stream.write("\r" + line.ljust(self.last_width))
+        self.stream.flush()
+        self.last_width = len(line)
 
+    def finish(self, engine) -> None:
+        """Draw the final status and move to a new line"""
+        self.update(engine, force=True)
+        self.stream.write("\n")
+        self.stream.flush()
@@ -0,0 +1,18 @@
+import io
+import os
+
+from io_utils import NullWriter, read_matrices_from_csv
+from optimizer import SailfishOptimizer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_restarts_run_past_negative_attack_power():
+    # With A=4 and epsilon=0.001, AP < 0 from iteration 500 on
+    freq_matrix, distance_matrix = read_matrices_from_csv(os.path.join(ROOT, "sedang.csv"))
+    for verbose, output in ((False, NullWriter()), (True, io.StringIO())):
+        engine = SailfishOptimizer(3, 20, freq_matrix, distance_matrix, max_iter=700, restart_policy="random",
+                                   seed=1, log_to_file=False, verbose=verbose, output=output)
+        engine.run_optimization()
+        assert engine.current_iteration >= 600
+        assert engine.best_fitness < float("inf")
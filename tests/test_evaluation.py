@@ -0,0 +1,51 @@
+import os
+import random
+from array import array
+
+from io_utils import NullWriter, read_instance
+from optimizer import SailfishOptimizer
+from qap_core import calculate_facilities_cost
+from sfo.evaluation import MIN_CHUNK_TERMS, PopulationEvaluator, parallel_evaluation_pays_off
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_pool_pays_off_only_for_two_or_more_large_chunks():
+    # besar.csv (n=32) with the default chunks of 16 stays serial; from n=112 a chunk carries enough work
+    assert not parallel_evaluation_pays_off(32, 100, 16)
+    assert not parallel_evaluation_pays_off(111, 100, 16)
+    assert parallel_evaluation_pays_off(112, 100, 16)
+    assert not parallel_evaluation_pays_off(112, 16, 16)
+    assert 16 * 112 * 112 >= MIN_CHUNK_TERMS > 16 * 111 * 111
+
+
+def test_small_instances_start_no_pool_and_match_serial_runs():
+    freq_matrix, distance_matrix = read_instance(os.path.join(ROOT, "besar.csv"))
+    results = []
+    for eval_workers in (0, 2):
+        engine = SailfishOptimizer(5, 95, freq_matrix, distance_matrix, max_iter=30, seed=1, log_to_file=False,
+                                   verbose=False, output=NullWriter(), eval_workers=eval_workers)
+        engine.begin_run()
+        assert engine.evaluator is None
+        engine.continue_run()
+        engine.finish_run()
+        results.append((engine.fitness_history, list(engine.best_solution)))
+    assert results[0] == results[1]
+
+
+def test_pool_costs_large_batches_like_serial_evaluation():
+    rng = random.Random(3)
+    n = 120
+    freq_matrix = [[rng.randint(0, 9) for _ in range(n)] for _ in range(n)]
+    distance_matrix = [[rng.randint(0, 9) for _ in range(n)] for _ in range(n)]
+    solutions = [array("H", rng.sample(range(n), n)) for _ in range(40)]
+    evaluator = PopulationEvaluator(freq_matrix, distance_matrix, workers=2, chunk_size=16)
+    try:
+        assert parallel_evaluation_pays_off(n, len(solutions), evaluator.chunk_size)
+        assert evaluator.evaluate(solutions) == [calculate_facilities_cost(solution, freq_matrix, distance_matrix)
+                                                 for solution in solutions]
+        # Below the threshold the batch is costed in-process
+        assert evaluator.evaluate(solutions[:16]) == [calculate_facilities_cost(solution, freq_matrix, distance_matrix)
+                                                      for solution in solutions[:16]]
+    finally:
+        evaluator.close()
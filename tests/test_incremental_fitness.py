@@ -0,0 +1,80 @@
+import io
+import os
+import random
+
+import pytest
+
+from io_utils import NullWriter, read_matrices_from_csv
+from optimizer import SailfishOptimizer
+from qap_core import calculate_cost_by_swaps, calculate_facilities_cost, calculate_swap_delta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def random_instance(n, rng):
+    return ([[rng.randint(0, 9) for _ in range(n)] for _ in range(n)],
+            [[rng.randint(0, 9) for _ in range(n)] for _ in range(n)])
+
+
+def test_swap_deltas_track_full_cost():
+    rng = random.Random(7)
+    # Asymmetric matrices with non-zero diagonals exercise every term of the delta
+    freq_matrix, distance_matrix = random_instance(9, rng)
+    facilities = rng.sample(range(9), 9)
+    cost = calculate_facilities_cost(facilities, freq_matrix, distance_matrix)
+    for _ in range(200):
+        r, s = rng.sample(range(9), 2)
+        cost += calculate_swap_delta(facilities, freq_matrix, distance_matrix, r, s)
+        facilities[r], facilities[s] = facilities[s], facilities[r]
+        assert cost == calculate_facilities_cost(facilities, freq_matrix, distance_matrix)
+
+
+def test_cost_by_swaps_matches_full_cost():
+    rng = random.Random(11)
+    freq_matrix, distance_matrix = random_instance(8, rng)
+    for _ in range(100):
+        previous = rng.sample(range(8), 8)
+        permutation = rng.sample(range(8), 8)
+        previous_cost = calculate_facilities_cost(previous, freq_matrix, distance_matrix)
+        cost, swaps = calculate_cost_by_swaps(previous, previous_cost, permutation, freq_matrix, distance_matrix, 8)
+        assert cost == calculate_facilities_cost(permutation, freq_matrix, distance_matrix)
+        assert swaps <= 7
+        assert calculate_cost_by_swaps(previous, previous_cost, permutation, freq_matrix, distance_matrix, 0)[0] is None \
+            or previous == permutation
+
+
+# Full updates, partial updates with annealing and duplicate reseeding, and restarts after extinction
+AGREEMENT_CONFIGURATIONS = [
+    ("sedang.csv", dict(max_iter=15)),
+    ("sedang.csv", dict(max_iter=15, A=0.45, sa_sardines=2, sa_steps=20, reseed_duplicates=True)),
+    ("kecil.csv", dict(max_iter=25, A=0.45, restart_policy="elite", warm_start=[[2, 3, 1, 4]])),
+    ("besar.csv", dict(max_iter=12, restart_policy="random", initializer="lhs")),
+]
+
+
+@pytest.mark.parametrize("data_file, params", AGREEMENT_CONFIGURATIONS)
+@pytest.mark.parametrize("seed", [1, 4, 9])
+def test_headless_and_verbose_runs_agree(data_file, params, seed):
+    freq_matrix, distance_matrix = read_matrices_from_csv(os.path.join(ROOT, data_file))
+    runs = []
+    for verbose, output in ((False, NullWriter()), (True, io.StringIO())):
+        engine = SailfishOptimizer(3, 20, freq_matrix, distance_matrix, seed=seed, log_to_file=False,
+                                   verbose=verbose, output=output, **params)
+        engine.run_optimization()
+        runs.append((engine.fitness_history, list(engine.best_solution), engine.fitness_evaluations,
+                     engine.reused_costs, engine.incremental_costs, engine.restarts, engine.n_sardines))
+    assert runs[0] == runs[1]
+
+
+def test_incremental_fitness_does_not_change_the_run():
+    # Costs are reused from iteration ~440 on, once AP < 0.5 leaves most sardines unchanged
+    freq_matrix, distance_matrix = read_matrices_from_csv(os.path.join(ROOT, "sedang.csv"))
+    engines = []
+    for incremental_fitness in (True, False):
+        engine = SailfishOptimizer(3, 20, freq_matrix, distance_matrix, max_iter=520, seed=4, log_to_file=False,
+                                   verbose=False, output=NullWriter(), restart_policy="random",
+                                   incremental_fitness=incremental_fitness)
+        engine.run_optimization()
+        engines.append(engine)
+    assert engines[0].reused_costs > 0
+    assert engines[0].fitness_history == engines[1].fitness_history
@@ -0,0 +1,60 @@
+import itertools
+import os
+import random
+
+from io_utils import read_matrices_from_csv
+from qap_core import calculate_facilities_cost, gilmore_lawler_bound, solve_linear_assignment
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def brute_force_assignment(cost):
+    n = len(cost)
+    return min(sum(cost[row][column] for row, column in enumerate(columns))
+               for columns in itertools.permutations(range(n)))
+
+
+def test_linear_assignment_matches_brute_force():
+    rng = random.Random(3)
+    for n in range(1, 7):
+        for _ in range(20):
+            cost = [[rng.randint(-5, 20) for _ in range(n)] for _ in range(n)]
+            columns, total = solve_linear_assignment(cost)
+            assert sorted(columns) == list(range(n))
+            assert total == sum(cost[row][column] for row, column in enumerate(columns))
+            assert total == brute_force_assignment(cost)
+
+
+def test_gilmore_lawler_bound_is_below_the_optimum():
+    freq_matrix, distance_matrix = read_matrices_from_csv(os.path.join(ROOT, "kecil.csv"))
+    n = len(freq_matrix)
+    optimum = min(calculate_facilities_cost(facilities, freq_matrix, distance_matrix)
+                  for facilities in itertools.permutations(range(n)))
+    assert gilmore_lawler_bound(freq_matrix, distance_matrix) <= optimum
+
+
+def brute_force_gilmore_lawler(freq_matrix, distance_matrix):
+    # Cost of facility i at location j: its diagonal term plus the smallest pairing of the off-diagonal rows
+    n = len(freq_matrix)
+    cost = []
+    for i in range(n):
+        flows = [freq_matrix[i][k] for k in range(n) if k != i]
+        row = []
+        for j in range(n):
+            distances = [distance_matrix[j][l] for l in range(n) if l != j]
+            row.append(freq_matrix[i][i] * distance_matrix[j][j]
+                       + min(sum(f * d for f, d in zip(flows, paired)) for paired in itertools.permutations(distances)))
+        cost.append(row)
+    return brute_force_assignment(cost)
+
+
+def test_gilmore_lawler_bound_on_random_instances():
+    rng = random.Random(5)
+    for n in range(2, 7):
+        freq_matrix = [[rng.randint(0, 9) for _ in range(n)] for _ in range(n)]
+        distance_matrix = [[rng.randint(0, 9) for _ in range(n)] for _ in range(n)]
+        optimum = min(calculate_facilities_cost(facilities, freq_matrix, distance_matrix)
+                      for facilities in itertools.permutations(range(n)))
+        bound = gilmore_lawler_bound(freq_matrix, distance_matrix)
+        assert bound == brute_force_gilmore_lawler(freq_matrix, distance_matrix)
+        assert bound <= optimum
@@ -0,0 +1,38 @@
+import os
+import sqlite3
+
+from io_utils import NullWriter, read_instance
+from optimizer import SailfishOptimizer
+from results_store import RunStore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_store_adds_and_persists_restarts_and_stop_reason(tmp_path):
+    db_path = str(tmp_path / "runs.db")
+    # A store created before the restarts and stop_reason columns existed
+    connection = sqlite3.connect(db_path)
+    connection.execute(
+        "CREATE TABLE runs (id INTEGER PRIMARY KEY AUTOINCREMENT, instance_hash TEXT NOT NULL, data_file TEXT,"
+        " problem_size INTEGER NOT NULL, params TEXT NOT NULL, seed INTEGER, best_cost REAL NOT NULL,"
+        " best_permutation BLOB NOT NULL, evaluations INTEGER NOT NULL, iterations INTEGER NOT NULL,"
+        " wall_time REAL NOT NULL, fitness_history BLOB NOT NULL, created_at TEXT NOT NULL)"
+    )
+    connection.execute(
+        "INSERT INTO runs (instance_hash, problem_size, params, best_cost, best_permutation, evaluations,"
+        " iterations, wall_time, fitness_history, created_at) VALUES ('old', 2, '{}', 1.0, ?, 1, 1, 0.1, ?, 'now')",
+        (bytes(4), bytes(8)),
+    )
+    connection.commit()
+    connection.close()
+
+    freq_matrix, distance_matrix = read_instance(os.path.join(ROOT, "sedang.csv"))
+    engine = SailfishOptimizer(3, 20, freq_matrix, distance_matrix, max_iter=80, seed=3, log_to_file=False,
+                               verbose=False, output=NullWriter(), restart_policy="random", results_db=db_path)
+    engine.run_optimization()
+
+    with RunStore(db_path) as store:
+        old, new = store.runs()
+    assert old["restarts"] is None and old["stop_reason"] is None
+    assert new["restarts"] == engine.restarts > 0
+    assert new["stop_reason"] == engine.stop_reason == "max_iter"
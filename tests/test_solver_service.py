@@ -0,0 +1,38 @@
+import io
+import json
+import os
+
+from solver_service import SolverService
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def write_scaled_instance(path, factor):
+    with open(os.path.join(ROOT, "kecil.csv")) as source:
+        flows, distances = source.read().strip().split("\n\n\n\n")
+    scaled = "\n".join(",".join(str(int(value) * factor) for value in row.split(",")) for row in flows.split("\n"))
+    with open(path, "w") as target:
+        target.write(scaled + "\n\n\n\n" + distances + "\n")
+
+
+def test_loaded_and_reloaded_instances_are_solved_from_shared_memory(tmp_path):
+    path = str(tmp_path / "k.csv")
+    write_scaled_instance(path, 1)
+    output = io.StringIO()
+    service = SolverService({"pre": os.path.join(ROOT, "kecil.csv")}, max_workers=1, output=output)
+    try:
+        service.handle(json.dumps({"id": "load", "op": "load", "instance": "k", "path": path}))
+        generation, (handle, matrices, _) = service.sources["k"]
+        # Requests carry only the segment handle, not the matrices
+        assert handle is not None and matrices is None
+        service.handle(json.dumps({"id": 1, "instance": "k", "seed": 1, "params": {"max_iter": 20}}))
+        service.handle(json.dumps({"id": 2, "instance": "pre", "seed": 1, "params": {"max_iter": 20}}))
+        write_scaled_instance(path, 10)
+        service.handle(json.dumps({"id": "reload", "op": "load", "instance": "k", "path": path}))
+        assert service.sources["k"][0] > generation
+        service.handle(json.dumps({"id": 3, "instance": "k", "seed": 1, "params": {"max_iter": 20}}))
+    finally:
+        service.close()
+    responses = {response["id"]: response for response in map(json.loads, output.getvalue().splitlines())}
+    assert responses[1]["best_cost"] == responses[2]["best_cost"] == 1340.0
+    assert responses[3]["best_cost"] == 13400.0
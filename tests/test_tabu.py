@@ -0,0 +1,44 @@
+import os
+import random
+
+from io_utils import read_instance
+from qap_core import calculate_facilities_cost, calculate_swap_delta
+from sfo.tabu import robust_tabu_search
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def check_tabu_state(freq_matrix, distance_matrix, start, iterations, seed):
+    n = len(start)
+    moves = []
+
+    def check_move(iteration, facilities, current_cost, delta):
+        assert current_cost == calculate_facilities_cost(facilities, freq_matrix, distance_matrix)
+        for i in range(n - 1):
+            for j in range(i + 1, n):
+                assert delta[i][j] == calculate_swap_delta(facilities, freq_matrix, distance_matrix, i, j), \
+                    f"delta[{i}][{j}] out of date after move {iteration}"
+        moves.append(current_cost)
+
+    best, best_cost, found_at = robust_tabu_search(start, freq_matrix, distance_matrix, iterations,
+                                                   rng=random.Random(seed), on_move=check_move)
+    assert len(moves) == iterations
+    assert best_cost == calculate_facilities_cost(best, freq_matrix, distance_matrix)
+    assert best_cost == min([calculate_facilities_cost(start, freq_matrix, distance_matrix)] + moves)
+    assert found_at == 0 or moves[found_at - 1] == best_cost
+    assert sorted(best) == list(range(n))
+
+
+def test_delta_matrix_tracks_full_recomputation_on_random_instance():
+    rng = random.Random(5)
+    n = 10
+    # Asymmetric matrices with non-zero diagonals exercise every term of the O(1) update
+    freq_matrix = [[rng.randint(0, 9) for _ in range(n)] for _ in range(n)]
+    distance_matrix = [[rng.randint(0, 9) for _ in range(n)] for _ in range(n)]
+    check_tabu_state(freq_matrix, distance_matrix, rng.sample(range(n), n), 300, seed=1)
+
+
+def test_delta_matrix_tracks_full_recomputation_on_sedang():
+    freq_matrix, distance_matrix = read_instance(os.path.join(ROOT, "sedang.csv"), "exact")
+    start = random.Random(3).sample(range(len(freq_matrix)), len(freq_matrix))
+    check_tabu_state(freq_matrix, distance_matrix, start, 200, seed=2)
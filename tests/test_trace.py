@@ -0,0 +1,22 @@
+import os
+
+from io_utils import NullWriter, read_instance
+from optimizer import SailfishOptimizer
+from sfo.trace import read_trace, render_trace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_trace_replay_reproduces_the_run(tmp_path):
+    for storage in ("float", "exact"):
+        freq_matrix, distance_matrix = read_instance(os.path.join(ROOT, "sedang.csv"), storage)
+        trace_path = str(tmp_path / f"{storage}.sfot")
+        engine = SailfishOptimizer(3, 20, freq_matrix, distance_matrix, max_iter=12, seed=2, log_to_file=False,
+                                   verbose=False, output=NullWriter(), restart_policy="random", trace_file=trace_path)
+        engine.run_optimization()
+        trace = read_trace(trace_path)
+        assert trace["freq_matrix"] == freq_matrix
+        report_path = str(tmp_path / f"{storage}.txt")
+        assert render_trace(trace_path, report_path) == []
+        with open(report_path, encoding="utf-8") as report:
+            assert f"Best Overall Fitness:  {engine.best_fitness:.2f}" in report.read()
@@ -0,0 +1,40 @@
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+from sfo.trace import read_trace, render_trace
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Render the detailed Sailfish Optimizer report from a binary run trace")
+    parser.add_argument("trace", help="Trace file written by SailfishOptimizer(trace_file=...)")
+    parser.add_argument("-o", "--output", default=None,
+                        help="Report file (default: the trace name with a .txt extension)")
+    parser.add_argument("--info", action="store_true", help="Only print the trace's run parameters and size")
+    args = parser.parse_args(argv)
+
+    if args.info:
+        trace = read_trace(args.trace)
+        print(f"Instance: {trace['data_file']} (n={trace['problem_size']}), seed {trace['seed']}")
+        print(f"Iterations: {trace['iterations'] - 1}, random draws: {len(trace['random_values'])}, "
+              f"samples: {len(trace['samples'])}, randints: {len(trace['randint_values'])}")
+        print(f"Parameters: {trace['params']}")
+        return
+    output = args.output or os.path.splitext(args.trace)[0] + ".txt"
+    mismatches = render_trace(args.trace, output)
+    if mismatches:
+        print(f"Report written to {output}, but the replay diverged from the trace:", file=sys.stderr)
+        for mismatch in mismatches[:20]:
+            print(f"  {mismatch}", file=sys.stderr)
+        sys.exit(1)
+    print(f"Report written to {output}")
+
+
+__all__ = [
+    "main",
+]
+
+
+if __name__ == "__main__":
+    main()
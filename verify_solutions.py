@@ -0,0 +1,202 @@
+import argparse
+import csv
+import math
+import sys
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+
+from io_utils import read_instance, read_qaplib_solution
+from qap_core import MATRIX_STORAGE, calculate_facilities_cost, instance_hash, permutation_typecode
+
+
+DEFAULT_CHUNK_SIZE: int = 4096
+# Relative tolerance when comparing a computed cost with a recorded one
+COST_TOLERANCE: float = 1e-9
+
+# (label, permutation text or values, recorded cost if the source has one)
+Candidate = Tuple[str, Any, Optional[float]]
+
+
+def parse_permutation(text: str) -> List[int]:
+    """Parse '3 1 2', '3,1,2' or '[3, 1, 2]' into a list of ints."""
+    return [int(token) for token in text.strip().strip("[]").replace(",", " ").split()]
+
+
+def permutation_error(permutation: Sequence[int], n: int, one_based: bool = True) -> Optional[str]:
+    """Why a sequence is not a permutation of the instance's facilities, or None if it is."""
+    if len(permutation) != n:
+        return f"length {len(permutation)}, expected {n}"
+    low = 1 if one_based else 0
+    seen = bytearray(n)
+    for facility in permutation:
+        if not low <= facility < low + n:
+            return f"facility {facility} outside {low}..{low + n - 1}"
+        if seen[facility - low]:
+            return f"facility {facility} repeated"
+        seen[facility - low] = 1
+    return None
+
+
+def read_candidates(stream: TextIO, label: str = "line") -> Iterator[Candidate]:
+    """Lazily yield one candidate per non-blank, non-comment line of a permutation file."""
+    for number, line in enumerate(stream, 1):
+        if line.strip() and not line.lstrip().startswith("#"):
+            yield f"{label} {number}", line, None
+
+
+def store_candidates(db_path: str, freq_matrix, distance_matrix) -> Iterator[Candidate]:
+    """Yield the best permutation and recorded cost of every stored run of the instance."""
+    from results_store import RunStore
+
+    with RunStore(db_path) as store:
+        for run in store.runs(instance_hash(freq_matrix, distance_matrix)):
+            yield f"run {run['id']}", run["best_permutation"], run["best_cost"]
+
+
+def chunked(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    chunk: List[Any] = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def verify_permutations(
+    freq_matrix: List[List[float]],
+    distance_matrix: List[List[float]],
+    candidates: Iterable[Candidate],
+    one_based: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Validate and cost candidate permutations chunk by chunk, so only one chunk
+    is in memory at a time. Valid permutations of a chunk are costed in one
+    batch, on a PopulationEvaluator pool when workers > 0. Yields one result
+    per candidate, in input order: label, cost (None if invalid), error and,
+    when the source recorded a cost, whether it matches.
+    """
+    n = len(freq_matrix)
+    typecode = permutation_typecode(n)
+    offset = 1 if one_based else 0
+    evaluator = None
+    if workers > 0:
+        from sfo.evaluation import PopulationEvaluator
+        evaluator = PopulationEvaluator(freq_matrix, distance_matrix, workers, max(1, chunk_size // (4 * workers)))
+    try:
+        for chunk in chunked(candidates, chunk_size):
+            results: List[Dict[str, Any]] = []
+            solutions: List[array] = []
+            for label, permutation, recorded in chunk:
+                error = None
+                try:
+                    if isinstance(permutation, str):
+                        permutation = parse_permutation(permutation)
+                    error = permutation_error(permutation, n, one_based)
+                except ValueError as parse_error:
+                    error = f"not a list of integers ({parse_error})"
+                results.append({"label": label, "cost": None, "error": error, "recorded_cost": recorded})
+                if error is None:
+                    solutions.append(array(typecode, [facility - offset for facility in permutation]))
+            if evaluator is not None:
+                costs = iter(evaluator.evaluate(solutions))
+            else:
+                costs = (calculate_facilities_cost(solution, freq_matrix, distance_matrix) for solution in solutions)
+            for result in results:
+                if result["error"] is None:
+                    result["cost"] = next(costs)
+                    if result["recorded_cost"] is not None:
+                        result["matches_recorded"] = math.isclose(result["cost"], result["recorded_cost"],
+                                                                  rel_tol=COST_TOLERANCE)
+                yield result
+    finally:
+        if evaluator is not None:
+            evaluator.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Validate and cost permutations of a QAP instance in bulk")
+    parser.add_argument("instance", help="Instance file: project CSV or QAPLIB .dat")
+    parser.add_argument("permutations", nargs="?", default=None,
+                        help="Permutation file, one per line ('-' for stdin), or a QAPLIB .sln file")
+    parser.add_argument("--db", default=None, help="Also verify the best permutations of the instance's stored runs")
+    parser.add_argument("--zero-based", action="store_true", help="Permutations list facilities from 0 instead of 1")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                        help=f"Permutations read and costed per batch (default: {DEFAULT_CHUNK_SIZE})")
+    parser.add_argument("--workers", type=int, default=0, help="Cost each batch on this many processes (default: 0, serial)")
+    parser.add_argument("--matrix-storage", choices=MATRIX_STORAGE, default="float",
+                        help="Matrix storage: float, exact (ints for integral matrices) or compact (int32 arrays)")
+    parser.add_argument("-o", "--output", default=None, help="Write one CSV row per permutation to this file")
+    args = parser.parse_args(argv)
+    if args.permutations is None and args.db is None:
+        parser.error("Give a permutation file, --db, or both")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    freq_matrix, distance_matrix = read_instance(args.instance, args.matrix_storage)
+    sources: List[Iterable[Candidate]] = []
+    stream: Optional[TextIO] = None
+    if args.permutations and args.permutations.lower().endswith(".sln"):
+        cost, permutation = read_qaplib_solution(args.permutations)
+        sources.append([(args.permutations, permutation, cost)])
+    elif args.permutations:
+        stream = sys.stdin if args.permutations == "-" else open(args.permutations, "r")
+        sources.append(read_candidates(stream))
+    if args.db:
+        sources.append(store_candidates(args.db, freq_matrix, distance_matrix))
+    candidates = (candidate for source in sources for candidate in source)
+
+    writer = None
+    output = open(args.output, "w", newline="") if args.output else None
+    if output:
+        writer = csv.writer(output)
+        writer.writerow(["source", "cost", "recorded_cost", "error"])
+    total = invalid = mismatched = 0
+    best: Optional[Tuple[float, str]] = None
+    cost_sum = 0.0
+    try:
+        for result in verify_permutations(freq_matrix, distance_matrix, candidates, not args.zero_based,
+                                          args.chunk_size, args.workers):
+            total += 1
+            if result["error"] is not None:
+                invalid += 1
+                if invalid <= 20:
+                    print(f"❌ {result['label']}: {result['error']}")
+            else:
+                cost_sum += result["cost"]
+                if best is None or result["cost"] < best[0]:
+                    best = (result["cost"], result["label"])
+                if result.get("matches_recorded") is False:
+                    mismatched += 1
+                    print(f"⚠️ {result['label']}: cost {result['cost']}, recorded {result['recorded_cost']}")
+            if writer:
+                writer.writerow([result["label"], result["cost"], result["recorded_cost"], result["error"] or ""])
+    finally:
+        if stream is not None and stream is not sys.stdin:
+            stream.close()
+        if output:
+            output.close()
+
+    valid = total - invalid
+    print(f"Permutations: {total}, valid: {valid}, invalid: {invalid}, recorded costs that differ: {mismatched}")
+    if best:
+        print(f"Best: {best[0]} ({best[1]}), mean cost: {cost_sum / valid}")
+    if invalid or mismatched:
+        sys.exit(1)
+
+
+__all__ = [
+    "parse_permutation",
+    "permutation_error",
+    "read_candidates",
+    "store_candidates",
+    "verify_permutations",
+    "main",
+]
+
+
+if __name__ == "__main__":
+    main()